@@ -27,6 +27,9 @@ from terminedia.subpixels import BlockChars
 from terminedia.text import render
 from terminedia.text.style import Mark
 from terminedia.screen import Screen
+from terminedia.displaylist import DisplayList, Param
+from terminedia.compositor import Compositor, Layer
+from terminedia.tiled import TiledShape, Viewport
 from terminedia.transformers import Transformer, TransformersContainer, GradientTransformer
 from terminedia.transformers.library import box_transformers as borders
 # Import otherwise unused modules, so that they are
@@ -45,13 +45,24 @@ async def terminedia_main(screen=None, context=None):
     screen.accelerate()
 
     with terminedia.keyboard, terminedia.mouse, screen:
-        while not break_loop:
-
-            frame_start = time.time()
-            await asyncio.sleep(0)
-            screen.update()
-            frame_wait = max(0, (1 / context.fps) - (time.time() - frame_start))
-            await asyncio.sleep(frame_wait)
+        # Input is read as soon as it arrives, and wakes up
+        # the loop so that the screen is updated right away
+        input_arrived = asyncio.Event()
+        terminedia.keyboard.add_reader(asyncio.get_running_loop(), input_arrived.set)
+        try:
+            while not break_loop:
+
+                frame_start = time.time()
+                await asyncio.sleep(0)
+                screen.update()
+                frame_wait = max(0, (1 / context.fps) - (time.time() - frame_start))
+                input_arrived.clear()
+                try:
+                    await asyncio.wait_for(input_arrived.wait(), frame_wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            terminedia.keyboard.remove_reader()
 
 
 def _refresh_line(text, pos, max_pos, backspace=0):
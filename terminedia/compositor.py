@@ -0,0 +1,320 @@
+"""Layer compositing with blend modes, and a compositor caching the flattened result"""
+
+from functools import lru_cache
+
+import terminedia
+from terminedia.utils import Color, Rect, V2
+from terminedia.values import CONTEXT_COLORS, DEFAULT_BG, DEFAULT_FG, EMPTY, TRANSPARENT, Effects
+
+
+BLEND_MODES = ("normal", "add", "multiply")
+
+
+@lru_cache(maxsize=4096)
+def _blend_rgb(mode, dst, src, alpha):
+    if mode == "add":
+        rgb = (min(255, d + round(s * alpha)) for d, s in zip(dst, src))
+    elif mode == "multiply":
+        rgb = (round(d * (1 - alpha + alpha * s / 255)) for d, s in zip(dst, src))
+    else:
+        rgb = (round(d + (s - d) * alpha) for d, s in zip(dst, src))
+    return Color(tuple(rgb))
+
+
+def blend_color(dst, src, mode="normal", opacity=1.0):
+    """Combines color "src" over "dst"
+
+    Args:
+      - dst, src (Color): the colors. "src" may be TRANSPARENT, which leaves "dst" as is.
+      - mode (str): one of "normal", "add" or "multiply"
+      - opacity (float): how much of "src" is used, from 0 to 1. It is
+            multiplied by the alpha component of "src".
+
+    The actual colors of the terminal defaults can't be known: DEFAULT_FG and
+    DEFAULT_BG are blended as white and black, respectively. Use concrete
+    colors where translucent or "add"/"multiply" colors are combined over them.
+    """
+    if src is TRANSPARENT:
+        return dst
+    alpha = opacity if src.special else opacity * src.alpha / 255
+    if mode == "normal" and alpha >= 1 or dst is TRANSPARENT or src is CONTEXT_COLORS or dst is CONTEXT_COLORS:
+        return src
+    if alpha <= 0:
+        return dst
+    return _blend_rgb(mode, tuple(dst.components), tuple(src.components), round(alpha, 3))
+
+
+def _is_opaque(color):
+    return color.special is not None or color.alpha == 255
+
+
+def blend_cell(dst, src, mode="normal", opacity=1.0):
+    """Combines a (char, foreground, background, effects) cell over "dst", a list with the same values, in place
+
+    TRANSPARENT components of "src" leave the ones in "dst" as they are.
+    Where the background of "src" is translucent, and it has no character
+    of its own (a space), the character below shows through, tinted
+    by the "src" background.
+    """
+    char, fg, bg, effects = src
+    if mode == "normal" and opacity >= 1 and (bg is TRANSPARENT or _is_opaque(bg)) and (fg is TRANSPARENT or _is_opaque(fg)):
+        for i, component in enumerate(src):
+            if component is not TRANSPARENT:
+                dst[i] = component
+        return dst
+    if bg is not TRANSPARENT:
+        dst[2] = blend_color(dst[2], bg, mode, opacity)
+    covers = char is not TRANSPARENT and not (char == EMPTY and bg is not TRANSPARENT and dst[0] is not TRANSPARENT)
+    if not covers:
+        if bg is not TRANSPARENT and dst[1] is not TRANSPARENT:
+            dst[1] = blend_color(dst[1], bg, mode, opacity)
+        return dst
+    dst[0] = char
+    if fg is not TRANSPARENT:
+        dst[1] = blend_color(dst[2], fg, mode, opacity)
+    if effects is not TRANSPARENT:
+        dst[3] = effects
+    return dst
+
+
+def _covers(outer, inner):
+    return outer.left <= inner.left and outer.top <= inner.top and outer.right >= inner.right and outer.bottom >= inner.bottom
+
+
+class Layer:
+    """A shape placed in a Compositor
+
+    Args:
+      - shape (Shape): the layer contents
+      - pos (2-sequence): position of the layer top-left corner in the compositor
+      - blend (str): how the layer combines with the ones below: "normal", "add" or "multiply"
+      - opacity (float): 0 to 1. Translucent colors in the shape are combined by their alpha as well
+      - static (bool): hint that the layer rarely changes: its cells are read once and cached,
+            and if it is below all non-static layers, it is flattened in the compositor base buffer.
+      - active (bool): whether the layer is shown
+    """
+
+    def __init__(self, shape, pos=(0, 0), *, blend="normal", opacity=1.0, static=False, active=True):
+        if blend not in BLEND_MODES:
+            raise ValueError(f"blend must be one of {BLEND_MODES}")
+        self.compositor = None
+        self.shape = terminedia.shape(shape)
+        self._pos = V2(pos)
+        self._blend = blend
+        self._opacity = opacity
+        self._active = active
+        self._static = static
+        self._cells = None
+        self._composited_rect = None
+
+    def _changed(self, rect=None):
+        if self.compositor:
+            self.compositor.invalidate(rect or self.rect)
+
+    @property
+    def rect(self):
+        return Rect(self._pos, width_height=self.shape.size)
+
+    @property
+    def pos(self):
+        return self._pos
+
+    @pos.setter
+    def pos(self, value):
+        # The new rect is picked up in Compositor.update, comparing to the one last composited
+        self._pos = V2(value)
+
+    @property
+    def blend(self):
+        return self._blend
+
+    @blend.setter
+    def blend(self, value):
+        if value not in BLEND_MODES:
+            raise ValueError(f"blend must be one of {BLEND_MODES}")
+        self._blend = value
+        self._changed()
+
+    @property
+    def opacity(self):
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, value):
+        self._opacity = value
+        self._changed()
+
+    @property
+    def static(self):
+        return self._static
+
+    @static.setter
+    def static(self, value):
+        self._static = value
+        self._cells = None
+        # the layers flattened in the base buffer may change: Compositor.update rebuilds it
+        self._changed()
+
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, value):
+        self._active = value
+        self._changed()
+
+    def row(self, y, x0, x1):
+        """Cells in the row "y" of the shape, from x0 to x1, in shape coordinates"""
+        if self.static:
+            if self._cells is None:
+                shape = self.shape
+                self._cells = [[tuple(shape[x, y]) for x in range(shape.width)] for y in range(shape.height)]
+            return self._cells[y][x0:x1]
+        shape = self.shape
+        return [tuple(shape[x, y]) for x in range(x0, x1)]
+
+
+class Compositor:
+    """Combines a stack of layers, keeping the result in a cached buffer
+
+    Args:
+      - size (2-sequence): size of the composited area, in characters
+      - background (Color): background under all layers. The default, DEFAULT_BG,
+            is blended as black (see :any:`blend_color`): pass the color actually
+            used by the terminal if there are translucent layers over it.
+
+    Layers are listed from bottom to top in "layers", and are added with "add".
+    "update" composites again only the areas where layers moved, were changed,
+    or had their shapes changed (as tracked by the shape dirty rects - the compositor
+    clears those as it reads them). "render" copies the updated areas to a target shape.
+
+    The bottom layers marked as static are combined once in a base buffer, so
+    the translucent layers over them are composited against it.
+    """
+
+    def __init__(self, size, background=DEFAULT_BG):
+        self.size = V2(size)
+        self.background = background
+        self.layers = []
+        blank = (EMPTY, DEFAULT_FG, background, Effects.none)
+        self._blank = blank
+        self.base = [[list(blank) for _ in range(self.size.x)] for _ in range(self.size.y)]
+        self.buffer = [[list(blank) for _ in range(self.size.x)] for _ in range(self.size.y)]
+        self._pending = []
+        self._updated = []
+        self._flattened_count = None
+        self.invalidate()
+
+    def add(self, shape, pos=(0, 0), **kwargs):
+        """Adds a layer on top of the others, and returns it. Accepts the same arguments as Layer"""
+        layer = shape if isinstance(shape, Layer) else Layer(shape, pos, **kwargs)
+        layer.compositor = self
+        self.layers.append(layer)
+        return layer
+
+    def remove(self, layer):
+        self.layers.remove(layer)
+        layer.compositor = None
+        if layer._composited_rect:
+            self.invalidate(layer._composited_rect)
+
+    def invalidate(self, rect=None):
+        """Marks an area, or everything, to be composited again on the next update"""
+        self._pending.append(Rect((0, 0), self.size) if rect is None else Rect(rect))
+
+    @property
+    def _base_count(self):
+        # number of bottom layers flattened in the base buffer
+        count = 0
+        for layer in self.layers:
+            if not layer.static:
+                break
+            count += 1
+        return count
+
+    def update(self):
+        """Composites again the areas that changed since the last update, and returns their rects"""
+        base_count = self._base_count
+        areas = [(rect, True) for rect in self._pending]
+        self._pending = []
+        if base_count != self._flattened_count:
+            # Layers were added to, or taken from, the bottom static ones: the base buffer is rebuilt
+            areas.append((Rect((0, 0), self.size), True))
+            self._flattened_count = base_count
+        for index, layer in enumerate(self.layers):
+            in_base = index < base_count
+            rect = layer.rect
+            if layer._composited_rect is None or rect != layer._composited_rect:
+                if layer._composited_rect:
+                    areas.append((layer._composited_rect, in_base))
+                areas.append((rect, in_base))
+                layer._composited_rect = rect
+            shape_rects = layer.shape.dirty_rects
+            if shape_rects:
+                layer._cells = None
+                for shape_rect in shape_rects:
+                    shape_rect = Rect(shape_rect)
+                    areas.append((Rect(shape_rect.c1 + rect.c1, width_height=shape_rect.width_height), in_base))
+                layer.shape.dirty_clear()
+
+        bounds = Rect((0, 0), self.size)
+        updated = []
+        done = []
+        for rect, in_base in sorted(areas, key=lambda area: -area[0].area):
+            rect = rect.intersection(bounds)
+            if not rect or not rect.area:
+                continue
+            if any(_covers(done_rect, rect) and (done_base or not in_base) for done_rect, done_base in done):
+                continue
+            done.append((rect, in_base))
+            if in_base:
+                self._composite(rect, self.base, 0, base_count, None)
+            self._composite(rect, self.buffer, base_count, len(self.layers), self.base)
+            updated.append(rect)
+        self._updated.extend(updated)
+        return updated
+
+    def _composite(self, rect, target, first, last, below):
+        x0, x1 = rect.left, rect.right
+        layers = [layer for layer in self.layers[first:last] if layer.active]
+        for y in range(rect.top, rect.bottom):
+            row = [list(cell) for cell in below[y][x0:x1]] if below else [list(self._blank) for _ in range(x0, x1)]
+            for layer in layers:
+                lrect = layer.rect
+                if not lrect.top <= y < lrect.bottom:
+                    continue
+                start, stop = max(x0, lrect.left), min(x1, lrect.right)
+                if start >= stop:
+                    continue
+                cells = layer.row(y - lrect.top, start - lrect.left, stop - lrect.left)
+                blend, opacity = layer.blend, layer.opacity
+                for dst, src in zip(row[start - x0: stop - x0], cells):
+                    blend_cell(dst, src, blend, opacity)
+            target[y][x0:x1] = row
+
+    def render(self, target, pos=(0, 0)):
+        """Updates the composite, and copies the changed areas to "target", a Shape or Screen
+
+        On the first call, or after "invalidate", everything is copied. The target
+        should not be drawn on otherwise in the composited area, or its
+        contents there must be restored with "invalidate".
+        """
+        if isinstance(target, terminedia.Screen):
+            target = target.shape
+        self.update()
+        offset = V2(pos)
+        put_run = getattr(target, "put_run", None)
+        for rect in self._updated:
+            for y in range(rect.top, rect.bottom):
+                cells = self.buffer[y][rect.left:rect.right]
+                start = V2(rect.left, y) + offset
+                if put_run:
+                    put_run(start, cells)
+                else:
+                    for i, cell in enumerate(cells):
+                        target[start.x + i, start.y] = cell
+        self._updated = []
+
+    def __getitem__(self, pos):
+        return tuple(self.buffer[pos[1]][pos[0]])
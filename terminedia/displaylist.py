@@ -0,0 +1,193 @@
+"""Retained mode drawing: operations recorded once and replayed as pre-rendered cells"""
+
+from collections import namedtuple
+
+import terminedia
+from terminedia.image import FullShape
+from terminedia.utils import V2
+from terminedia.values import TRANSPARENT
+
+
+class Param:
+    """Placeholder for a DisplayList parameter, replaced by its value when the list is baked
+
+    It can be used as any argument, or value assigned, when recording
+    operations - including inside tuples and lists used as arguments.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"Param({self.name!r})"
+
+
+def _resolve(value, params):
+    if isinstance(value, Param):
+        return params[value.name]
+    if type(value) in (tuple, list):
+        return type(value)(_resolve(item, params) for item in value)
+    return value
+
+
+_Op = namedtuple("_Op", "kind path args kwargs")
+
+
+class _Recorder:
+    """Stands for a shape while recording a DisplayList
+
+    Reading attributes and items just builds a path into the shape API,
+    as in "draw.line" or "text[1].at". Calls, assignments, and "with" blocks
+    on that path are recorded as operations. Nothing can be read back.
+    """
+
+    __slots__ = ("_display_list", "_path")
+
+    def __init__(self, display_list, path=()):
+        object.__setattr__(self, "_display_list", display_list)
+        object.__setattr__(self, "_path", path)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _Recorder(self._display_list, self._path + (("attr", name),))
+
+    def __getitem__(self, key):
+        return _Recorder(self._display_list, self._path + (("item", key),))
+
+    def __setattr__(self, name, value):
+        self._display_list._record("setattr", self._path, (name, value))
+
+    def __setitem__(self, key, value):
+        self._display_list._record("setitem", self._path, (key, value))
+
+    def __call__(self, *args, **kwargs):
+        self._display_list._record("call", self._path, args, kwargs)
+
+    def __enter__(self):
+        self._display_list._record("call", self._path + (("attr", "__enter__"),), ())
+        return self
+
+    def __exit__(self, *exc_info):
+        self._display_list._record("call", self._path + (("attr", "__exit__"),), (None, None, None))
+
+
+class DisplayList:
+    """Drawing operations recorded once, that can be drawn on any shape over and over
+
+    Args:
+      - size (2-sequence): size, in characters, of the area the operations draw on
+      - params (Mapping): initial values for the list parameters (see :any:`Param`)
+
+    Calls made on "canvas" - through the same API used on shapes, as in
+    ``canvas.draw.rect(...)``, ``canvas.high.draw.line(...)``,
+    ``canvas.text[1][0, 0] = "..."``, ``canvas.context.color = ...`` or
+    ``canvas.sprites.add(...)`` - are recorded, rather than executed.
+    Another display list can be drawn as part of this one with "add".
+
+    On first use, the operations are executed on a blank, transparent shape,
+    and the cells they change are kept as runs of (char, foreground,
+    background, effects) values: this is "baking" the list. "replay"
+    then just copies those cells onto the target. The list is baked again
+    only after new operations are recorded, or its parameters or the ones
+    of an added list change. Sprites and transformers are baked in as they
+    render when the list is baked.
+    """
+
+    def __init__(self, size, params=None):
+        self.size = V2(size)
+        self.params = dict(params or {})
+        self.ops = []
+        self.canvas = _Recorder(self)
+        self._version = 0
+        self._runs = None
+        self._baked_state = None
+
+    def _record(self, kind, path, args, kwargs=None):
+        self.ops.append(_Op(kind, path, args, kwargs or {}))
+        self._version += 1
+
+    def add(self, display_list, pos=(0, 0)):
+        """Draws another display list at "pos", as the next operation of this one"""
+        self._record("list", (), (display_list, V2(pos)))
+
+    def clear(self):
+        """Removes all operations"""
+        self.ops.clear()
+        self._version += 1
+
+    def _state(self):
+        # Whatever changes the baked cells: compared by equality to the state of the last bake
+        return (
+            self._version,
+            dict(self.params),
+            [op.args[0]._state() for op in self.ops if op.kind == "list"],
+        )
+
+    def execute(self, target):
+        """Runs all operations on "target", as if they were called on it"""
+        params = self.params
+        for kind, path, args, kwargs in self.ops:
+            if kind == "list":
+                display_list, pos = args
+                display_list.replay(target, pos)
+                continue
+            obj = target
+            for step, key in path:
+                obj = getattr(obj, key) if step == "attr" else obj[key]
+            args = _resolve(args, params)
+            if kind == "call":
+                obj(*args, **{name: _resolve(value, params) for name, value in kwargs.items()})
+            elif kind == "setattr":
+                setattr(obj, *args)
+            else:
+                obj[args[0]] = args[1]
+
+    def bake(self):
+        """Returns the cells changed by the operations, as a list of (pos, cells) runs
+
+        The runs are computed only if the list changed since the last call.
+        """
+        state = self._state()
+        if self._runs is not None and state == self._baked_state:
+            return self._runs
+        scratch = FullShape.new(self.size)
+        scratch.clear(transparent=True)
+        self.execute(scratch)
+        blank = (TRANSPARENT,) * 4
+        runs = []
+        for y in range(scratch.height):
+            run = None
+            for x in range(scratch.width):
+                cell = tuple(scratch[x, y])
+                if cell == blank:
+                    run = None
+                    continue
+                if run is None:
+                    run = []
+                    runs.append((V2(x, y), run))
+                run.append(cell)
+        self._runs, self._baked_state = runs, state
+        return runs
+
+    def replay(self, target, pos=(0, 0)):
+        """Draws the baked cells on "target", a Shape or Screen, with the top-left corner at "pos"
+
+        On a Screen, the cells go to its shape: they are displayed on the next "update".
+        """
+        if isinstance(target, terminedia.Screen):
+            target = target.shape
+        offset = V2(pos)
+        put_run = getattr(target, "put_run", None)
+        for start, cells in self.bake():
+            start = start + offset
+            if put_run:
+                put_run(start, cells)
+                continue
+            for i, cell in enumerate(cells):
+                target[start.x + i, start.y] = cell
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {tuple(self.size)} with {len(self.ops)} operations>"
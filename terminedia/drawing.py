@@ -534,6 +534,62 @@ class HighResBase:
 
     __getitem__, __setitem__, __delitem__ = get_at, set_at, reset_at
 
+    def _block_number(self, gross_pos):
+        from terminedia.image import Pixel
+
+        original = self.parent.get_raw(gross_pos)
+        if isinstance(original, Pixel):
+            original = original.value
+        elif isinstance(original, Sequence):
+            original = original[0]
+        return self.block_class.chars_to_order.get(original, 0) if isinstance(original, str) else 0
+
+    def blit_bitmap(self, pos, bitmap, erase=True):
+        """Blits a 1-bit per pixel bitmap, writing each covered character only once
+
+        Args:
+          - pos (2-sequence): top-left corner where to blit, in high-resolution pixels
+          - bitmap: object with "width", "height" and "data" attributes, as
+                :any:`terminedia.text.fonts.GlyphBitmap`: "data" holds the pixel rows,
+                most significant bit first, each row taking a whole number of bytes.
+          - erase (bool): if True, unset bits reset the respective pixels. Otherwise they are left untouched.
+
+        Unlike ``.draw.blit``, which sets or resets each pixel in turn, this
+        gathers all the pixels in a character block and composes the
+        block character at once - characters only partially covered
+        by the bitmap preserve their other pixels.
+        """
+        block_width, block_height = self.block_width, self.block_height
+        block_class = self.block_class
+        bit_index = block_class.bit_index
+        x0, y0 = V2(pos).as_int
+        width, height, data = bitmap.width, bitmap.height, bitmap.data
+        row_bytes = (width + 7) // 8
+
+        for cy in range(y0 // block_height, (y0 + height - 1) // block_height + 1):
+            for cx in range(x0 // block_width, (x0 + width - 1) // block_width + 1):
+                mask = number = 0
+                for iy in range(block_height):
+                    y = cy * block_height + iy - y0
+                    if not 0 <= y < height:
+                        continue
+                    row = y * row_bytes
+                    for ix in range(block_width):
+                        x = cx * block_width + ix - x0
+                        if not 0 <= x < width:
+                            continue
+                        index = bit_index((ix, iy))
+                        mask |= index
+                        if data[row + (x >> 3)] & (0x80 >> (x & 7)):
+                            number |= index
+                if not erase:
+                    if not number:
+                        continue
+                    mask = number
+                if mask != block_class.bit_size:
+                    number |= self._block_number((cx, cy)) & ~mask
+                self.parent[cx, cy] = block_class.chars_in_order[number]
+
     def at_parent(self, pos):
         """Get the equivalent, rounded down, coordinates, at the parent object.
 
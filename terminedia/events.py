@@ -24,6 +24,13 @@ _event_queue = deque()
 _sigwinch_counter = 0
 _original_sigwinch = None
 
+#: Subscriptions for each (event type, including system subscriptions) pair, in the order
+#: they receive events. Rebuilt on demand whenever any subscription changes.
+_dispatch_table = {}
+
+#: Event types for which only the latest event in each batch is delivered - see "coalesce"
+_coalesced_types = set()
+
 
 class EventMessage(Exception):
     pass
@@ -106,8 +113,11 @@ class Subscription:
         self.types = event_types
         for type_ in event_types:
             cls.subscriptions.setdefault(type_, []).append(self)
+        _dispatch_table.clear()
         self.resolution = .005
         self.terminated = False
+        # asyncio.Event set when events arrive for subscriptions being iterated upon
+        self.waiter = None
 
     def __bool__(self):
         if self.callback:
@@ -124,6 +134,14 @@ class Subscription:
         while not self.terminated:
             if self.queue:
                 return self.queue.popleft()
+            if terminedia.input.keyboard.reader_loop:
+                # Input is dispatched as it arrives, and other events on each frame:
+                # just wait to be woken up.
+                if self.waiter is None:
+                    self.waiter = asyncio.Event()
+                self.waiter.clear()
+                await self.waiter.wait()
+                continue
             await asyncio.sleep(self.resolution)
             # HACK: pump keyboard events if not in a Screen context
             if KeyPress in self.types:
@@ -135,7 +153,10 @@ class Subscription:
     def kill(self):
         for type in self.types:
             self.__class__.subscriptions[type].remove(self)
+        _dispatch_table.clear()
         self.terminated = True
+        if self.waiter:
+            self.waiter.set()
 
     def prioritize(self):
         """move this subscription so that it receives the event first
@@ -151,6 +172,7 @@ class Subscription:
             except ValueError:
                 pass
             cls.subscriptions[type_].append(self)
+        _dispatch_table.clear()
 
     def __repr__(self):
         return f"Subscription {self.types}{', callback: ' + repr(self.callback) if self.callback else '' }"
@@ -181,13 +203,53 @@ def dispatch(event):
 _event_dispatch = dispatch
 
 
-def list_subscriptions(type_: EventTypes, _system=False) -> Iterator:
-    """Returns a set with all active subscriptions for the given event type"""
-    if _system:
-        system_events = reversed(_SystemSubscription.subscriptions.get(type_, []))
-    else:
-        system_events = []
-    return chain(system_events, reversed(Subscription.subscriptions.get(type_, [])))
+def list_subscriptions(type_: EventTypes, _system=False) -> tuple:
+    """Returns a tuple with all active subscriptions for the given event type
+
+    Subscriptions are listed in the order they receive events: newer first,
+    and, if "_system" is True, system subscriptions before all others.
+    """
+    key = (type_, _system)
+    try:
+        return _dispatch_table[key]
+    except KeyError:
+        pass
+    system_events = reversed(_SystemSubscription.subscriptions.get(type_, ())) if _system else ()
+    subscriptions = _dispatch_table[key] = tuple(
+        chain(system_events, reversed(Subscription.subscriptions.get(type_, ())))
+    )
+    return subscriptions
+
+
+def coalesce(event_types, enable=True):
+    """Delivers only the latest event of the given types created between two event processing rounds
+
+    Args:
+      - event_types (EventTypes): event types for which older events are dropped
+          when newer ones are pending. Ex.: ``coalesce(MouseMove | TerminalSizeChange)``
+      - enable (bool): pass False to deliver all events of the given types again.
+
+    Useful for events that describe a state, where only the most recent one matters,
+    and that can be generated in bursts: the mouse position, the terminal size.
+    """
+    for type_ in event_types:
+        if enable:
+            _coalesced_types.add(type_)
+        else:
+            _coalesced_types.discard(type_)
+
+
+def _coalesce_batch(events):
+    seen = set()
+    result = []
+    for event in reversed(events):
+        if event.type in _coalesced_types:
+            if event.type in seen:
+                continue
+            seen.add(event.type)
+        result.append(event)
+    result.reverse()
+    return result
 
 
 def _event_process_handle_coro(coro):
@@ -211,15 +273,17 @@ def process():
     """
 
     # Event processing in callbacks is synchronous, and as the callbacks
-    # can create other events, we have to copy the queue on each interaction
-    # to prevent the queue from being changed during interaction.
+    # can create other events, events are taken from the queue in batches,
+    # until no new events are created.
 
-    events = deque(_event_queue)
-    _event_queue.clear()
-    while  events:
+    while _event_queue:
+        events = list(_event_queue)
+        _event_queue.clear()
+        if _coalesced_types:
+            events = _coalesce_batch(events)
         for event in events:
             for subscription in list_subscriptions(event.type, _system=True):
-                if subscription.guard and not subscription.guard(event):
+                if subscription.terminated or subscription.guard and not subscription.guard(event):
                     continue
                 if subscription.callback:
                     try:
@@ -230,8 +294,8 @@ def process():
                         break
                 else:
                     subscription.queue.append(event)
-        events = deque(_event_queue)
-        _event_queue.clear()
+                    if subscription.waiter:
+                        subscription.waiter.set()
 
 
 def window_change_handler(signal_number, frame):
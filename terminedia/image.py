@@ -402,22 +402,19 @@ class ShapeDirtyMixin:
 
         # If there is any time-dependant image change, there is no way
         # to predict what changes from one frame to the next - just mark
-        # all shape as dirty.
-        if any("tick" in sig for transformer in self.context.transformers for sig in transformer.signatures.values()):
-            self.dirty_set()
-            return
+        # all shape as dirty, or the regions the transformers declare they will change.
+        transformers = self.context.transformers
+        if transformers.capabilities.uses_tick:
+            for rect in transformers.tick_dirty_rects(self.size):
+                self.dirty_registry.push((tick, Rect(rect), None))
 
         # Collect rects from sprites
         if self.has_sprites:
             for sprite in self.sprites:
                 if not sprite.active:
                     continue
-
-                if any("tick" in sig for transformer in sprite.transformers for sig in transformer.signatures.values()):
-                    self.dirty_registry.push((tick, sprite.rect, sprite.shape))
-                else:
-                    for rect in sprite.dirty_rects:
-                        self.dirty_registry.push((tick, sprite.owner_coords(rect), sprite.shape))
+                for rect in sprite.dirty_rects:
+                    self.dirty_registry.push((tick, sprite.owner_coords(rect), sprite.shape))
             if self.sprites.killed_sprites:
                 for rect in self.sprites.killed_sprites:
                     self.dirty_registry.push((tick, rect, None))
@@ -1051,12 +1048,11 @@ class PalettedShape(Shape):
         self.color_map = color_map
         if isinstance(data, (str, list)):
             self.load_paletted(data)
-            return
         elif isinstance(data, Path) or hasattr(data, "read"):
             self.load_file(data)
-            return
+        else:
+            raise NotImplementedError(f"Can't load shape from {type(data).__name__}")
         super().__init__()
-        raise NotImplementedError(f"Can't load shape from {type(data).__name__}")
 
     def load_paletted(self, data):
 
@@ -1107,11 +1103,14 @@ class PalettedShape(Shape):
         """
         pos = V2(pos)
         self.dirty_mark_pixel(pos)
-        type_ = self.PixelCls.capabilities.value_type
-        self.raw_setitem(pos, type_(value))
+        if isinstance(value, Pixel):
+            value = value.value
+        if not isinstance(value, str):
+            value = "#" if value else EMPTY
+        self._raw_setitem(pos, value)
 
     def _raw_setitem(self, pos, value):
-        self.data[pos[1] * self.width + pos[0]] = type_(value)
+        self.data[pos[1] * self.width + pos[0]] = value
 
 
 
@@ -1344,6 +1343,47 @@ class FullShape(RasterUndo, Shape):
             value = value[:]
         return value
 
+    def _get_raw_for_write(self, pos):
+        # Pixel data list about to be changed in place.
+        # (Subclasses with sparse storage allocate it here, rather than on reads)
+        return self.get_raw(pos)
+
+    def put_run(self, pos, cells):
+        """Writes a horizontal run of cells starting at "pos", straight into the shape data
+
+        Args:
+          - pos (2-sequence): position of the first cell
+          - cells (sequence): (char, foreground, background, effects) values for
+                each cell. TRANSPARENT components leave the existing value in place.
+
+        This is a bulk path for cells already rendered elsewhere, like the ones read
+        with "get_raw": no context, pretransformer or double width handling is
+        applied, as when setting pixels one at a time.
+        """
+        x0, y = pos
+        if not 0 <= y < self.height:
+            return
+        if self.undo_active:
+            for x, cell in enumerate(cells, x0):
+                if 0 <= x < self.width:
+                    self[x, y] = cell
+            return
+        data = self.data
+        start, x1 = max(x0, 0), min(x0 + len(cells), self.width)
+        if start >= x1:
+            return
+        for x in range(start, x1):
+            cell = cells[x - x0]
+            pixel = data.get((x, y))
+            if pixel is None:
+                pixel = self._get_raw_for_write(V2(x, y))
+            for i, component in enumerate(cell):
+                if component is not TRANSPARENT:
+                    pixel[i] = component
+        tile_y = y // DIRTY_TILE_SIZE
+        for tile_x in range(start // DIRTY_TILE_SIZE, (x1 - 1) // DIRTY_TILE_SIZE + 1):
+            self.dirty_pixels.add(V2(tile_x, tile_y))
+
     def __getitem__(self, pos):
         """Values for each pixel are: character, fg_color, bg_color, effects.
         """
@@ -1443,9 +1483,9 @@ class FullShape(RasterUndo, Shape):
         self._raw_setitem(pos, value, force_transparent_ink, double_width, offset2)
 
     def _raw_setitem(self, pos, value, force_transparent_ink=False, double_width=False, offset2=None):
-        pixel = self.get_raw(pos)
+        pixel = self._get_raw_for_write(pos)
         if offset2:
-            pixel2 = self.get_raw((offset2, pos[1]))
+            pixel2 = self._get_raw_for_write((offset2, pos[1]))
         for i, component in enumerate(value):
             # the idea is that "TRANSPARENT" won't affect the corresponding component.
             # but "force_transparent_ink" can set the value of the component itself to
@@ -1,7 +1,7 @@
 """non-blocking Keyboard reading and other input related code
 """
+import codecs
 import enum
-import io
 import os
 import re
 import sys
@@ -13,14 +13,25 @@ from collections import defaultdict, deque, namedtuple
 from contextlib import contextmanager
 
 from terminedia.utils import mirror_dict, V2, contextkwords
-from terminedia.events import Event, EventTypes, list_subscriptions
+from terminedia.events import Event, EventTypes, list_subscriptions, process
 
 
 class KeyboardBase:
     # abstract
+
+    #: asyncio loop where the keyboard is registered as a reader, if any - see "add_reader"
+    reader_loop = None
+
     def __init__(self):
         self.enabled = 0
 
+    def add_reader(self, loop, callback=None):
+        """Reads input as soon as it arrives, from within an asyncio loop. Not supported on this platform"""
+        return False
+
+    def remove_reader(self):
+        pass
+
     def __enter__(self):
         pass
 
@@ -75,17 +86,91 @@ class _posix_KeyCodes:
     codes = mirror_dict(locals())
 
 
+#: Mouse report in SGR (1006) mode: '<ESC>[<B;Col;RowM' (last char is 'm' if button-release)
+_SGR_MOUSE = r"\x1b\[<(?P<button>\d+);(?P<column>\d+);(?P<row>\d+)(?P<press>[Mm])"
+
+_input_token = re.compile(
+    r"(?P<chars>[^\x1b]+)"
+    r"|(?P<paste>\x1b\[200~(?P<pasted>.*?)\x1b\[201~)"
+    rf"|(?P<mouse>{_SGR_MOUSE})"
+    # Generic "control sequence introducer" sequences, and single shift 3 ones (ESC O + char)
+    r"|(?P<sequence>\x1b\[[\x30-\x3f]*[\x20-\x2f]*[\x40-\x7e]|\x1bO.)"
+    r"|(?P<esc>\x1b)",
+    re.DOTALL
+)
+
+_incomplete_sequence = re.compile(
+    r"\x1b(\[200~(?:(?!\x1b\[201~).)*|\[[\x30-\x3f]*[\x20-\x2f]*|O)?", re.DOTALL
+)
+
+
+class InputDecoder:
+    """Incremental decoder for terminal input: splits it into key codes and mouse reports
+
+    Data is decoded in a single pass for each call to :any:`InputDecoder.feed`,
+    using one regular expression that matches whole tokens: runs of
+    ordinary characters, escape sequences, SGR mouse reports and
+    bracketed-paste blocks (whose contents are passed on as ordinary characters).
+    A sequence split between two reads is kept and completed in the next call.
+    """
+
+    def __init__(self):
+        self.pending = ""
+
+    def feed(self, data, final=False):
+        """Decodes the given text, continuing any pending, incomplete, sequence
+
+        Args:
+          - data (str): input text
+          - final (bool): if True, an incomplete sequence left at the end of data is decoded
+                as it is (ex. a lone ESC is taken as the ESC key) instead of being kept.
+
+        Returns a list of tokens: ("key", keycode) pairs, or ("mouse", match) pairs
+        where "match" is the regular expression match for the SGR mouse report.
+        """
+        text = self.pending + data
+        self.pending = ""
+        tokens = []
+        pos = 0
+        size = len(text)
+        while pos < size:
+            if not final and text[pos] == "\x1b" and _incomplete_sequence.fullmatch(text, pos):
+                self.pending = text[pos:]
+                break
+            match = _input_token.match(text, pos)
+            kind = match.lastgroup
+            if kind == "chars":
+                tokens.extend(("key", char) for char in match.group())
+            elif kind == "paste":
+                tokens.extend(("key", char) for char in match.group("pasted"))
+            elif kind == "mouse":
+                tokens.append(("mouse", match))
+            else:
+                tokens.append(("key", match.group()))
+            pos = match.end()
+        return tokens
+
+
 class _PosixKeyboard(KeyboardBase):
 
     # Keyboard reading code copied and evolved from
     # https://stackoverflow.com/a/6599441/108205
     # (@mheyman, Mar, 2011)
 
+    #: Maximum number of bytes read from stdin at once
+    read_size = 16384
+    #: Seconds to wait, when input is read by an asyncio loop, for the rest
+    #: of an incomplete escape sequence before taking it as an ESC keypress
+    escape_timeout = 0.05
+
     def __init__(self):
         super().__init__()
-        self._last_pressed_after_ESC = False
         self.not_consumed = deque()
         self.fake_stdin = False
+        self.decoder = InputDecoder()
+        self.tokens = deque()
+        self._utf8_decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._flush_handle = None
 
     def __enter__(self):
         """
@@ -148,45 +233,83 @@ class _PosixKeyboard(KeyboardBase):
 
 
     def reset(self):
+        self.remove_reader()
+        self.decoder = InputDecoder()
+        self.tokens.clear()
+        self._utf8_decoder.reset()
         if self.fake_stdin:
             return
         if hasattr(self, "attrs_save"):
             termios.tcsetattr(self.fd, termios.TCSAFLUSH, self.attrs_save)
             fcntl.fcntl(self.fd, fcntl.F_SETFL, self.flags_save)
         self.enabled = 0
-        self._last_pressed_after_ESC = ""
 
-    def _scan_code(self, stream):
+    def _read(self):
+        """Reads all input currently available, with a single call to read, in non-blocking mode"""
+        if self.fake_stdin:
+            return sys.stdin.read(self.read_size)
+        try:
+            data = os.read(self.fd, self.read_size)
+        except (BlockingIOError, InterruptedError):
+            return ""
+        return self._utf8_decoder.decode(data)
+
+    def add_reader(self, loop, callback=None):
+        """Registers stdin as a reader in an asyncio loop, so input is dispatched as soon as it arrives
 
-        composed = ""
-        while True:
-            # read byte by byte, so that no extra input is consumed from stdin
-            if self._last_pressed_after_ESC:
-                next_char = self._last_pressed_after_ESC
-            else:
-                next_char = stream.read(1)
-            if not next_char:
-                return composed, True
-            # There is one special case, when "ESC" is pressed in non-clearing mode:
-            # we should not have read the next token, but it is already fetched by now.
-            if len(composed) == 2 and composed[0] == "\x1b" and composed[1] != "[":
-                self._last_pressed_after_ESC = composed[1]
-                return composed[0], False
-
-            self._last_pressed_after_ESC = ""
-            composed += next_char
-            if composed == "\x1b":
-                continue
-            if len(composed) == 1 or composed in self.keycodes.codes or len(composed) > 30:
-                return composed, False
-
-            # "mouse" is a module alias for the singleton of the posix-mouse reader, defined bellow.
-            if mouse.enabled:
-                # mouse.match consumes the token
-                m = mouse.match(composed)
-                if m:
-                    return "", False
+        Args:
+          - loop: the running asyncio event loop
+          - callback (Optional[callable]): called with no arguments after each input batch is dispatched
+
+        Each time there is data to be read, all of it is read and decoded, and
+        the resulting events are processed right away. Meanwhile, ``Screen.update``
+        does not need to poll the keyboard, and event subscriptions being
+        iterated in async code are woken up when their events arrive,
+        instead of polling for them.
 
+        Only available inside a keyboard managed context, for a tty stdin. Returns
+        True if the reader was set.
+        """
+        if not self.enabled or self.fake_stdin or self.reader_loop:
+            return False
+        loop.add_reader(self.fd, self._input_ready, callback)
+        self.reader_loop = loop
+        return True
+
+    def remove_reader(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self.reader_loop:
+            self.reader_loop.remove_reader(self.fd)
+            self.reader_loop = None
+
+    def _input_ready(self, callback):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self.inkey(consume=False)
+        process()
+        if callback:
+            callback()
+        if self.decoder.pending and self.reader_loop:
+            # No new data will wake the reader up if this is a lone ESC:
+            # read again after a while - with nothing else arrived, it is dispatched as the ESC key
+            self._flush_handle = self.reader_loop.call_later(self.escape_timeout, self._input_ready, callback)
+
+    def _fetch_tokens(self):
+        data = self._read()
+        # Nothing else arrived: an incomplete sequence can only be an ESC keypress
+        self.tokens.extend(self.decoder.feed(data, final=not data))
+
+    def _token_keycode(self, token):
+        kind, value = token
+        if kind == "key":
+            return value
+        if mouse.enabled:
+            mouse.report(value)
+            return ""
+        return value.group()
 
     def inkey(self, break_=True, clear=True, consume=True):
         """Return currently pressed key as a string
@@ -236,31 +359,32 @@ class _PosixKeyboard(KeyboardBase):
         if self.not_consumed and consume:
             return self.not_consumed.popleft()
 
-        last_emitted = old_keycode = ""
+        if clear or not self.tokens:
+            self._fetch_tokens()
 
         if not clear:
-            buffer = sys.stdin
-        else:
-            # read all buffer, generate events for all tokens
-            # but return only the last event
-            # (so, the caller to "inkey" have info on the last pressed key)
-            buffer = io.StringIO(sys.stdin.read(10000))
-            buffer.seek(0)
-
-        while True:
-            keycode, stream_eof = self._scan_code(buffer)
-            if stream_eof and not keycode:
-                keycode = old_keycode
+            # next tokens will be consumed in next calls
+            keycode = self._token_keycode(self.tokens.popleft()) if self.tokens else ""
             if keycode == '\x03' and break_:
                 raise KeyboardInterrupt()
             if keycode and list_subscriptions(EventTypes.KeyPress):
-                if not(last_emitted == keycode and old_keycode == keycode):
-                    Event(EventTypes.KeyPress, key=keycode)
-                last_emitted = keycode
-            if not clear or stream_eof:
-                # next characters will be consumed in next calls
-                break
-            old_keycode = keycode
+                Event(EventTypes.KeyPress, key=keycode)
+        else:
+            # generate events for all tokens read,
+            # but return only the last keycode
+            # (so, the caller to "inkey" have info on the last pressed key)
+            last_emitted = keycode = ""
+            emit = list_subscriptions(EventTypes.KeyPress)
+            while self.tokens:
+                old_keycode = keycode
+                keycode = self._token_keycode(self.tokens.popleft())
+                if keycode == '\x03' and break_:
+                    self.tokens.clear()
+                    raise KeyboardInterrupt()
+                if keycode and emit:
+                    if not(last_emitted == keycode and old_keycode == keycode):
+                        Event(EventTypes.KeyPress, key=keycode)
+                    last_emitted = keycode
         if not consume:
             self.not_consumed.append(keycode)
         if mouse.enabled and mouse.on_hold_clicks:
@@ -495,10 +619,14 @@ class _Mouse:
 
     def match(self, sequence):
         # The ANSI sequence for a mouse event in mode 1006 is '<ESC>[B;Col;RowM' (last char is 'm' if button-release)
-        m = re.match(r"\x1b\[\<(?P<button>\d+);(?P<column>\d+);(?P<row>\d+)(?P<press>[Mm])", sequence)
+        m = re.match(_SGR_MOUSE, sequence)
         if not m:
             return None
-        params = m.groupdict()
+        return self.report(m)
+
+    def report(self, match):
+        """Dispatches the mouse events for a matched SGR mouse report"""
+        params = match.groupdict()
         pressed = params["press"] == "M"
         button = _button_map.get(int(params["button"]) & (~0x20), None)
         moving = bool(int(params["button"]) & 0x20)
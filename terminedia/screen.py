@@ -483,8 +483,13 @@ class Screen:
         """
         tick_forward()
 
-        if self.interactive and terminedia.input.keyboard.enabled and not self._inkey_called_since_last_update:
-            # Ensure the dispatch of keypress events:
+        keyboard = terminedia.input.keyboard
+        if (
+            self.interactive and keyboard.enabled and not self._inkey_called_since_last_update
+            and not keyboard.reader_loop
+        ):
+            # Ensure the dispatch of keypress events
+            # (unless input is read as it arrives, in an asyncio loop):
             terminedia.inkey(consume=False)
 
         self._inkey_called_since_last_update = False
@@ -4,6 +4,7 @@ from pathlib import Path
 import math
 import weakref
 
+from terminedia.compositor import BLEND_MODES, blend_cell
 from terminedia.transformers import TransformersContainer
 from terminedia.utils import  HookList, Rect, V2, get_current_tick
 from terminedia.values import EMPTY, TRANSPARENT
@@ -11,6 +12,64 @@ from terminedia.values import EMPTY, TRANSPARENT
 
 tags = dict()
 
+#: Estimated memory used by each cell of a pre-rendered frame: a pixel tuple and a reference to it
+_CELL_SIZE = 80
+
+
+class FrameCache:
+    """Pre-rendered frames of an animated sprite: see Sprite.bake_frames
+
+    Frames are tuples of pixels, one row after the other, and are never
+    changed: identical frames are kept only once, and the areas that change from
+    each frame to the next are computed in advance.
+    """
+
+    #: Upper limit for the estimated memory used by all frame caches together, in bytes
+    budget = 32 * 2 ** 20
+    #: Estimated memory used by frame caches currently alive, in bytes
+    total_size = 0
+
+    def __init__(self, frames, size, step=1):
+        self.size = V2(size)
+        self.step = step
+        # pixels are not hashable: frames are deduplicated by comparison
+        unique = []
+        for frame in frames:
+            if frame not in unique:
+                unique.append(frame)
+        self.frames = tuple(unique[unique.index(frame)] for frame in frames)
+        self.changes = tuple(self._diff(self.frames[i - 1], self.frames[i]) for i in range(len(self.frames)))
+        self.memory_size = len(unique) * self.size.x * self.size.y * _CELL_SIZE
+        FrameCache.total_size += self.memory_size
+        weakref.finalize(self, FrameCache._release, self.memory_size)
+
+    @staticmethod
+    def _release(memory_size):
+        FrameCache.total_size -= memory_size
+
+    def _diff(self, previous, frame):
+        # rect tuples, one per row, spanning the cells that differ between two frames
+        if previous is frame:
+            return frozenset()
+        width = self.size.x
+        rects = set()
+        for y in range(self.size.y):
+            row = range(y * width, (y + 1) * width)
+            changed = [x for x, index in enumerate(row) if previous[index] != frame[index]]
+            if changed:
+                rects.add((changed[0], y, changed[-1] + 1, y + 1))
+        return frozenset(rects)
+
+    def index(self, tick):
+        """Number of the frame shown at "tick" """
+        return (tick // self.step) % len(self.frames)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
 
 class Sprite:
     """Sprites are meant to be associated with Shapes
@@ -31,15 +90,36 @@ class Sprite:
     (Each shape on a sprite can, in turn, be host to text planes, and other
     sprites as needed)
 
+    "blend" ("normal", "add" or "multiply") and "opacity" (0 to 1) control how
+    the sprite pixels combine with the ones below it - colors with an alpha
+    component are combined by it as well. If "alpha" is True, spaces in the shapes
+    are made transparent, showing whatever is below them.
+
+    Animations can be pre-rendered with "bake_frames", after which showing a
+    new frame is just picking it from a cache.
+
     """
-    def __init__(self, shapes, pos=(0,0), active=True, tick_cycle=1, anchor="topleft", alpha=True):
+
+    #: Increased whenever a sprite with "geometry_watched" set is moved, added to or
+    #: removed from a shape: code caching the screen positions of those sprites checks it for staleness
+    geometry_version = 0
+    #: Set on sprites whose screen position is cached elsewhere (like the ones
+    #: of widgets and their ancestors). Changes to other sprites do not affect "geometry_version"
+    geometry_watched = False
+
+    def __init__(self, shapes, pos=(0,0), active=True, tick_cycle=1, anchor="topleft", alpha=True, blend="normal", opacity=1.0):
         from terminedia.image import Shape
         self.shapes = self._check_and_promote(shapes)
         self.pos = pos
         self.active = active
+        self.blend = blend
+        self.opacity = opacity
         self.tick_cycle = tick_cycle
         self.anchor = anchor
         self.transformers = TransformersContainer()
+        self.frames = None
+        self._frame_shown = None
+        self._frame_dirty = (None, None)
         self.dirty_previous_rect = self.rect
         for shape in self.shapes:
             shape._owner_sprite = weakref.ref(self)
@@ -74,6 +154,28 @@ class Sprite:
         if getattr(self, "owner", None):
             self.owner.dirty_registry.push((get_current_tick(), self.rect, None))
 
+    @property
+    def blend(self):
+        return self.__dict__["blend"]
+
+    @blend.setter
+    def blend(self, value):
+        if value not in BLEND_MODES:
+            raise ValueError(f"blend must be one of {BLEND_MODES}")
+        self.__dict__["blend"] = value
+        if getattr(self, "owner", None):
+            self.owner.dirty_registry.push((get_current_tick(), self.rect, None))
+
+    @property
+    def opacity(self):
+        return self.__dict__["opacity"]
+
+    @opacity.setter
+    def opacity(self, value):
+        self.__dict__["opacity"] = value
+        if getattr(self, "owner", None):
+            self.owner.dirty_registry.push((get_current_tick(), self.rect, None))
+
     @property
     def pos(self):
         return self._pos
@@ -83,6 +185,8 @@ class Sprite:
         if getattr(self, "owner", None):
             self.owner.dirty_registry.push((get_current_tick(), self.rect, None))
         self._pos = V2(value)
+        if self.geometry_watched:
+            Sprite.geometry_version += 1
 
     @property
     def shape(self):
@@ -114,16 +218,95 @@ class Sprite:
                 break
         return rect
 
+    def bake_frames(self, count=None, *, budget=None):
+        """Pre-renders the animation frames, so that playing them just picks one from a cache
+
+        Args:
+          - count (int): number of ticks after which the animation repeats, if
+                any transformer uses "tick". Defaults to "len(shapes) * tick_cycle".
+                Otherwise, there is one frame per shape, and "count" is ignored.
+          - budget (int): upper limit, in bytes, for the estimated memory used by
+                the frames of all sprites. Defaults to "FrameCache.budget".
+
+        Each frame is a shape with the sprite transformers applied (as in
+        TransformersContainer.bake) for the tick it is shown. Then, on each
+        frame, the sprite is dirty only on the cells which differ from the
+        previous frame. Changes to the shapes or transformers after that are
+        not seen until "bake_frames" is called again, or "drop_frames" is called.
+
+        Transformers in the context of the shapes themselves are applied as the
+        shapes are read, with the current tick: if any of them uses "tick",
+        the frames can't be baked, and ValueError is raised.
+
+        Returns True if the frames were baked, or False if they would not fit
+        in the budget - in which case the sprite keeps being rendered on each read.
+        """
+        from terminedia.image import FullShape
+
+        if self.transformers.capabilities.uses_tick:
+            count = count or len(self.shapes) * self.tick_cycle
+            step = 1
+        else:
+            count, step = len(self.shapes), self.tick_cycle
+        size = self.shapes[0].size
+        if any(shape.size != size for shape in self.shapes):
+            raise ValueError("All shapes in a sprite must have the same size to bake its frames")
+        if any(shape.context.transformers.capabilities.uses_tick for shape in self.shapes):
+            raise ValueError("Can't bake the frames of a sprite whose shapes have transformers using 'tick'")
+        budget = FrameCache.budget if budget is None else budget
+        previous_size = self.frames.memory_size if self.frames else 0
+        if (count * size[0] * size[1] * _CELL_SIZE) + FrameCache.total_size - previous_size > budget:
+            return False
+
+        frames = []
+        for number in range(count):
+            tick = number * step
+            shape = self.shapes[(tick // self.tick_cycle) % len(self.shapes)]
+            scratch = FullShape.new(size)
+            scratch.clear(transparent=True)
+            self.transformers.bake(shape, target=scratch, tick=tick)
+            frames.append(tuple(pixel for _, pixel in scratch))
+        self.drop_frames()
+        self.frames = FrameCache(frames, size, step)
+        return True
+
+    def drop_frames(self):
+        """Discards frames pre-rendered with "bake_frames", going back to render the sprite on each read"""
+        self.frames = None
+        self._frame_shown = None
+        self._frame_dirty = (None, None)
+
     @property
     def dirty_rects(self):
         changed_rect = self.rect != self.dirty_previous_rect
-        transformer_using_tick = any("tick" in transformer.signatures for transformer in self.transformers)
-        if changed_rect or transformer_using_tick:
+        if changed_rect:
             dirty = {(self.rect - self.rect.c1).as_tuple}
+        elif self.frames:
+            dirty = set(self._frames_dirty_rects())
         else:
             dirty = self.shape.dirty_rects
+            if self.transformers.capabilities.uses_tick:
+                dirty |= self.transformers.tick_dirty_rects(self.size)
 
         self.dirty_previous_rect = self.rect
+        if self.frames:
+            self._frame_shown = self.frames.index(get_current_tick())
+        return dirty
+
+    def _frames_dirty_rects(self):
+        # The same result for every call in a tick
+        tick = get_current_tick()
+        if self._frame_dirty[0] == tick:
+            return self._frame_dirty[1]
+        frames = self.frames
+        index, shown = frames.index(tick), self._frame_shown
+        if shown is None:
+            dirty = frozenset({(0, 0, *frames.size)})
+        elif index == (shown + 1) % len(frames):
+            dirty = frames.changes[index]
+        else:
+            dirty = frames._diff(frames[shown], frames[index])
+        self._frame_dirty = (tick, dirty)
         return dirty
 
     def owner_coords(self, rect, where=None):
@@ -134,12 +317,14 @@ class Sprite:
         return Rect(where.c1 + rect.c1, width=rect.width, height=rect.height)
 
     def get_at(self, pos=None, container_pos=None, pixel=None):
-        # TODO: pixel to be used when there are combination modes/translucency
         if container_pos:
             if self.anchor == "topleft":
                 pos = container_pos - self.pos
             else:
                 pos = container_pos - self.rect.c1
+        frames = self.frames
+        if frames:
+            return frames.frames[frames.index(get_current_tick())][pos[1] * frames.size.x + pos[0]]
         pixel = self.shape[pos]
         if self.transformers:
             pixel = self.transformers.process(self.shape, pos, pixel)
@@ -175,6 +360,8 @@ class SpriteContainer(HookList):
         if not isinstance(item, Sprite):
             item = Sprite(item)
         item.owner = self.owner
+        if item.geometry_watched:
+            Sprite.geometry_version += 1
         return item
 
     def get_at(self, pos, pixel=None):
@@ -185,20 +372,20 @@ class SpriteContainer(HookList):
                 continue
             if pos in sprite.rect:
                 new_pixel = sprite.get_at(container_pos=pos, pixel=pixel)
-                if any(comp is TRANSPARENT for comp in new_pixel):
-                    pixel = [c_orig if c_new is TRANSPARENT else c_new for c_orig, c_new in zip(pixel, new_pixel)]
+                if len(pixel) == 4:
+                    pixel = blend_cell(list(pixel), new_pixel, sprite.blend, sprite.opacity)
                 else:
-                    pixel = new_pixel
+                    pixel = [c_orig if c_new is TRANSPARENT else c_new for c_orig, c_new in zip(pixel, new_pixel)]
         return pixel if isinstance(pixel, pcls) else pcls(*pixel)
 
-    def add(self, item, pos=(0,0), active=True, tick_cycle=1, anchor="topleft", alpha=True):
+    def add(self, item, pos=(0,0), active=True, tick_cycle=1, anchor="topleft", alpha=True, blend="normal", opacity=1.0):
         """Ädds a new sprite and returns it! (in contrast with `.append`)
 
         Allows one to specify extra parameters, over ".append", most useful
         of all the initial position, "pos"
         """
         if not isinstance(item, Sprite):
-            item = Sprite(item, pos, active, tick_cycle, anchor, alpha=alpha)
+            item = Sprite(item, pos, active, tick_cycle, anchor, alpha=alpha, blend=blend, opacity=opacity)
         self.append(item)
         return item
 
@@ -206,6 +393,8 @@ class SpriteContainer(HookList):
         self.killed_sprites.append(sprite.rect)
         super().remove(sprite)
         sprite.owner = None
+        if sprite.geometry_watched:
+            Sprite.geometry_version += 1
 
     def _set_zindex(self, sprite, zindex):
         pos = self.index(sprite)
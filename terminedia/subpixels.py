@@ -49,11 +49,15 @@ class SubPixels:
         """True if a char is a "pixel representing" unicode character"""
         return char in self.chars
 
+    @classmethod
+    def bit_index(cls, pos):
+        """Bit, in the order number of a block character, that corresponds to the pixel at "pos" """
+        return 2 ** (pos[0] + cls.block_width * pos[1])
+
     @classmethod
     def _op(cls, pos, data, operation):
         number = cls.chars_to_order[data]
-        index = 2 ** (pos[0] + cls.block_width * pos[1])
-        return operation(number, index)
+        return operation(number, cls.bit_index(pos))
 
     @classmethod
     def set(cls, pos, data):
@@ -150,10 +154,8 @@ class HalfChars_(SubPixels):
     FULL_BLOCK = values.FULL_BLOCK
 
     @classmethod
-    def _op(cls, pos, data, operation):
-        number = cls.chars_to_order[data]
-        index = 1 + pos[1]
-        return operation(number, index)
+    def bit_index(cls, pos):
+        return 1 + pos[1]
 
 HalfChars = HalfChars_()
 
@@ -173,10 +175,8 @@ class BrailleChars_(SubPixels):
     del codepoint, char
 
     @classmethod
-    def _op(cls, pos, data, operation):
-        number = cls.chars_to_order[data]
-        index = (2 ** (pos[1] + 3 * pos[0])) if pos[1] < 3 else (2 ** (6 + pos[0]))
-        return operation(number, index)
+    def bit_index(cls, pos):
+        return (2 ** (pos[1] + 3 * pos[0])) if pos[1] < 3 else (2 ** (6 + pos[0]))
 
 
 BrailleChars = BrailleChars_()
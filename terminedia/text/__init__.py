@@ -1,6 +1,7 @@
-from .fonts import list_fonts, render, load_font
+from .fonts import list_fonts, render, load_font, get_font, HexFont
 from .planes import TextPlane, plane_names
-from .style import MLTokenizer
+from .buffer import TextBuffer
+from .style import MLTokenizer, StyleTemplate
 
 escape = MLTokenizer.escape
 
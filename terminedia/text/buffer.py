@@ -0,0 +1,212 @@
+"""Editable text storage for documents larger than the area they are shown in.
+
+The text is kept as a flat list of chunks of a few KB each - a shallow rope.
+Two Fenwick trees index the chunks by character count and newline count, so
+both character offsets and line numbers are located in O(log n), and edits
+only rebuild the chunk they touch. Splitting or merging chunks rebuilds the
+trees from the per-chunk counts kept alongside them, in O(number of chunks),
+without reading the text of the other chunks.
+"""
+
+
+class _FenwickTree:
+    """Prefix sums over a list of non-negative integers, with O(log n) updates and searches"""
+
+    def __init__(self, values):
+        self.size = len(values)
+        tree = [0] + list(values)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def add(self, index, delta):
+        index += 1
+        tree = self.tree
+        while index <= self.size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index):
+        """Sum of the first "index" values"""
+        total = 0
+        tree = self.tree
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def find(self, target):
+        """Returns (index, rest): the first index for which prefix(index + 1) > target,
+        and "target" minus the sum of the values before it.
+
+        If target is not smaller than the total, index is the number of values.
+        """
+        tree = self.tree
+        index = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            next_index = index + step
+            if next_index <= self.size and tree[next_index] <= target:
+                index = next_index
+                target -= tree[next_index]
+            step >>= 1
+        return index, target
+
+
+class TextBuffer:
+    """Text storage with O(log n) line lookups, and edits touching only the chunks they change
+
+    Args:
+      - text (str): initial contents
+
+    Offsets used by all methods are character indexes into the whole text, and
+    lines are separated by "\\n". A buffer can also be read with
+    slices, as in ``buffer[start:stop]``, and ``str(buffer)`` returns all the text.
+    """
+
+    #: Chunks are split once they get twice this size
+    chunk_size = 4096
+
+    def __init__(self, text=""):
+        self.chunks = [text[i: i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+        self._chunk_lengths = [len(chunk) for chunk in self.chunks]
+        self._chunk_newlines = [chunk.count("\n") for chunk in self.chunks]
+        self.length = sum(self._chunk_lengths)
+        self.newlines = sum(self._chunk_newlines)
+        self._build_trees()
+
+    def _build_trees(self):
+        self._lengths = _FenwickTree(self._chunk_lengths)
+        self._newlines = _FenwickTree(self._chunk_newlines)
+
+    def _splice(self, start, stop, pieces):
+        # Replaces chunks[start:stop] with "pieces": only the new chunks are counted,
+        # and the trees are rebuilt from the per-chunk counts.
+        pieces = [piece for piece in pieces if piece]
+        if not pieces and stop - start == len(self.chunks):
+            pieces = [""]
+        lengths = [len(piece) for piece in pieces]
+        newlines = [piece.count("\n") for piece in pieces]
+        self.length += sum(lengths) - sum(self._chunk_lengths[start:stop])
+        self.newlines += sum(newlines) - sum(self._chunk_newlines[start:stop])
+        self.chunks[start:stop] = pieces
+        self._chunk_lengths[start:stop] = lengths
+        self._chunk_newlines[start:stop] = newlines
+        self._build_trees()
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def line_count(self):
+        return self.newlines + 1
+
+    def _locate(self, offset):
+        # returns chunk index and offset in that chunk. The end of the text is at the end of the last chunk.
+        if not 0 <= offset <= self.length:
+            raise IndexError(f"Offset {offset} out of text buffer range")
+        index, rest = self._lengths.find(offset)
+        if index == len(self.chunks):
+            index -= 1
+            rest = len(self.chunks[index])
+        return index, rest
+
+    def _replace_chunk(self, index, new_chunk):
+        if not new_chunk or len(new_chunk) > 2 * self.chunk_size:
+            pieces = [new_chunk[i: i + self.chunk_size] for i in range(0, len(new_chunk), self.chunk_size)]
+            self._splice(index, index + 1, pieces)
+            return
+        self.chunks[index] = new_chunk
+        newline_count = new_chunk.count("\n")
+        delta = len(new_chunk) - self._chunk_lengths[index]
+        newline_delta = newline_count - self._chunk_newlines[index]
+        self._chunk_lengths[index] = len(new_chunk)
+        self._chunk_newlines[index] = newline_count
+        self._lengths.add(index, delta)
+        self._newlines.add(index, newline_delta)
+        self.length += delta
+        self.newlines += newline_delta
+
+    def insert(self, offset, text):
+        """Inserts "text" before the character at "offset" """
+        if not text:
+            return
+        index, rest = self._locate(offset)
+        chunk = self.chunks[index]
+        self._replace_chunk(index, chunk[:rest] + text + chunk[rest:])
+
+    def delete(self, start, stop):
+        """Removes the text in the [start, stop) range"""
+        stop = min(stop, self.length)
+        if start >= stop:
+            return
+        first, first_rest = self._locate(start)
+        last, last_rest = self._locate(stop)
+        if first == last:
+            chunk = self.chunks[first]
+            self._replace_chunk(first, chunk[:first_rest] + chunk[last_rest:])
+            return
+        merged = self.chunks[first][:first_rest] + self.chunks[last][last_rest:]
+        self._splice(first, last + 1, [merged])
+
+    def replace(self, start, stop, text):
+        self.delete(start, stop)
+        self.insert(start, text)
+
+    def line_start(self, line):
+        """Offset of the first character in "line" (lines are counted from 0)"""
+        if line <= 0:
+            return 0
+        if line > self.newlines:
+            raise IndexError(f"Line {line} out of text buffer range")
+        # chunk containing the newline that ends the previous line:
+        index, rest = self._newlines.find(line - 1)
+        chunk = self.chunks[index]
+        position = -1
+        for _ in range(rest + 1):
+            position = chunk.find("\n", position + 1)
+        return self._lengths.prefix(index) + position + 1
+
+    def line_span(self, line):
+        """Start and end offsets of "line", not including its line break"""
+        start = self.line_start(line)
+        end = self.line_start(line + 1) - 1 if line < self.newlines else self.length
+        return start, end
+
+    def line(self, line):
+        start, end = self.line_span(line)
+        return self[start:end]
+
+    def line_of(self, offset):
+        """Number of the line containing the character at "offset" """
+        index, rest = self._locate(offset)
+        return self._newlines.prefix(index) + self.chunks[index].count("\n", 0, rest)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            if index < 0:
+                index += self.length
+            index, rest = self._locate(index)
+            if rest >= len(self.chunks[index]):
+                raise IndexError("Text buffer index out of range")
+            return self.chunks[index][rest]
+        start, stop, step = index.indices(self.length)
+        if step != 1:
+            return str(self)[index]
+        if start >= stop:
+            return ""
+        first, first_rest = self._locate(start)
+        last, last_rest = self._locate(stop)
+        if first == last:
+            return self.chunks[first][first_rest:last_rest]
+        return "".join(
+            [self.chunks[first][first_rest:]] + self.chunks[first + 1: last] + [self.chunks[last][:last_rest]]
+        )
+
+    def __str__(self):
+        return "".join(self.chunks)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} with {self.length} characters in {self.line_count} lines>"
@@ -1,9 +1,15 @@
 import binascii
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left
+from collections import namedtuple, OrderedDict
 from copy import copy
 from pathlib import Path
 
 from terminedia.image import Shape, PalettedShape
-from terminedia.utils import contextkwords, V2, Rect
+from terminedia.utils import contextkwords, V2, Rect, CACHE_DIR
 from terminedia.values import Directions, EMPTY, TRANSPARENT
 
 try:
@@ -15,6 +21,14 @@ except ImportError:
 
 font_registry = {}
 
+#: Folder where codepoint indexes for font files are kept. Set to None
+#: to always rebuild the indexes in memory.
+index_cache_dir = CACHE_DIR
+
+_INDEX_VERSION = 1
+_INDEX_HEADER_SIZE = 5
+_glyph_line = re.compile(rb"^([0-9A-Fa-f]+):([0-9A-Fa-f]*)", re.MULTILINE)
+
 
 def _normalize_font_path(font_path):
     font_is_resource = font_path == "" or not Path(font_path).exists()
@@ -48,63 +62,293 @@ def list_fonts():
     return [f for f in files if f.endswith(".hex")]
 
 
-def load_font(font_path, font_is_resource, page=0, ch1=EMPTY, ch2="#"):
+class GlyphBitmap(namedtuple("GlyphBitmap", "width height data")):
+    """A decoded glyph: one bit per pixel, rows packed most significant bit first
 
-    initial = page << 8
-    last = initial + 0x100
+    Each row takes a whole number of bytes in "data" - so 8 pixels
+    wide glyphs use one byte per row, 16 pixels wide glyphs two bytes.
+    """
 
-    if font_is_resource and resources:
-        data = list(resources.open_text("terminedia.data", font_path))
+    __slots__ = ()
 
-    elif font_is_resource and not resources:
-        path = Path(__file__).parent / "data" / font_path
-        data = list(open(path).readlines())
-    else:
-        # TODO: enable more font types, and
-        # TODO: enable fallback to other fonts if glyphs not present in the requested one
-        data = list(open(font_path).readlines())
+    @property
+    def row_bytes(self):
+        return (self.width + 7) // 8
 
-    font = {}
+    def get(self, pos):
+        x, y = pos
+        return bool(self.data[y * self.row_bytes + (x >> 3)] & (0x80 >> (x & 7)))
 
-    for i, line in enumerate(data[initial:last], initial):
-        line = line.split(":")[1].strip()
-        line = binascii.unhexlify(line)
-        char = "\n".join(f"{bin(v).split('b')[1]}".zfill(8) for v in line)
-        char = char.replace("0", ch1).replace("1", ch2)
-        font[chr(i)] = char
+    def to_text(self, ch1=EMPTY, ch2="#"):
+        """Glyph as a multiline string, using "ch1" for unset pixels and "ch2" for set ones"""
+        row_bytes = self.row_bytes
+        rows = (
+            bin(int.from_bytes(self.data[i: i + row_bytes], "big"))[2:].zfill(row_bytes * 8)[:self.width]
+            for i in range(0, len(self.data), row_bytes)
+        )
+        return "\n".join(rows).replace("0", ch1).replace("1", ch2)
 
-    return font
 
+def _font_file(font_path, font_is_resource):
+    if not font_is_resource:
+        return Path(font_path)
+    if resources and hasattr(resources, "files"):
+        return resources.files("terminedia.data").joinpath(font_path)
+    return Path(__file__).parent.parent / "data" / font_path
 
-GLYPH_CACHE = {}
 
+def _map_font_file(file_path):
+    """Returns font data as a read-only memory map, with file size and modification time
 
-def render(text, font=None, shape_cls=PalettedShape, direction=Directions.RIGHT):
+    Font files that do not live in the filesystem (ex. in a zipped package) are read in full.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        return data, stat.st_size, int(stat.st_mtime)
+    except (TypeError, OSError):
+        data = file_path.read_bytes()
+        return data, len(data), 0
+
+
+class HexFont:
+    """Glyphs from a ".hex" font file (one "CODEPOINT:HEXDATA" glyph per line), decoded on demand
+
+    Only an index from codepoint to data offset is built when the font
+    is opened, and it is stored under :any:`index_cache_dir`, so that
+    the next time the font is used the file contents need not be scanned.
+    The file itself is memory-mapped, and each glyph
+    is decoded to a :any:`GlyphBitmap` the first time it is requested.
+
+    As in the GNU Unifont format, all glyphs in a file have the same height,
+    and wider glyphs use twice as many bytes.
+    """
+
+    def __init__(self, font_path, font_is_resource=False):
+        self.name = font_path
+        file_path = _font_file(font_path, font_is_resource)
+        self._data, size, mtime = _map_font_file(file_path)
+        self._bitmaps = {}
+        cache_path = (
+            index_cache_dir / f"{Path(font_path).name}-{size}-{mtime}.index"
+            if index_cache_dir else None
+        )
+        index = self._read_index(cache_path, size, mtime)
+        if index is None:
+            index = self._build_index(size, mtime)
+            self._write_index(cache_path, index)
+        self.height = index[3]
+        count = index[4]
+        self._codepoints = index[_INDEX_HEADER_SIZE: _INDEX_HEADER_SIZE + count]
+        self._offsets = index[_INDEX_HEADER_SIZE + count:]
+
+    def _build_index(self, size, mtime):
+        glyphs = sorted(
+            (int(match.group(1), 16), match.start(2), len(match.group(2)))
+            for match in _glyph_line.finditer(self._data)
+        )
+        # Narrow glyphs take one byte per row:
+        height = min((length // 2 for *_, length in glyphs if length), default=8)
+        index = array("I", (_INDEX_VERSION, size, mtime, height, len(glyphs)))
+        index.extend(codepoint for codepoint, *_ in glyphs)
+        index.extend(offset for _, offset, _ in glyphs)
+        return index
+
+    @staticmethod
+    def _read_index(cache_path, size, mtime):
+        if not cache_path:
+            return None
+        index = array("I")
+        try:
+            index.frombytes(cache_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if (
+            len(index) < _INDEX_HEADER_SIZE or
+            tuple(index[:3]) != (_INDEX_VERSION, size, mtime) or
+            len(index) != _INDEX_HEADER_SIZE + 2 * index[4]
+        ):
+            return None
+        return index
+
+    @staticmethod
+    def _write_index(cache_path, index):
+        if not cache_path:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(index.tobytes())
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Caching the index is an optimization only
+            pass
+
+    def __len__(self):
+        return len(self._codepoints)
+
+    def __contains__(self, char):
+        return self.bitmap(char) is not None
+
+    def codepoints(self, start=0, stop=0x110000):
+        """Yields the codepoints with glyphs in the font, in the range [start, stop)"""
+        codepoints = self._codepoints
+        for i in range(bisect_left(codepoints, start), bisect_left(codepoints, stop)):
+            yield codepoints[i]
+
+    def bitmap(self, char):
+        """Returns the GlyphBitmap for the given character, or None if it is not in the font"""
+        if len(char) != 1:
+            return None
+        code = ord(char)
+        try:
+            return self._bitmaps[code]
+        except KeyError:
+            pass
+        codepoints = self._codepoints
+        i = bisect_left(codepoints, code)
+        bitmap = None
+        if i < len(codepoints) and codepoints[i] == code:
+            offset = self._offsets[i]
+            end = self._data.find(b"\n", offset)
+            data = binascii.unhexlify(self._data[offset: end if end != -1 else len(self._data)].strip())
+            bitmap = GlyphBitmap(len(data) * 8 // self.height, self.height, data)
+        self._bitmaps[code] = bitmap
+        return bitmap
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name!r} with {len(self)} glyphs>"
+
+
+def get_font(font=None):
+    """Returns the HexFont for a font name or alias, as accepted in context.font
+
+    Fonts are opened once, and kept in "font_registry"
+    """
+    font_id, is_resource = _normalize_font_path(font or "")
+    font = font_registry.get(font_id)
     if font is None:
-        font = ""
-    font_id, is_resource = _normalize_font_path(font)
+        font = font_registry[font_id] = HexFont(font_id, is_resource)
+    return font
 
-    font = font_registry.get(font_id, None)
 
-    if not font:
-        # Always load page-0 (first 256 chars)
-        font_registry.setdefault(font_id, {}).update(load_font(font_id, is_resource))
-        font = font_registry[font_id]
+def glyph_bitmap(char, font=None):
+    """Returns the GlyphBitmap for "char" in the given font, or None if there is no such glyph"""
+    return get_font(font).bitmap(char)
 
-    cache_index = (font_id, shape_cls, text)
-    if len(text) == 1 and cache_index in GLYPH_CACHE:
-        return GLYPH_CACHE[cache_index]
 
-    phrase = []
-    for char in text:
-        if char not in font:
-            font.update(load_font(font_id, is_resource, page=ord(char)//0x100))
-        phrase.append(shape_cls(font.get(char, "?")))
+def load_font(font_path, font_is_resource, page=0, ch1=EMPTY, ch2="#"):
+    """Returns a dictionary with the glyphs in a 256 codepoint page of a font, as multiline strings"""
+    initial = page << 8
+    font = get_font(font_path) if font_is_resource else HexFont(font_path)
+
+    return {
+        chr(code): font.bitmap(chr(code)).to_text(ch1, ch2)
+        for code in font.codepoints(initial, initial + 0x100)
+    }
+
+
+render_cache_stats = namedtuple("render_cache_stats", "hits misses entries size max_size")
+
+
+class RenderCache:
+    """Least recently used cache for shapes created by :any:`render`, bounded by memory use
+
+    Both single glyphs and whole phrases are kept. The
+    size of each shape is estimated from its pixel count, and least
+    recently used entries are dropped once "max_size" bytes are exceeded.
+    """
+
+    #: Estimated bytes used by each pixel in a cached shape, and by each entry
+    pixel_cost = 8
+    entry_cost = 256
+
+    def __init__(self, max_size=2 * 1024 * 1024):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.size = 0
+        self.hits = self.misses = 0
+
+    def _cost(self, shape):
+        return self.entry_cost + self.pixel_cost * shape.width * shape.height
+
+    def get(self, key):
+        shape = self.data.get(key)
+        if shape is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.data.move_to_end(key)
+        return shape
+
+    def put(self, key, shape):
+        cost = self._cost(shape)
+        if cost > self.max_size:
+            return
+        if key in self.data:
+            self.size -= self._cost(self.data.pop(key))
+        self.data[key] = shape
+        self.size += cost
+        while self.size > self.max_size:
+            _, dropped = self.data.popitem(last=False)
+            self.size -= self._cost(dropped)
 
+    def clear(self):
+        self.data.clear()
+        self.size = 0
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    @property
+    def stats(self):
+        return render_cache_stats(self.hits, self.misses, len(self.data), self.size, self.max_size)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.stats}>"
+
+
+GLYPH_CACHE = RenderCache()
+
+
+def render(text, font=None, shape_cls=PalettedShape, direction=Directions.RIGHT):
+    """Renders text as a shape, using a bitmap font: each set pixel in a glyph is a pixel in the shape.
+
+    Args:
+      - text (str): Text to render
+      - font (str): Font name or alias as accepted by context.font. Default font is unscii-8.
+      - shape_cls (Shape subclass): Class of the resulting shape
+      - direction: Direction in which the glyphs are placed (see :any:`Shape.concat`)
+
+    Rendered glyphs and phrases are kept in "GLYPH_CACHE", and
+    the same shape is returned when the same text is rendered again:
+    copy it before changing its contents.
+    """
+    font = get_font(font)
     if len(text) == 0:
         return shape_cls.new((0, 0))
     elif len(text) == 1:
-        GLYPH_CACHE[cache_index] = phrase[0]
-        return phrase[0]
-    return phrase[0].concat(*phrase[1:], direction=direction)
+        return _render_glyph(font, shape_cls, text)
+
+    cache_index = (font.name, shape_cls, text, tuple(direction))
+    shape = GLYPH_CACHE.get(cache_index)
+    if shape is None:
+        phrase = [_render_glyph(font, shape_cls, char) for char in text]
+        shape = phrase[0].concat(*phrase[1:], direction=direction)
+        GLYPH_CACHE.put(cache_index, shape)
+    return shape
+
 
+def _render_glyph(font, shape_cls, char):
+    cache_index = (font.name, shape_cls, char, None)
+    shape = GLYPH_CACHE.get(cache_index)
+    if shape is None:
+        bitmap = font.bitmap(char)
+        shape = shape_cls(bitmap.to_text() if bitmap else "?")
+        GLYPH_CACHE.put(cache_index, shape)
+    return shape
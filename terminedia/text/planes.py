@@ -10,7 +10,7 @@ from terminedia.utils import contextkwords, V2, Rect, ObservableProperty, get_cu
 from terminedia.values import Directions, EMPTY, TRANSPARENT, RETAIN_POS
 from terminedia.values import WIDTH_INDEX, HEIGHT_INDEX
 
-from .fonts import render
+from .fonts import render, glyph_bitmap
 from ..text import style
 
 
@@ -160,6 +160,13 @@ class _RecordingControl:
 RenderData = namedtuple("RenderData", "char pos tick ctx")
 CtxData = namedtuple("CtxData", "foreground background effects")
 
+#: Kept as value for each StyledSequence in TextPlane.writtings:
+#:   - dynamic: whether the writting depends on tick (SpecialMarks or tick-using transformers)
+#:   - cells: text plane positions covered by the writting
+#:   - baked: sequence of RenderData able to restore the writting cells without
+#:        re-rendering it. None if the writting can't be baked (it uses transformers).
+WrittingRecord = namedtuple("WrittingRecord", "dynamic cells baked")
+
 class TextPlane:
     """Text handling API
 
@@ -194,6 +201,7 @@ class TextPlane:
         self.transformers_map = {}
         self.reset_padding()
         self.lock = threading.RLock()  # This is shared across all text-planes for the same owner
+        self._baking = None
 
     def reset_padding(self):
         self.padding = 0
@@ -434,8 +442,12 @@ class TextPlane:
         ctx = self.owner.context
         direction = ctx.direction
         self.blit(pos)
-        if self.recording:
-            self.recording.register(char, pos, get_current_tick(), CtxData(ctx.foreground, ctx.background, ctx.effects))
+        if self.recording or self._baking is not None:
+            ctx_data = CtxData(ctx.foreground, ctx.background, ctx.effects)
+            if self.recording:
+                self.recording.register(char, pos, get_current_tick(), ctx_data)
+            if self._baking is not None:
+                self._baking.append(RenderData(char, pos, self.ticks, ctx_data))
 
         pos += (int(getattr(ctx, "text_lastchar_was_double", 0)) * direction[0], 0)
         self.owner.context.last_pos = pos
@@ -485,10 +497,20 @@ class TextPlane:
         # FIXME: take in account double-width chars when rendering
         # big-text
         target.context.text_last_char_was_double = False
-        rendered_char = render(
-            self.plane[index], font=target.context.font or self.font
-        )
+        font = target.context.font or self.font
         index = (index * 8).as_int + index_offset
+        subpixel_target = (
+            target.braille if cur_plane == 2 else
+            target.sextant if cur_plane == 3 else
+            target.high if cur_plane == 4 else None
+        )
+        bitmap = glyph_bitmap(char, font) if subpixel_target else None
+        if bitmap:
+            # Sub-character resolutions compose each block character
+            # from the glyph bits at once, skipping the intermediate shape
+            subpixel_target.blit_bitmap(index, bitmap, erase=clear)
+            return
+        rendered_char = render(char, font=font)
         if self.current_plane == 2:
             target.braille.draw.blit(index, rendered_char, erase=clear)
         elif self.current_plane == 3:
@@ -533,14 +555,76 @@ class TextPlane:
             for pos in rect.iter_cells():
                 self.blit(pos, target=target, clear=clear)
 
-    def update(self):
-        """Re-render any writting on the plane that was done using SpecialMarks
+    def update(self, full=False):
+        """Re-render writtings on the plane that change over time
+
+        Args:
+          - full (bool): re-render all writtings from scratch. Needed
+                when the plane geometry (padding, size) changes.
+
+        Only writtings using SpecialMarks or tick-dependent transformers are
+        re-rendered (or all of them, if there are SpecialMarks set on the plane itself).
+        Static writtings made after those, and overlapping the re-rendered cells,
+        are restored from their baked cells, so that the stacking order of the text is preserved.
+        Cells a re-rendered writting no longer covers are cleared, and the
+        writtings made before it that overlap them are restored there.
         """
         self.ticks += 1
-        for writting in self.writtings:
-            # if not writting.mark_sequence.get("special") and not self.marks.special:
-            #    continue
-            self.render_styled_sequence(writting)
+        if full or self.marks.special:
+            for writting in list(self.writtings):
+                self.render_styled_sequence(writting)
+            return
+        touched = set()
+        vacated = set()
+        for writting, record in list(self.writtings.items()):
+            if record is None or record.dynamic:
+                self.render_styled_sequence(writting)
+                new_record = self.writtings[writting]
+                touched.update(new_record.cells)
+                if record:
+                    touched.update(record.cells)
+                    vacated.update(record.cells - new_record.cells)
+                vacated.difference_update(new_record.cells)
+                continue
+            overlap = touched.intersection(record.cells)
+            if not overlap:
+                continue
+            vacated.difference_update(overlap)
+            if record.baked is None:
+                self.render_styled_sequence(writting)
+                touched.update(self.writtings[writting].cells)
+            else:
+                self._render_baked(record.baked, overlap)
+        if vacated:
+            self._restore_vacated(vacated)
+
+    def _restore_vacated(self, cells):
+        # Cells left by re-rendered writtings, and not covered by later ones:
+        # cleared, and then restored from the writtings below, in order.
+        with self.owner.context:
+            for pos in cells:
+                self.plane[pos] = EMPTY
+                self.blit(pos)
+        for writting, record in list(self.writtings.items()):
+            overlap = cells.intersection(record.cells)
+            if not overlap:
+                continue
+            if record.baked is None:
+                self.render_styled_sequence(writting)
+                cells = cells | self.writtings[writting].cells
+            else:
+                self._render_baked(record.baked, overlap)
+
+    def _render_baked(self, baked, cells):
+        ctx = self.owner.context
+        with ctx:
+            ctx.text_rendering_styled = self.current_plane
+            for char, pos, tick, attrs in baked:
+                if pos not in cells:
+                    continue
+                ctx.foreground, ctx.background, ctx.effects = attrs
+                self.plane[pos] = char
+                self.blit(pos)
 
     def clear(self, layout=None):
         self.ticks = 0
@@ -562,16 +646,26 @@ class TextPlane:
         Also, called internally to update StyledSequences that contain animations.
         """
         if not styled in self.writtings:
-            # We need just the keys and the order
-            # (a dict gives this for free - otherwise we need a set + a sequence)
+            # A dict keeps the writtings order for free
+            # (otherwise we need a set + a sequence)
             self.writtings[styled] = None
+        baked = self._baking = []
         try:
             self.owner.context.text_rendering_styled = self.current_plane
             styled.render()
             self.last_rendered_writing = styled
         finally:
-
+            self._baking = None
             self.owner.context.text_rendering_styled = None
+        transformers = getattr(styled, "transformers_used", ())
+        dynamic = bool(
+            styled.mark_sequence.get("special")
+            or any(tr.capabilities.uses_tick for tr in transformers)
+            or self.owner.context.pretransformers.capabilities.uses_tick
+        )
+        self.writtings[styled] = WrittingRecord(
+            dynamic, frozenset(cell.pos for cell in baked), baked if not transformers else None
+        )
 
     def _clear_owner(self):
         # clear the inner contents of the owner when reflowing text, respecting padding
@@ -617,7 +711,7 @@ class TextPlane:
         for plane_name, concrete_plane in self.planes.items():
             if plane_name == "root":
                 continue
-            concrete_plane.update()
+            concrete_plane.update(full=True)
 
     def draw_border(self, transform=_bordersentinel, context=None, pad_level=1, roi=None):
         """Draws an existing border, without changing the shape pattern
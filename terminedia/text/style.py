@@ -63,11 +63,15 @@ Markup description:
 
 
 """
+from bisect import bisect_left
 from collections.abc import Sequence, MutableMapping
 from copy import copy
+from functools import lru_cache
+from itertools import chain, count
 import ast
 import enum
 import re
+import string
 import typing as T
 import threading
 
@@ -75,6 +79,7 @@ from terminedia.contexts import Context
 from terminedia.unicode import GraphemeIter
 from terminedia.utils import V2, Rect, get_current_tick, Color
 from terminedia.values import WIDTH_INDEX, HEIGHT_INDEX, RelativeMarkIndex, Directions, Effects, TRANSPARENT, RETAIN_POS
+from terminedia.values import DEFAULT_FG, DEFAULT_BG
 
 
 
@@ -212,6 +217,8 @@ class StyledSequence:
             self.context,
         )
         self._active_transformers = []
+        # All transformers made active by marks in this rendering:
+        self.transformers_used = []
 
 
     def _context_push(self, attributes, pop_attributes, mark_origin, index):
@@ -249,6 +256,7 @@ class StyledSequence:
                 value.sequence = self.text[index: index + spam]
                 value.sequence_absolute_start = index
                 self._active_transformers.append(value)
+                self.transformers_used.append(value)
                 new_value.append(value)
                 value = new_value
             stack = cm.setdefault(key, [])
@@ -779,6 +787,7 @@ class Tokenizer:
 
 class MLTokenizer(Tokenizer):
     _parser = re.compile(r"(?<!\[)\[[^\[].*?\]")
+    _brackets = re.compile(r"[\[\]]")
 
     def __init__(self, initial=""):
         """Parses a string with special Markup and prepare for rendering
@@ -831,60 +840,92 @@ class MLTokenizer(Tokenizer):
         Parses the raw_text in  the instance, and sets
         setting a stripped "parsed_text" attribute along a ".mark_sequence" attribute
         containing the described marks embedded in the text as Mark instances.
+
+        Results are cached by the raw text, so that re-parsing the same
+        markup (as when widgets re-render their contents) is cheap.
         """
         self.expand()
+        self.parsed_text, mark_items = _cached_parse(self.raw_text)
+        # the cached marks are shared: hand out a fresh mapping, with copies of the marks
+        self.mark_sequence = {
+            offset: ([_copy_mark(m) for m in mark] if isinstance(mark, tuple) else _copy_mark(mark))
+            for offset, mark in mark_items
+        }
+
+    def _parse(self):
+        self.expand()
+        self.parsed_text, raw_tokens = self._scan(self.raw_text)
+        self._tokens_to_marks(raw_tokens)
 
+    @classmethod
+    def _scan(cls, raw_text):
+        """Splits markup into the plain text to be rendered and a list of (offset, tag text) pairs"""
         raw_tokens = []
-        offset = 0
 
         last_token_start = None
         last_token_start_real = None
         last_escaped_token_start = None
         closing_escaped_token_counter = 0
-        parsed_text = token_text = ""
+        parsed_text = []
+        parsed_len = 0
+        token_text = []
         bracket_stack = []
-        for i, char in enumerate(self.raw_text):
+        position = 0
+        # Plain text runs between brackets are copied over in a single step:
+        # the state machine only runs on "[" and "]" characters.
+        for match in chain(cls._brackets.finditer(raw_text), (None,)):
+            i = match.start() if match else len(raw_text)
+            run = raw_text[position: i]
+            if run:
+                if last_token_start is not None:
+                    token_text.append(run)
+                elif last_escaped_token_start is not None and closing_escaped_token_counter != 0:
+                    raise ValueError(f"Spurious ']' inside escaped '[[ ]]' text in tagged string: {raw_text!r}")
+                else:
+                    parsed_text.append(run)
+                    parsed_len += len(run)
+            if match is None:
+                break
+            position = i + 1
+            char = match.group()
+
             if char == "]" and last_token_start is None and last_escaped_token_start is not None:
                 if closing_escaped_token_counter == 0:
                     closing_escaped_token_counter += 1
                 else:
-                    parsed_text += "]"
+                    parsed_text.append("]")
+                    parsed_len += 1
                     closing_escaped_token_counter = 0
                     last_escaped_token_start = bracket_stack.pop() if bracket_stack else None
-            elif char != "]" and last_token_start is None and last_escaped_token_start is not None and closing_escaped_token_counter != 0:
-                raise ValueError(f"Spurious ']' inside escaped '[[ ]]' text in tagged string: {self.raw_text!r}")
-
-            elif char != "[" and last_token_start is None:
-                parsed_text += char
+            elif char == "[" and last_token_start is None and last_escaped_token_start is not None and closing_escaped_token_counter != 0:
+                raise ValueError(f"Spurious ']' inside escaped '[[ ]]' text in tagged string: {raw_text!r}")
+            elif char == "]" and last_token_start is None:
+                parsed_text.append(char)
+                parsed_len += 1
             elif char == "[" and last_token_start is None:
                 last_token_start = i
-                last_token_start_real = len(parsed_text)
-                token_text = ""
-            elif char == "[" and last_token_start is not None and i == last_token_start + 1:
-                parsed_text += "["
+                last_token_start_real = parsed_len
+                token_text = []
+            elif char == "[" and i == last_token_start + 1:
+                parsed_text.append("[")
+                parsed_len += 1
                 last_escaped_token_start = last_token_start
                 bracket_stack.append(last_token_start_real)
                 last_token_start = None
-            elif char == "[" and last_token_start is not None and i > last_token_start + 1:
-                raise ValueError(f"Spurious '[' inside tag in tagged string: {self.raw_text!r}")
-            elif char != "]" and last_token_start is not None:
-                token_text += char
-            elif char == "]" and last_token_start is not None:
-                raw_tokens.append((last_token_start_real, token_text))
+            elif char == "[":
+                raise ValueError(f"Spurious '[' inside tag in tagged string: {raw_text!r}")
+            else:  # char == "]" closing a tag
+                raw_tokens.append((last_token_start_real, "".join(token_text)))
                 last_token_start = None
-                token_text = ""
-        if token_text or last_token_start is not None:
-            parsed_text += "[" + token_text
+                token_text = []
+        if last_token_start is not None:
+            parsed_text.append("[" + "".join(token_text))
         elif closing_escaped_token_counter:
-            parsed_text += "]"
-        self.parsed_text = parsed_text
-        self._tokens_to_marks(raw_tokens)
+            parsed_text.append("]")
+        return "".join(parsed_text), raw_tokens
 
 
     def _tokens_to_marks(self, raw_tokens):
-        from terminedia.transformers import library as transformers_library
-        from terminedia import Effects, Color, Directions, DEFAULT_BG, DEFAULT_FG, TRANSPARENT
-
         self.mark_sequence = {}
         # Separate stack to anottate the length of the affected string inside each Transformer
         transformer_stack = []
@@ -1002,6 +1043,185 @@ class MLTokenizer(Tokenizer):
         text = text.replace("[", "[[").replace("]", "]]")
         return text
 
+@lru_cache(maxsize=1024)
+def _cached_parse(raw_text):
+    """Parses markup into the text to be rendered and a tuple of (offset, Mark) pairs
+
+    The result is shared by all MLTokenizer instances parsing the same markup:
+    merged Marks at the same offset are kept as tuples, and the Marks themselves
+    must be copied with "_copy_mark" before being used in a StyledSequence.
+    """
+    tokenizer = MLTokenizer(raw_text)
+    tokenizer._parse()
+    return tokenizer.parsed_text, tuple(
+        (offset, tuple(mark) if isinstance(mark, list) else mark)
+        for offset, mark in tokenizer.mark_sequence.items()
+    )
+
+
+class StyleTemplate:
+    #: Characters standing for the replacement fields while the template is parsed.
+    #: (from a Unicode private use plane, unlikely to show up in actual text)
+    _placeholder_base = 0xF0000
+
+    def __init__(self, template):
+        """Markup text with replacement fields, parsed only once
+
+        Args:
+          - template (str): text with terminedia markup and str.format style replacement
+                fields, like "[color: {c}]{name}[/color] {value:>8}"
+
+        The markup is tokenized when the template is created: afterwards, each call to
+        ".format" or ".styled" only formats the fields and shifts the pre-built
+        Marks to their final offsets, skipping the markup parsing altogether.
+        This is meant for tables, logs and other texts re-printed with changing values on each frame.
+
+        Values for fields in the text are rendered as plain text (markup in them is not interpreted).
+        Fields inside a tag, as in "[color: {c}]", are formatted and parsed as part of the tag -
+        Marks for each distinct tag text are cached.
+
+        Usage:
+        ```
+        row = StyleTemplate("[color: {c}]{name}[/color] {value:>8}")
+        screen.text[1].render_styled_sequence(
+            row.styled(c="red", name="cpu", value=12, text_plane=screen.text[1], starting_point=(0, 3))
+        )
+        ```
+        """
+        self.template = template
+        self._formatter = string.Formatter()
+        self.fields = []
+        placeholder_text = []
+        for literal, field_name, format_spec, conversion in self._formatter.parse(template):
+            placeholder_text.append(literal.replace("\n", "[new_line]"))
+            if field_name is None:
+                continue
+            placeholder_text.append(chr(self._placeholder_base + len(self.fields)))
+            self.fields.append((field_name, format_spec, conversion))
+        parsed_text, raw_tokens = MLTokenizer._scan("".join(placeholder_text))
+
+        # Static text chunks, interleaved with the index of the field that goes after each one:
+        self._chunks = []
+        self._holes = []
+        last = 0
+        for offset, char in enumerate(parsed_text):
+            index = ord(char) - self._placeholder_base
+            if 0 <= index < len(self.fields):
+                self._chunks.append(parsed_text[last: offset])
+                self._holes.append((offset, index))
+                last = offset + 1
+        self._chunks.append(parsed_text[last:])
+        self._hole_offsets = [offset for offset, index in self._holes]
+
+        self._has_transformers = any("transformer" in token for offset, token in raw_tokens)
+        # each token is kept either as a ready Mark, or as a format string for tags with fields in them:
+        self._tokens = []
+        for offset, token in raw_tokens:
+            token_fields = [ord(char) - self._placeholder_base for char in token if self._is_placeholder(char)]
+            if token_fields:
+                token = "".join(
+                    "{}" if self._is_placeholder(char) else char.replace("{", "{{").replace("}", "}}")
+                    for char in token
+                )
+                self._tokens.append((offset, token, token_fields, None))
+            elif self._has_transformers:
+                self._tokens.append((offset, token, None, None))
+            else:
+                self._tokens.append((offset, token, None, _cached_tag_mark(token)))
+
+    def _is_placeholder(self, char):
+        return 0 <= ord(char) - self._placeholder_base < len(self.fields)
+
+    def _format_field(self, index, args, kwargs, auto_index):
+        field_name, format_spec, conversion = self.fields[index]
+        formatter = self._formatter
+        if field_name == "":
+            field_name = str(next(auto_index))
+        obj, _ = formatter.get_field(field_name, args, kwargs)
+        obj = formatter.convert_field(obj, conversion)
+        if format_spec and "{" in format_spec:
+            format_spec = formatter.vformat(format_spec, args, kwargs)
+        return formatter.format_field(obj, format_spec)
+
+    def format(self, *args, **kwargs):
+        """Fills in the template fields
+
+        Returns a (text, mark_sequence) pair, suitable to create a StyledSequence.
+        """
+        auto_index = count()
+        values = [self._format_field(i, args, kwargs, auto_index) for i in range(len(self.fields))]
+
+        text = []
+        # accumulated offset shift after each field:
+        shifts = []
+        shift = 0
+        for chunk, (offset, index) in zip(self._chunks, self._holes):
+            value = values[index]
+            text.append(chunk)
+            text.append(value)
+            shift += len(value) - 1
+            shifts.append(shift)
+        text.append(self._chunks[-1])
+
+        def final_offset(offset):
+            # Marks after a field are shifted by the length difference of the value and the 1-char placeholder
+            fields_before = bisect_left(self._hole_offsets, offset)
+            return offset + (shifts[fields_before - 1] if fields_before else 0)
+
+        mark_sequence = {}
+        raw_tokens = []
+        for offset, token, token_fields, mark in self._tokens:
+            offset = final_offset(offset)
+            if token_fields:
+                token = token.format(*(values[i] for i in token_fields))
+            if self._has_transformers:
+                raw_tokens.append((offset, token))
+                continue
+            mark = _copy_mark(mark if mark is not None else _cached_tag_mark(token))
+            if offset in mark_sequence:
+                existing = mark_sequence[offset]
+                mark = (existing if isinstance(existing, list) else [existing]) + [mark]
+            mark_sequence[offset] = mark
+
+        if self._has_transformers:
+            # Transformer spans depend on the final offsets: marks have to be rebuilt
+            tokenizer = MLTokenizer()
+            tokenizer._tokens_to_marks(raw_tokens)
+            mark_sequence = tokenizer.mark_sequence
+
+        return "".join(text), mark_sequence
+
+    def styled(self, *args, text_plane=None, context=None, starting_point=(0, 0), **kwargs):
+        """Fills in the template fields, and returns a StyledSequence ready to be rendered"""
+        text, mark_sequence = self.format(*args, **kwargs)
+        return StyledSequence(
+            text,
+            mark_sequence,
+            text_plane=text_plane,
+            context=context,
+            starting_point=starting_point,
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.template!r})"
+
+
+def _copy_mark(mark):
+    # Marks have "context" and "pos" set while their sequence is rendered,
+    # so each StyledSequence needs its own instances.
+    new_mark = copy(mark)
+    new_mark.attributes = dict(mark.attributes)
+    if mark.pop_attributes:
+        new_mark.pop_attributes = dict(mark.pop_attributes)
+    return new_mark
+
+
+def _cached_tag_mark(token):
+    # A single tag parses to a single Mark at offset 0:
+    parsed_text, mark_items = _cached_parse(f"[{token}]")
+    return mark_items[0][1]
+
+
 class ANSITokenizer(Tokenizer):
     # TODO....
     pass
@@ -0,0 +1,303 @@
+"""Sparse shapes, stored in chunks allocated on first write, and viewports over them"""
+
+import shelve
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import terminedia
+from terminedia.image import DIRTY_TILE_SIZE, FullShape
+from terminedia.utils import Rect, V2
+from terminedia.values import EMPTY, TRANSPARENT
+
+
+class ChunkStore:
+    """Pixel data of a TiledShape: maps positions to [char, foreground, background, effects] lists
+
+    Args:
+      - chunk_size (2-sequence): width and height of each chunk
+      - default (list): pixel value for cells in chunks that were never written
+      - spill (str, Path or bool): file path for a store where chunks are kept when
+            evicted from memory. If True, a temporary file is used. If not given,
+            all chunks are kept in memory.
+      - max_chunks (int): number of chunks kept in memory when "spill" is used.
+            The least recently used ones are evicted to the store.
+
+    Each chunk is a flat list of pixels, one row after the other. The number of
+    writes to each chunk is counted in "versions", so that views over the shape
+    can tell which chunks changed.
+    """
+
+    def __init__(self, chunk_size, default, spill=None, max_chunks=256):
+        self.chunk_size = V2(chunk_size)
+        if max_chunks < 2:
+            # a double width character may need two chunks at once
+            raise ValueError("max_chunks must be at least 2")
+        self.default = default
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()
+        self.versions = {}
+        #: Increased when all chunks are dropped
+        self.generation = 0
+        self._stored = {}
+        self.store = None
+        if spill:
+            if spill is True:
+                directory = tempfile.mkdtemp(prefix="terminedia_")
+                weakref.finalize(self, shutil.rmtree, directory, ignore_errors=True)
+                spill = Path(directory, "chunks")
+            self.store = shelve.open(str(spill), flag="n")
+            weakref.finalize(self, self.store.close)
+
+    def key(self, pos):
+        return (pos[0] // self.chunk_size[0], pos[1] // self.chunk_size[1])
+
+    def chunk(self, key, create=False):
+        """Pixels of a chunk, or None if it was never written and "create" is False"""
+        chunks = self.chunks
+        chunk = chunks.get(key)
+        if chunk is not None:
+            chunks.move_to_end(key)
+            return chunk
+        if key in self._stored:
+            chunk = self.store[_store_key(key)]
+        elif create:
+            chunk = [self.default[:] for _ in range(self.chunk_size[0] * self.chunk_size[1])]
+        else:
+            return None
+        chunks[key] = chunk
+        if self.store is not None and len(chunks) > self.max_chunks:
+            self._evict()
+        return chunk
+
+    def _evict(self):
+        key, chunk = self.chunks.popitem(last=False)
+        version = self.versions.get(key, 0)
+        if version and self._stored.get(key) != version:
+            self.store[_store_key(key)] = chunk
+            self._stored[key] = version
+
+    def touch(self, key):
+        """Registers that a chunk was changed"""
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get(self, pos, default=None):
+        chunk = self.chunk(self.key(pos))
+        if chunk is None:
+            return default
+        width, height = self.chunk_size
+        return chunk[pos[1] % height * width + pos[0] % width]
+
+    def __getitem__(self, pos):
+        value = self.get(pos)
+        if value is None:
+            raise KeyError(pos)
+        return value
+
+    def __setitem__(self, pos, value):
+        key = self.key(pos)
+        width, height = self.chunk_size
+        self.chunk(key, create=True)[pos[1] % height * width + pos[0] % width] = value
+        self.touch(key)
+
+    def reset(self, default):
+        """Drops all chunks, with "default" as the value for all cells"""
+        self.default = default
+        self.chunks.clear()
+        self.versions.clear()
+        self._stored.clear()
+        if self.store is not None:
+            self.store.clear()
+        self.generation += 1
+
+    def __len__(self):
+        """Number of chunks ever written"""
+        return len(self.chunks.keys() | self._stored.keys())
+
+
+def _store_key(key):
+    return f"{key[0]},{key[1]}"
+
+
+class TiledShape(FullShape):
+    """A FullShape for very large areas, where only the chunks that were written take memory
+
+    Args:
+      - size (2-sequence): width and height of the shape
+      - chunk_size (2-sequence): width and height of the chunks the data is stored in
+      - spill, max_chunks: optional on-disk store for chunks evicted from
+            memory (see :any:`ChunkStore`)
+
+    Reading a cell that was never written does not allocate anything, so
+    a canvas of millions of cells can be drawn on here and there - drawing, text,
+    sprites and dirty tracking work as in other shapes. Use a :any:`Viewport`
+    to show parts of it. Undo is not supported.
+    """
+
+    def __init__(self, size, chunk_size=(64, 32), *, spill=None, max_chunks=256, **kw):
+        size = V2(size).as_int
+        self.width, self.height = size
+        self.rect = Rect(size)
+        if kw.get("undo_active"):
+            raise ValueError("TiledShape does not support undo: undo_active must be False")
+        context = terminedia.context
+        default = [EMPTY, context.foreground, context.background, context.effects]
+        self.data = ChunkStore(chunk_size, default, spill=spill, max_chunks=max_chunks)
+        super(FullShape, self).__init__(**kw)
+
+    @classmethod
+    def new(cls, size, **kwargs):
+        return cls(size, **kwargs)
+
+    @property
+    def chunk_size(self):
+        return self.data.chunk_size
+
+    def get_raw(self, pos):
+        if 0 <= pos[0] < self.width and 0 <= pos[1] < self.height:
+            value = self.data.get(pos)
+            if value is not None:
+                return value
+        return self.data.default[:]
+
+    def _get_raw_for_write(self, pos):
+        store = self.data
+        key = store.key(pos)
+        width, height = store.chunk_size
+        store.touch(key)
+        return store.chunk(key, create=True)[pos[1] % height * width + pos[0] % width]
+
+    def put_run(self, pos, cells):
+        # Each pixel is fetched for writing, so that its chunk is marked as changed
+        # before anything else is loaded: it can be evicted while the run is written.
+        x0, y = pos
+        if not 0 <= y < self.height:
+            return
+        start, x1 = max(x0, 0), min(x0 + len(cells), self.width)
+        if start >= x1:
+            return
+        for x in range(start, x1):
+            pixel = self._get_raw_for_write((x, y))
+            for i, component in enumerate(cells[x - x0]):
+                if component is not TRANSPARENT:
+                    pixel[i] = component
+        tile_y = y // DIRTY_TILE_SIZE
+        for tile_x in range(start // DIRTY_TILE_SIZE, (x1 - 1) // DIRTY_TILE_SIZE + 1):
+            self.dirty_pixels.add(V2(tile_x, tile_y))
+
+    def clear(self, transparent=False):
+        """Clears the shape, dropping all its chunks
+
+        params:
+            transparent (bool): whether to use special transparency values
+        """
+        if transparent:
+            default = [TRANSPARENT] * 4
+        else:
+            default = [EMPTY, self.context.color, self.context.background, self.context.effects]
+        self.data.reset(default)
+        self.dirty_set()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {tuple(self.size)} with {len(self.data)} chunks>"
+
+
+def _put_cells(target, start, cells):
+    for i, cell in enumerate(cells):
+        target[start.x + i, start.y] = cell
+
+
+class Viewport:
+    """A window over a TiledShape that can be panned around
+
+    Args:
+      - shape (TiledShape): the shape shown
+      - size (2-sequence): size of the window
+      - offset (2-sequence): position in the shape shown at the window top-left corner
+
+    "blit" copies the visible part of the shape to a target, like the Screen.
+    After the first call, only the chunks changed since then are copied again,
+    unless the window was moved. Chunks that were never written are copied
+    as blank cells. Where the shape has sprites, their areas are always read
+    pixel by pixel, and so is everything if the shape context has transformers.
+    """
+
+    def __init__(self, shape, size, offset=(0, 0)):
+        self.shape = shape
+        self.size = V2(size)
+        self.offset = V2(offset)
+        self._drawn = {}
+        self._drawn_state = None
+        self._target = None
+        self._sprite_rects = []
+
+    @property
+    def rect(self):
+        """Area of the shape shown"""
+        return Rect(self.offset, width_height=self.size)
+
+    def pan(self, amount):
+        """Moves the window by "amount" cells"""
+        self.offset += V2(amount)
+
+    def invalidate(self):
+        """Forces everything visible to be copied on the next blit"""
+        self._drawn_state = None
+
+    def blit(self, target, pos=(0, 0)):
+        """Copies the visible part of the shape that changed to "target", a Shape or Screen, at "pos" """
+        if isinstance(target, terminedia.Screen):
+            target = target.shape
+        shape = self.shape
+        store = shape.data
+        pos = V2(pos)
+        state = (self.offset, pos, store.generation)
+        if state != self._drawn_state or target is not self._target:
+            self._drawn = {}
+            self._drawn_state, self._target = state, target
+        view = self.rect.intersection(shape.rect)
+        if not view or not view.area:
+            return
+        origin = pos - self.offset
+        put_run = getattr(target, "put_run", None) or (lambda start, cells: _put_cells(target, start, cells))
+        if shape.context.transformers:
+            self._blit_pixels(view, origin, put_run)
+            return
+
+        width, height = store.chunk_size
+        drawn = self._drawn
+        for chunk_y in range(view.top // height, (view.bottom - 1) // height + 1):
+            top, bottom = max(view.top, chunk_y * height), min(view.bottom, (chunk_y + 1) * height)
+            for chunk_x in range(view.left // width, (view.right - 1) // width + 1):
+                key = chunk_x, chunk_y
+                version = store.versions.get(key, 0)
+                if drawn.get(key) == version:
+                    continue
+                drawn[key] = version
+                left, right = max(view.left, chunk_x * width), min(view.right, (chunk_x + 1) * width)
+                chunk = store.chunk(key)
+                for y in range(top, bottom):
+                    if chunk is None:
+                        cells = [store.default] * (right - left)
+                    else:
+                        row = (y - chunk_y * height) * width - chunk_x * width
+                        cells = chunk[row + left: row + right]
+                    put_run(V2(left, y) + origin, cells)
+
+        if shape.has_sprites:
+            sprite_rects = [sprite.rect for sprite in shape.sprites if sprite.active]
+            for rect in self._sprite_rects + sprite_rects:
+                rect = rect.intersection(view)
+                if rect and rect.area:
+                    self._blit_pixels(rect, origin, put_run)
+            self._sprite_rects = sprite_rects
+
+    def _blit_pixels(self, rect, origin, put_run):
+        shape = self.shape
+        for y in range(rect.top, rect.bottom):
+            put_run(V2(rect.left, y) + origin, [tuple(shape[x, y]) for x in range(rect.left, rect.right)])
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {tuple(self.size)} at {tuple(self.offset)} over {self.shape!r}>"
@@ -1,9 +1,21 @@
+from collections import namedtuple
 from inspect import signature
+from weakref import ref
 
-from terminedia.utils import V2, HookList, get_current_tick
+from terminedia.utils import V2, Rect, HookList, get_current_tick
 from terminedia.values import EMPTY, FULL_BLOCK, TRANSPARENT, Directions, Color
 from terminedia.utils import combine_signatures, Gradient, ColorGradient
 
+
+transformer_capabilities = namedtuple(
+    "transformer_capabilities", "uses_tick uses_pos uses_source pixel_only static"
+)
+
+#: Parameters which, when used by a channel callable, make its output
+#: depend only on the input pixel
+_PIXEL_PARAMETERS = frozenset(("self", "value", "pixel", "char", "foreground", "background", "effects"))
+
+
 class Transformer:
 
     channels = "pixel char foreground background effects".split()
@@ -12,6 +24,14 @@ class Transformer:
         locals().__setitem__(channel, None)
     del channel
 
+    #: Area (a Rect in the transformed shape coordinates) that a tick-dependent
+    #: transformer may change from one frame to the next. "None" means
+    #: the whole shape. Subclasses may override this with a property.
+    dirty_region = None
+
+    # Replaced by an instance attribute as soon as the first channel signature is built:
+    capabilities = transformer_capabilities(False, False, False, True, True)
+
     def __init__(self, pixel=None, char=None, foreground=None, background=None, effects=None):
         """
         Class implementing a generic filter to be applied on a shape's pixels when their value is read.
@@ -52,6 +72,10 @@ class Transformer:
 
         It should return the value to be used downstream of the named channel.
 
+        Transformers using "tick" will cause the whole shape they are applied to
+        to be redrawn on every frame, unless "dirty_region" is set to the
+        area they actually change.
+
         """
         self.signatures = {}
         for slotname in self.channels:
@@ -65,12 +89,42 @@ class Transformer:
 
     def _build_signature(self, channel):
         self.signatures[channel] = frozenset(signature(getattr(self, channel)).parameters.keys()) if callable(getattr(self, channel)) else ()
+        self._build_capabilities()
+
+    def _build_capabilities(self):
+        parameters = set()
+        static = True
+        for channel in self.channels:
+            if callable(getattr(self, channel)):
+                static = False
+                parameters.update(self.signatures.get(channel, ()))
+        self.__dict__["capabilities"] = transformer_capabilities(
+            uses_tick="tick" in parameters,
+            uses_pos="pos" in parameters,
+            uses_source="source" in parameters,
+            pixel_only=parameters <= _PIXEL_PARAMETERS,
+            static=static,
+        )
+        for container_ref in self.__dict__.get("_containers", ()):
+            container = container_ref()
+            if container is not None:
+                container._update_capabilities()
 
     def __setattr__(self, attr, value):
         super().__setattr__(attr, value)
         if attr in self.__class__.channels:
             self._build_signature(attr)
 
+    def _register_container(self, container):
+        self._unregister_container(container)
+        self.__dict__["_containers"].append(ref(container))
+
+    def _unregister_container(self, container):
+        # The list is rebuilt rather than changed in place, as shallow copies
+        # of a transformer (made when rendering rich text) would share it.
+        containers = self.__dict__.get("_containers", ())
+        self.__dict__["_containers"] = [c for c in containers if c() is not None and c() is not container]
+
     def __repr__(self):
         channel_list = []
         for channel_name in self.channels:
@@ -243,7 +297,17 @@ class GradientTransformer(Transformer):
 
 
 class TransformersContainer(HookList):
+    """Ordered stack of Transformers applied to a shape, sprite or context
+
+    Besides the transformers themselves, it keeps an aggregate of their
+    capabilities in the ".capabilities" attribute, updated whenever a transformer is added,
+    removed or has one of its channels changed, so that rendering code can
+    check things like "is any transformer here tick dependent?" with an attribute read.
+    """
     def __init__(self, *args):
+        self._previous_regions = self._current_regions = frozenset()
+        self._regions_tick = None
+        self._update_capabilities(())
         super().__init__(*args)
 
     stack = property(lambda s: s.data)
@@ -253,12 +317,78 @@ class TransformersContainer(HookList):
         if not isinstance(item, Transformer):
             raise TypeError("Only Transformer instances can be added to a TransformersContainer")
         item.container = self
+        item._register_container(self)
         return item
 
-    def process(self, source, pos, pixel):
+    def __setitem__(self, index, item):
+        for old in (self.data[index] if isinstance(index, slice) else [self.data[index]]):
+            old._unregister_container(self)
+        super().__setitem__(index, item)
+        self._update_capabilities()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._update_capabilities()
+
+    def __delitem__(self, index):
+        for old in (self.data[index] if isinstance(index, slice) else [self.data[index]]):
+            old._unregister_container(self)
+        super().__delitem__(index)
+        self._update_capabilities()
+
+    def __copy__(self):
+        new = super().__copy__()
+        new._previous_regions, new._current_regions = self._previous_regions, self._current_regions
+        new._regions_tick = self._regions_tick
+        for transformer in new.data:
+            transformer._register_container(new)
+        new._update_capabilities()
+        return new
+
+    def _update_capabilities(self, transformers=None):
+        all_caps = [tr.capabilities for tr in (self.data if transformers is None else transformers)]
+        self.capabilities = transformer_capabilities(
+            uses_tick=any(cap.uses_tick for cap in all_caps),
+            uses_pos=any(cap.uses_pos for cap in all_caps),
+            uses_source=any(cap.uses_source for cap in all_caps),
+            pixel_only=all(cap.pixel_only for cap in all_caps),
+            static=all(cap.static for cap in all_caps),
+        )
+
+    def tick_dirty_rects(self, size):
+        """Areas which may change from one frame to the next due to tick-dependent transformers
+
+        Args:
+          - size: size of the shape the transformers are applied to.
+
+        Returns a set of rect tuples (the same format used by the shape "dirty_rects" attribute).
+        It is empty if no transformer uses "tick", and the whole shape area if any
+        of those does not declare a "dirty_region". Otherwise, both the current regions
+        and the ones from the previous frame are returned, so that areas
+        that were just left behind (e.g. by a moving cursor) are also redrawn.
+        """
+        if not self.capabilities.uses_tick:
+            return set()
+        regions = set()
+        for transformer in self.data:
+            if not transformer.capabilities.uses_tick:
+                continue
+            region = transformer.dirty_region
+            if region is None:
+                return {Rect((0, 0), size).as_tuple}
+            regions.add(Rect(region).as_tuple)
+        tick = get_current_tick()
+        if tick != self._regions_tick:
+            self._previous_regions = self._current_regions
+            self._regions_tick = tick
+        self._current_regions = frozenset(regions)
+        return regions | self._previous_regions
+
+    def process(self, source, pos, pixel, tick=None):
         """Called automatically by FullShape.__getitem__
 
         Only implemented for pixels with all attributes (used by fullshape)
+        If "tick" is given, it is used instead of the current tick.
         """
         pcls = type(pixel)
         values = list(pixel)
@@ -280,7 +410,7 @@ class TransformersContainer(HookList):
                 elif parameter == "source":
                     args["source"] = source
                 elif parameter == "tick":
-                    args["tick"] = get_current_tick()
+                    args["tick"] = get_current_tick() if tick is None else tick
                 elif parameter == "context":
                     args["context"] = source.context
                 elif hasattr(transformer, parameter):
@@ -312,7 +442,7 @@ class TransformersContainer(HookList):
         pixel = pcls(*values)
         return pixel
 
-    def bake(self, shape, target=None, offset=(0, 0)):
+    def bake(self, shape, target=None, offset=(0, 0), tick=None):
         """Apply the transformation stack for each pixel in the given shape
 
         Args:
@@ -321,6 +451,7 @@ class TransformersContainer(HookList):
                 If target is not given, 'shape' is modified inplace. Defaults to None.
           - offset: pixel-offset to blit the data to. Most useful with the target
           option.
+          - tick: value passed to transformers using "tick". Defaults to the current tick.
 
         Returns:
           the affected Shape object
@@ -338,10 +469,12 @@ class TransformersContainer(HookList):
 
         offset = V2(offset)
         for pos, pixel in source:
-            target[pos + offset] = self.process(source, pos, pixel)
+            target[pos + offset] = self.process(source, pos, pixel, tick)
         return target
 
     def remove(self, tr):
         # override default remove for a safe "pass if not exist" (and faster)
         if tr in self.data:
             self.data.remove(tr)
+            tr._unregister_container(self)
+            self._update_capabilities()
@@ -1,14 +1,24 @@
 """Tools to explore/fetch Unicode characters in a user friendly way
 """
 
+import os
 import re
 import unicodedata
+from array import array
+from bisect import bisect_right
 from collections import namedtuple
-from copy import copy
-from functools import lru_cache
 
+from terminedia.utils import CACHE_DIR
 
-CHAR_BASE = None
+
+#: Folder where the character name index is kept. Set to None to always build it in memory.
+index_cache_dir = CACHE_DIR
+
+# Named characters are only assigned up to plane 3, and in plane 14
+_NAME_SCAN_RANGES = ((0, 0x40000), (0xE0000, 0xE1000))
+
+_name_index = None
+_plain_name = re.compile(r"[A-Za-z0-9 \-]+")
 
 
 class Character(str):
@@ -17,54 +27,190 @@ class Character(str):
     def __new__(cls, value, code, name, category, width):
         self = super().__new__(cls, value)
         self.code = code
+        self.char = value
         self.name = name
         self.category = category
         self.width = width
 
         return self
 
+    @classmethod
+    def from_code(cls, code, name=None):
+        char = chr(code)
+        return cls(
+            char, code, name or unicodedata.name(char, "undefined"),
+            unicodedata.category(char), unicodedata.east_asian_width(char)
+        )
+
     def __repr__(self):
             return f"Character(code=0x{self.code:04X}, value='{self}', name='{self.name}', category='{self.category}', width='{self.width}')"
 
 
-def _init_chars():
-    global CHAR_BASE
-    if CHAR_BASE:
-        return
-    CHAR_BASE = {}
-    for code in range(0, 0x10ffff):
-        char = chr(code)
-        values = {}
-        attrs = "name category east_asian_width".split()
-        for attr in attrs:
-            try:
-                values[attr] = getattr(unicodedata, attr)(char)
-            except ValueError:
-                values[attr] = "undefined"
-        CHAR_BASE[code] = Character(char, code, values["name"], values["category"], values["east_asian_width"])
+class NameIndex:
+    """Names of all named unicode characters, kept in a single string, one name per line
+
+    Searches run a single regular expression over the whole text, and
+    line numbers are mapped back to codepoints - no per-character objects
+    are created. The index is stored under :any:`index_cache_dir`, keyed by
+    the unicode database version, so it is only built once.
+    """
+
+    def __init__(self):
+        cache_path = (
+            index_cache_dir / f"unicode-names-{unicodedata.unidata_version}.index"
+            if index_cache_dir else None
+        )
+        if not self._read(cache_path):
+            self._build()
+            self._write(cache_path)
+
+    def _build(self):
+        name = unicodedata.name
+        codes = array("I")
+        names = []
+        for start, stop in _NAME_SCAN_RANGES:
+            for code in range(start, stop):
+                char_name = name(chr(code), None)
+                if char_name:
+                    codes.append(code)
+                    names.append(char_name)
+        self.codes = codes
+        self.line_starts = array("I")
+        offset = 0
+        for char_name in names:
+            self.line_starts.append(offset)
+            offset += len(char_name) + 1
+        self.names = "\n".join(names)
+
+    def _read(self, cache_path):
+        if not cache_path:
+            return False
+        try:
+            data = cache_path.read_bytes()
+            count = int.from_bytes(data[:4], "little")
+            codes, line_starts = array("I"), array("I")
+            codes.frombytes(data[4: 4 + 4 * count])
+            line_starts.frombytes(data[4 + 4 * count: 4 + 8 * count])
+            names = data[4 + 8 * count:].decode("ascii")
+        except (OSError, ValueError):
+            return False
+        if len(line_starts) != count or count and line_starts[-1] >= len(names):
+            return False
+        self.codes, self.line_starts, self.names = codes, line_starts, names
+        return True
+
+    def _write(self, cache_path):
+        if not cache_path:
+            return
+        data = len(self.codes).to_bytes(4, "little") + self.codes.tobytes() + self.line_starts.tobytes() + self.names.encode("ascii")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    def search(self, name_part):
+        """Yields (code, name) for each character with a name matching the regular expression "name_part" """
+        if _plain_name.fullmatch(name_part):
+            # Names are all uppercase: avoid the slower case insensitive matching
+            pattern = re.compile(re.escape(name_part.upper()))
+        else:
+            pattern = re.compile(name_part, re.IGNORECASE | re.MULTILINE)
+        names, line_starts, codes = self.names, self.line_starts, self.codes
+        pos = 0
+        while True:
+            match = pattern.search(names, pos)
+            if not match:
+                return
+            line = bisect_right(line_starts, match.start()) - 1
+            line_end = names.find("\n", match.start())
+            line_end = line_end if line_end != -1 else len(names)
+            name = names[line_starts[line]: line_end]
+            # Patterns able to match line breaks could match accross names:
+            if "\n" not in match.group() or pattern.search(name):
+                yield codes[line], name
+            pos = line_end + 1
+            if pos >= len(names):
+                return
 
 
 def lookup(name_part, chars_only=False):
-    _init_chars()
-    results = [char for char in CHAR_BASE.values() if re.search(name_part, char.name, re.IGNORECASE)]
-    if not chars_only:
-        return results
-    return [char.char for char in results]
+    """Returns the characters whose unicode names match "name_part" (a case insensitive regular expression)
+
+    Args:
+      - name_part (str): regular expression to search in the names
+      - chars_only (bool): if True, a list of plain strings is returned, instead of :any:`Character` instances.
+    """
+    global _name_index
+    if _name_index is None:
+        _name_index = NameIndex()
+    if chars_only:
+        return [chr(code) for code, _ in _name_index.search(name_part)]
+    return [Character.from_code(code, name) for code, name in _name_index.search(name_part)]
 
 
 CGJ = "\u034f" # character used to _separate_ graphemes that would otherwise be joined - combining grapheme joiner (CGJ) U+034F
 
 
-_sentinel = object()
+# Combining marks are only assigned in the BMP, in plane 1 and in plane 14 (variation selectors)
+_MARK_SCAN_RANGES = ((0, 0x20000), (0xE0000, 0xE1000))
+_combining_marks = None
+
+
+def _combining_marks_re():
+    """Regular expression matching runs of combining characters (Unicode category "M"), built on first use"""
+    global _combining_marks
+    if _combining_marks is None:
+        category = unicodedata.category
+        ranges = []
+        for start, stop in _MARK_SCAN_RANGES:
+            for code in range(start, stop):
+                if category(chr(code))[0] != "M":
+                    continue
+                if ranges and ranges[-1][1] == code - 1:
+                    ranges[-1][1] = code
+                else:
+                    ranges.append([code, code])
+        char_class = "".join(
+            f"\\U{first:08x}" + (f"-\\U{last:08x}" if last != first else "") for first, last in ranges
+        )
+        _combining_marks = re.compile(f"[{char_class}]+")
+    return _combining_marks
+
+
+def _grapheme_starts(text):
+    """Offsets in text where each grapheme starts"""
+    # No combining characters before U+0300:
+    if text.isascii() or max(text, default="") < "\u0300":
+        return range(len(text))
+    starts = array("I")
+    position = 0
+    for match in _combining_marks_re().finditer(text):
+        mark_start = match.start()
+        starts.extend(range(position, mark_start))
+        if mark_start == 0:
+            # marks at the very start make up a grapheme with no base character
+            starts.append(0)
+        position = match.end()
+    if position == 0:
+        return range(len(text))
+    starts.extend(range(position, len(text)))
+    return starts
 
 
 class GraphemeIter:
     """Separates a string in a list of strings, each containing a single grapheme:
     the contiguous set of a character and combining characters to be applied to it.
+
+    The grapheme boundaries are found once, on first use, so that
+    the length and the mapping of text indexes to grapheme indexes are plain lookups.
     """
 
     def __init__(self, text):
         self.text = text
+        self._starts = None
 
     def text_setter(self, value):
         if "text" in self.__dict__:
@@ -74,84 +220,119 @@ class GraphemeIter:
     text = property(lambda s: s.__dict__["text"], text_setter)
     del text_setter
 
-    @lru_cache()
+    @property
+    def starts(self):
+        if self._starts is None:
+            self._starts = _grapheme_starts(self.text)
+        return self._starts
+
     def __len__(self):
-        return sum(1 for _ in self)
+        return len(self.starts)
 
     def __iter__(self):
-        category = unicodedata.category
-
-        last_char = ""
-        self._current_grapheme = -1
-
-        for i, char in enumerate(self.text):
-            self._current_char = i
-            if not category(char)[0] == 'M' and last_char:
-                self._current_grapheme += 1
-                yield last_char
-                last_char = ""
-            last_char += char
-        if last_char:
-            self._current_grapheme += 1
-            yield last_char
+        text = self.text
+        starts = self.starts
+        if isinstance(starts, range):
+            yield from text
+            return
+        for start, end in zip(starts, starts[1:]):
+            yield text[start: end]
+        if starts:
+            yield text[starts[-1]:]
+
+    def cooked_index(self, index):
+        """Position of the grapheme containing the character at "index" in the underlying raw string"""
+        if isinstance(self.starts, range):
+            return index
+        return bisect_right(self.starts, index) - 1
 
     def iter_cooked_indexes(self, indexes):
         """Translate indexes on the underlying raw string to positions in the iterator
 
         passed indexes must be sorted in ascending order
         """
-        instance = copy(self)
-        instance._current_char = -1
-        x = iter(instance)
-        results = []
+        size = len(self.text)
         last_index = -1
-        v = None
         for index in indexes:
-            if index >= len(instance.text) or instance._current_char >= len(instance.text):
+            if index >= size:
                 return
             if index < last_index:
                 raise ValueError("This iterable must be called with indexes in ascending order")
-
-            if index < instance._current_char:
-                yield instance._current_grapheme
-                continue
-
-            while index >= instance._current_char and v is not _sentinel:
-                v = next(x, _sentinel)
-            if v is not _sentinel:
-                yield instance._current_grapheme
+            yield self.cooked_index(index)
             last_index = index
 
 
-
-split_graphemes = lambda text: list(GraphemeIter(text))
+def split_graphemes(text):
+    return list(GraphemeIter(text))
 
 
 def is_single_grapheme(text):
-    category = unicodedata.category
     if len(text) <= 1:
         return True
-    return all(category(char)[0] == "M" for char in text[1:])
+    return _combining_marks_re().fullmatch(text, 1) is not None
+
+
+# Width table values: 1 and 2 are the character widths, and _COMBINING_AMBIGUOUS marks
+# combining characters with ambiguous width, taken as double width when
+# standalone, but as single width when part of a grapheme.
+_COMBINING_AMBIGUOUS = 3
+_WIDTH_PAGE_BITS = 8
+
+_bmp_widths = None
+_astral_width_pages = {}
+
+
+def _char_width_value(char, overrides):
+    if char in overrides:
+        return 1
+    v = unicodedata.east_asian_width(char)
+    if v in ("N", "Na"):
+        return 1
+    if v == "A" and unicodedata.category(char)[0] == "M":
+        return _COMBINING_AMBIGUOUS
+    return 2
+
+
+def _width_overrides():
+    from terminedia.subpixels import BlockChars, SextantChars
+
+    return BlockChars.chars | SextantChars.chars
+
+
+def _build_width_table(start, stop):
+    overrides = _width_overrides()
+    return bytearray(_char_width_value(chr(code), overrides) for code in range(start, stop))
+
+
+def _width_value(code):
+    global _bmp_widths
+    if code < 0x10000:
+        if _bmp_widths is None:
+            _bmp_widths = _build_width_table(0, 0x10000)
+        return _bmp_widths[code]
+    # Characters above the BMP are rare: their widths are computed in pages, as they are used.
+    page_number = code >> _WIDTH_PAGE_BITS
+    page = _astral_width_pages.get(page_number)
+    if page is None:
+        page_start = page_number << _WIDTH_PAGE_BITS
+        page = _astral_width_pages[page_number] = _build_width_table(
+            page_start, page_start + (1 << _WIDTH_PAGE_BITS)
+        )
+    return page[code & ((1 << _WIDTH_PAGE_BITS) - 1)]
 
 
-@lru_cache()
 def char_width(char, grapheme=False):
     """Return a character width as being 1 or 2 -
     since terminedia is all about monospaced cells, other values
     are of no interest
-    """
-
 
-    #FIXME: findout a way to perform a lazy import only once -
-    # the import statements are expensive, and this function
-    # is called often
-    from terminedia.subpixels import BlockChars, SextantChars
-
-    if char in BlockChars.chars or char in SextantChars.chars:
-        return 1
+    Widths are looked up in a table built on first use, in which
+    block characters used as pixels are always single width.
+    """
     if len(char) > 1:
         return max(char_width(combining, grapheme=True) for combining in char)
-    v = unicodedata.east_asian_width(char)
-    if grapheme and v == "A" and unicodedata.category(char)[0] == "M":
-        return 1
-    return 1 if v in ("N", "Na") else 2  # (?) include "A" as single width?
+    code = ord(char)
+    value = _bmp_widths[code] if code < 0x10000 and _bmp_widths else _width_value(code)
+    if value == _COMBINING_AMBIGUOUS:
+        return 1 if grapheme else 2
+    return value
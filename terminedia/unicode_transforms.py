@@ -2,7 +2,7 @@
 transformations. Those effects depends on the fonts available in the system"""
 import re
 import unicodedata
-from functools import lru_cache
+from functools import lru_cache, wraps
 
 from terminedia.values import Effects
 from terminedia.utils import FrozenDict as FD, mirror_dict
@@ -28,11 +28,26 @@ _template = """
     for the translation.
     """
 
-# The higher level classes of terminedia always call these on a char-by-char
-# basis - but one could use these directly to convert text blocks of arbitrary
-# content - the cap on the LRU cache is to prevent deterioration with this use.
+#: Functions doing the actual, character by character, translation for each effect.
+#: They are used only to build the translation tables, and to translate
+#: non-ASCII characters when unicode-normalization (the "convert" parameter) is on.
+_raw_translations = {}
+
+
+def _table_translated(effect):
+    """Registers the decorated function as the raw translation for "effect", and
+    replaces it by one using the precomputed translation tables
+    """
+    def decorator(func):
+        _raw_translations[effect] = func
+
+        @wraps(func)
+        def wrapper(text, convert=True):
+            return translate_chars(text, (effect,), convert)
+        return wrapper
+    return decorator
+
 
-# @lru_cache(1024)
 def _name_based_translation(
     text,
     convert,
@@ -71,43 +86,48 @@ def _name_based_translation(
     return result
 
 
-@lru_cache(1024)
 def _dict_based_translation(text, mapping, convert=True):
     if convert:
         text = unicodedata.normalize("NFKD", text)
     return "".join(mapping.get(char, char) for char in text)
 
 
+@_table_translated(Effects.encircled)
 def text_to_circled(text, convert=True):
     return _name_based_translation(
         text, convert, "CIRCLED", r"[A-Za-z0-9]", convert_lower=False
     )
 
 
+@_table_translated(Effects.negative_circled)
 def text_to_negative_circled(text, convert=True):
     return _name_based_translation(
         text, convert, "NEGATIVE CIRCLED", r"[A-Za-z0]", convert_lower=True
     )
 
 
+@_table_translated(Effects.squared)
 def text_to_squared(text, convert=True):
     return _name_based_translation(
         text, convert, "SQUARED", r"[A-Za-z0]", convert_lower=True
     )
 
 
+@_table_translated(Effects.negative_squared)
 def text_to_negative_squared(text, convert=True):
     return _name_based_translation(
         text, convert, "NEGATIVE SQUARED", r"[A-Za-z0]", convert_lower=True
     )
 
 
+@_table_translated(Effects.parenthesized)
 def text_to_parenthesized(text, convert=True):
     return _name_based_translation(
         text, convert, "PARENTHESIZED", r"[A-Za-z0-9]", convert_lower=False
     )
 
 
+@_table_translated(Effects.fullwidth)
 def text_to_fullwidth(text, convert=True):
     return _name_based_translation(
         text,
@@ -118,6 +138,7 @@ def text_to_fullwidth(text, convert=True):
     )
 
 
+@_table_translated(Effects.math_bold)
 def text_to_san_serif_bold(text, convert=True):
     # example name: ('MATHEMATICAL SANS-SERIF BOLD CAPITAL A',)
     return _name_based_translation(
@@ -129,6 +150,7 @@ def text_to_san_serif_bold(text, convert=True):
     )
 
 
+@_table_translated(Effects.math_bold_italic)
 def text_to_san_serif_bold_italic(text, convert=True):
     # example name: ('MATHEMATICAL SANS-SERIF BOLD ITALIC CAPITAL A',)
     return _name_based_translation(
@@ -140,6 +162,7 @@ def text_to_san_serif_bold_italic(text, convert=True):
     )
 
 
+@_table_translated(Effects.regional_indicator)
 def text_to_regional_indicator_symbol(text, convert=True):
     # REGIONAL INDICATOR SYMBOL LETTER A',
     return _name_based_translation(
@@ -151,6 +174,7 @@ def text_to_regional_indicator_symbol(text, convert=True):
     )
 
 
+@_table_translated(Effects.super_script)
 def text_to_modifier_letter(text, convert=True):
     # MODIFIER LETTER SMALL A
     # TODO: More than half capital letters and a lot of symbols
@@ -166,6 +190,7 @@ def text_to_modifier_letter(text, convert=True):
     )
 
 
+@_table_translated(Effects.double_struck)
 def text_to_double_struck(text, convert=True): # WIP
     return _name_based_translation(
         text, convert, r"MATHEMATICAL DOUBLE-STRUCK \g<case> \g<symbol>",
@@ -181,11 +206,44 @@ def text_to_double_struck(text, convert=True): # WIP
     )
 
 
+@_table_translated(Effects.upside_down)
 def text_to_upside_down(text, convert=True):
     """Use a table of custom characters to find aproximate upside-down glyphs"""
     return _dict_based_translation(text, UPSIDE_DOWN_MAPPING, convert)
 
-_nop_effect = lambda t, c: t
+def _translate(text, effects, convert):
+    for effect in effects:
+        raw_translation = _raw_translations.get(effect)
+        if raw_translation:
+            text = raw_translation(text, convert)
+    return text
+
+
+@lru_cache()
+def _translation_table(effects, convert):
+    """Builds the str.translate table applying all the given effects, in order
+
+    Name based effects only change ASCII characters, and are
+    computed for those - plus the keys in the mapping for upside-down text.
+    ("convert" matters when combining effects: the normalization
+    of an effect's output can undo the previous ones)
+    """
+    chars = {chr(code) for code in range(0x80)}
+    if Effects.upside_down in effects:
+        chars.update(UPSIDE_DOWN_MAPPING.keys())
+    table = {}
+    for char in chars:
+        new_char = _translate(char, effects, convert)
+        if new_char != char:
+            table[ord(char)] = new_char
+    return table
+
+
+@lru_cache(4096)
+def _translate_char(char, effects, convert):
+    if convert and not char.isascii():
+        return _translate(char, effects, convert)
+    return char.translate(_translation_table(effects, convert))
 
 
 def translate_chars(text, unicode_effects, convert=True):
@@ -193,27 +251,17 @@ def translate_chars(text, unicode_effects, convert=True):
       Args:
         - text(str): text to be transformed
         - unicode_effects (iterable[Terminedia.Effects]): Effects to be applied
+        - convert(bool): whether to try to convert non-compliant characters to ones with representation.
 
-
+    A translation table combining all the effects is built on first
+    use of each combination, and single character results are memoized.
     """
-    effect_dict = {
-        Effects.encircled: text_to_circled,
-        Effects.squared: text_to_squared,
-        Effects.negative_squared: text_to_negative_squared,
-        Effects.negative_circled: text_to_negative_circled,
-        Effects.parenthesized: text_to_parenthesized,
-        Effects.fullwidth: text_to_fullwidth,
-        Effects.math_bold: text_to_san_serif_bold,
-        Effects.math_bold_italic: text_to_san_serif_bold_italic,
-        Effects.regional_indicator: text_to_regional_indicator_symbol,
-        Effects.super_script: text_to_modifier_letter,
-        Effects.upside_down: text_to_upside_down,
-        Effects.double_struck: text_to_double_struck,
-    }
-    for effect in unicode_effects:
-        text = effect_dict.get(effect, _nop_effect)(text, convert)
-    return text
-
+    effects = unicode_effects if isinstance(unicode_effects, Effects) else tuple(unicode_effects)
+    if len(text) == 1:
+        return _translate_char(text, effects, convert)
+    if not convert or text.isascii():
+        return text.translate(_translation_table(effects, convert))
+    return "".join(_translate_char(char, effects, convert) for char in text)
 
 
 # Based on the translation map at
@@ -1,7 +1,9 @@
 import copy
 import inspect
 import math
+import os
 from functools import partial
+from pathlib import Path
 
 from collections.abc import Mapping
 
@@ -20,6 +22,10 @@ from .colors import css_colors, Color, SpecialColor
 from .gradient import Gradient, EPSILON, ColorGradient
 
 
+#: Folder where data derived from installed resources (like indexes for font files) is kept
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path("~/.cache").expanduser()) / "terminedia"
+
+
 # TODO: think of a smarter "lazy import" mechanism
 # to avoid circular imports
 root_context = None
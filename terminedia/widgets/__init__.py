@@ -2,3 +2,6 @@ from .core import WidgetCancelled, WidgetEventReactor, Widget, OVERFILL, UNREACH
 from .text import Text, Entry
 from .misc import Button, Label, Selector, ScreenMenu, VBox, HBox
 from .file import FileSelector
+from .log import LogView
+from .table import Table
+from .plot import Plot, Sparkline
@@ -58,25 +58,85 @@ def _ensure_extend(seq, value):
 
 
 class WidgetEventReactor:
+    #: Side, in characters, of the square tiles used to index widget positions
+    tile_size = 8
+
     def __init__(self):
         self.registry = {}
         self.focus = None
         self.main_mouse_subscription = events._SystemSubscription(events.MouseClick, self.screen_click)
         self.main_mouse_subscription = events._SystemSubscription(events.MouseDoubleClick, self.screen_double_click)
+        self.resize_subscription = events._SystemSubscription(events.WidgetResize, self._widget_resized)
         self.focus_order = []
         self.last_focused_index = 0
+        self._tiles = None
+        self._tiles_version = None
+        self._watched_sprites = set()
 
     def __delitem__(self, widget):
         del self.registry[widget]
+        self._tiles = None
         while widget in self.focus_order:
             self.focus_order.remove(widget)
 
     def register(self, widget):
-        #self.rect_registry[widget.sprite.absrect] = widget
         self.registry[widget] = widget.sprite
+        self._tiles = None
         self.focus = widget
         self.focus_order.append(widget)
 
+    def _widget_resized(self, event):
+        self._tiles = None
+
+    def _build_tiles(self):
+        """Index registered widgets by the tiles their rects, in screen coordinates, touch.
+
+        Each tile lists (widget, rect) pairs in registration order.
+        The index is rebuilt lazily after any widget is registered, removed or
+        resized, or the sprite of a widget, or of one of its ancestors, is
+        moved: those sprites are marked as "geometry_watched", so that changes to them,
+        and only to them, increase Sprite.geometry_version.
+        """
+        tile_size = self.tile_size
+        tiles = {}
+        watched = set()
+        for widget, sprite in self.registry.items():
+            watched.update(_sprite_chain(sprite))
+        for sprite in self._watched_sprites - watched:
+            sprite.geometry_watched = False
+        for sprite in watched:
+            sprite.geometry_watched = True
+        self._watched_sprites = watched
+        for widget, sprite in self.registry.items():
+            rect = sprite.absrect
+            if not rect.area:
+                continue
+            entry = (widget, rect)
+            for ty in range(rect.top // tile_size, (rect.bottom - 1) // tile_size + 1):
+                for tx in range(rect.left // tile_size, (rect.right - 1) // tile_size + 1):
+                    tiles.setdefault((tx, ty), []).append(entry)
+        self._tiles = tiles
+        self._tiles_version = Sprite.geometry_version
+
+    def widgets_at(self, pos):
+        """Returns (widget, rect) pairs for active widgets whose screen rect contains "pos"
+
+        Widgets are listed in registration order: containers come before their children.
+        """
+        if self._tiles is None or self._tiles_version != Sprite.geometry_version:
+            self._build_tiles()
+        pos = V2(pos)
+        tile = self._tiles.get((pos.x // self.tile_size, pos.y // self.tile_size), ())
+        return [(widget, rect) for widget, rect in tile if pos in rect and widget.active]
+
+    def widget_at(self, pos):
+        """Returns the topmost widget at the screen position "pos", or None"""
+        hits = self.widgets_at(pos)
+        for widget, rect in hits:
+            if not isinstance(widget, Container):
+                return widget
+        return hits[-1][0] if hits else None
+
     def move_to_focus_position(self, widget, position):
         while widget in self.focus_order:
             self.focus_order.remove(widget)
@@ -89,23 +149,19 @@ class WidgetEventReactor:
         return self.inner_click(event, "double_click_callbacks")
 
     def inner_click(self, event, callback_type):
-        for widget, sprite in self.registry.items():
-            if not widget.active:
-                continue
-            rect = sprite.absrect
-            if event.pos in rect:
-                callbacks = getattr(widget, callback_type, None)
-                if callbacks:
-                    local_event = event.copy(pos=event.pos - rect.c1)
-                    local_event.widget = widget
-                    for callback in reversed(callbacks):
-                        try:
-                            callback(local_event)
-                        except EventSuppressFurtherProcessing:
-                            break
-                # FIXME: not quite right. maybe check all hit sprites first, then execute callbacks in reverse "z-order"
-                if not isinstance(widget, Container):
-                    raise EventSuppressFurtherProcessing()
+        for widget, rect in self.widgets_at(event.pos):
+            callbacks = getattr(widget, callback_type, None)
+            if callbacks:
+                local_event = event.copy(pos=event.pos - rect.c1)
+                local_event.widget = widget
+                for callback in reversed(callbacks):
+                    try:
+                        callback(local_event)
+                    except EventSuppressFurtherProcessing:
+                        break
+            # FIXME: not quite right. maybe check all hit sprites first, then execute callbacks in reverse "z-order"
+            if not isinstance(widget, Container):
+                raise EventSuppressFurtherProcessing()
 
     @property
     def focus(self):
@@ -136,6 +192,16 @@ class WidgetEventReactor:
         return self._tab_change_focus(widget, lambda i: i - 1)
 
 
+def _sprite_chain(sprite):
+    # A sprite and the ones it is nested in: all that determine its screen position
+    chain = []
+    while sprite is not None:
+        chain.append(sprite)
+        owner_sprite = getattr(getattr(sprite, "owner", None), "_owner_sprite", None)
+        sprite = owner_sprite() if owner_sprite else None
+    return chain
+
+
 # singleton
 WidgetEventReactor = WidgetEventReactor()
 
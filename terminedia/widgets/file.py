@@ -1,12 +1,77 @@
-from itertools import chain
+import os
+import threading
 from pathlib import Path
 
 import re
 
+from terminedia import events
+
 from .core import Widget
 from .misc import Selector, VBox
 from .text import Entry
 
+
+#: Listings of already scanned folders: absolute folder path -> (folder mtime, [(is_dir, name), ...])
+folder_cache = {}
+
+
+def _entry_sort_key(entry):
+    is_dir, name = entry
+    return not is_dir, name.upper()
+
+
+class FolderScan:
+    """Lists the contents of a folder in a background thread
+
+    Entries are appended to "entries" as (is_dir, name) tuples, in
+    the order the OS lists them, while the scan runs: "done" is set once it is over.
+    The file type information returned by os.scandir is used, so
+    that, in most systems, no extra "stat" call is made for each entry.
+
+    Complete listings are kept in "folder_cache" and reused while the
+    folder modification time does not change.
+    """
+
+    def __init__(self, folder):
+        self.folder = os.path.abspath(folder)
+        self.entries = []
+        self.done = self.cancelled = False
+        try:
+            mtime = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = folder_cache.get(self.folder)
+        if cached and mtime is not None and cached[0] == mtime:
+            self.entries = cached[1]
+            self.done = True
+            return
+        self.thread = threading.Thread(target=self._scan, args=(mtime,), daemon=True)
+        self.thread.start()
+
+    def _scan(self, mtime):
+        entries = self.entries
+        try:
+            with os.scandir(self.folder) as folder:
+                for entry in folder:
+                    if self.cancelled:
+                        return
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    entries.append((is_dir, entry.name))
+        except OSError:
+            pass
+        else:
+            if mtime is not None:
+                folder_cache[self.folder] = (mtime, entries)
+        finally:
+            self.done = True
+
+    def cancel(self):
+        self.cancelled = True
+
+
 class FileSelector(VBox):
     _fixed_size = True
 
@@ -44,10 +109,13 @@ class FileSelector(VBox):
         self.add(self.folder_entry)
 
         h = self.size[1]-4
+        self.scan = self._scan_subscription = None
         self.main_selector = Selector(parent=self, pos=(0,2), options=self._file_list(), callback=self._list_selected,
-                                      min_height=h, max_height=h, min_width=self.size[0] - 2, border=True, align="left")
+                                      min_height=h, max_height=h, min_width=self.size[0] - 2, border=True, align="left",
+                                      virtual=True, option_count=1 if self.can_move_to_parent else 0)
         self.add(self.main_selector)
         self._last_selected = None
+        self._scan_folder()
 
     @property
     def can_move_to_parent(self):
@@ -58,15 +126,46 @@ class FileSelector(VBox):
             return False
         return True
 
-    def _file_list(self):
-        folder = Path(self.folder)
-        files = [(f"[[{path.name}]]" if path.is_dir() else path.name, Path(path.name)) for path in sorted(
-                chain(
-                    (Path(".."),) if self.can_move_to_parent else (),
-                    folder.iterdir() ),
-                key = lambda path: (-path.is_dir(), str(path).upper())
-                )]
-        return files
+    def _file_list(self, entries=()):
+        """Returns a page provider for the Selector, listing the parent folder and the given entries"""
+        entries = ([(True, "..")] if self.can_move_to_parent else []) + sorted(entries, key=_entry_sort_key)
+        return lambda start, stop: [
+            (f"[[{name}]]" if is_dir else name, Path(name)) for is_dir, name in entries[start:stop]
+        ]
+
+    def _scan_folder(self):
+        """Starts listing the current folder, and shows its entries as they are found"""
+        if self.scan:
+            self.scan.cancel()
+        self.scan = FolderScan(self.folder)
+        self._shown_entries = 0
+        if not self.scan.done and self._scan_subscription is None:
+            self._scan_subscription = events.Subscription(events.Tick, self._scan_progress)
+            self.subscriptions.append(self._scan_subscription)
+        self._scan_progress()
+
+    def _scan_progress(self, event=None):
+        # Called once when a scan starts, and on each tick while it runs.
+        scan = self.scan
+        # "done" is read before the entries are copied: if it is set, the copy is the full listing
+        done = scan.done
+        entries = scan.entries[:]
+        # Partial listings are sorted and shown only as they double in size
+        if event is None or done or len(entries) >= 2 * max(self._shown_entries, 16):
+            self.main_selector.load_options(
+                self._file_list(entries), option_count=len(entries) + self.can_move_to_parent,
+                keep_position=event is not None
+            )
+            self._shown_entries = len(entries)
+        if done and self._scan_subscription is not None:
+            self._scan_subscription.kill()
+            self.subscriptions.remove(self._scan_subscription)
+            self._scan_subscription = None
+
+    def kill(self):
+        if self.scan:
+            self.scan.cancel()
+        super().kill()
 
     def _default_enter(self):
         self.complete()
@@ -95,7 +194,7 @@ class FileSelector(VBox):
             if not self.can_move_to_parent:
                 return
         if str(self.folder) != self.folder_entry.value:
-            self.main_selector.load_options(self._file_list())
+            self._scan_folder()
         else:
             self.main_entry.value = value
         self.folder_entry.value = str(self.folder)
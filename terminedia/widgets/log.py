@@ -0,0 +1,181 @@
+import threading
+from itertools import islice
+
+from terminedia import events
+from terminedia.events import EventSuppressFurtherProcessing
+from terminedia.input import KeyCodes
+from terminedia.text.planes import CtxData, RenderData
+from terminedia.text.style import MLTokenizer
+from terminedia.utils import V2
+
+from .core import Widget
+from .text import _CONTROL_CHARS
+
+
+class LogView(Widget):
+
+    def __init__(self, parent, size, pos=(0, 0), *, max_lines=1000, markup=False, follow=True, text_plane=1, **kwargs):
+        """Read-only view over a stream of appended lines, like a log or a process output
+
+        Args:
+          - max_lines (int): size of the ring buffer keeping the lines. Once it
+                is full, each new line drops the oldest one.
+          - markup (bool): lines contain style markup, as used when writing to text
+                planes. Only colors and effects are applied. Lines are not wrapped.
+          - follow (bool): keep the newest lines in view as lines are appended.
+
+        "append" and "extend" just store the lines, and can be called from other
+        threads: the view is rendered at most once per frame, writing only the
+        cells that changed. Lines are parsed when they are first shown.
+
+        With focus, the arrow, page and HOME keys scroll back over the kept lines,
+        and END resumes following the newest ones.
+        """
+        self.max_lines = max_lines
+        self.markup = markup
+        self.follow = follow
+        self.lines = [None] * max_lines
+        #: Number of lines ever appended. Lines are numbered from 0 in that order.
+        self.total = 0
+        #: Number of the line shown in the first row
+        self.top = 0
+        self.lock = threading.Lock()
+        self._pending = False
+        self._parsed = {}
+        self._drawn_rows = None
+        super().__init__(parent, size, pos=pos, text_plane=text_plane, keypress_callback=self.__class__.change, **kwargs)
+        self.text = self.shape.text[self.text_plane]
+        self.subscriptions.append(events.Subscription(events.Tick, self._tick))
+        self.redraw(full=True)
+
+    @property
+    def first_line(self):
+        """Number of the oldest line still kept"""
+        return max(0, self.total - self.max_lines)
+
+    def __len__(self):
+        return self.total - self.first_line
+
+    def __getitem__(self, index):
+        """Kept lines, from the oldest one"""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("log line index out of range")
+        return self.lines[(self.first_line + index) % self.max_lines]
+
+    def append(self, line):
+        """Adds a line at the end of the log. Line breaks are not interpreted."""
+        with self.lock:
+            self.lines[self.total % self.max_lines] = line
+            self.total += 1
+            self._pending = True
+
+    def extend(self, lines):
+        with self.lock:
+            for line in lines:
+                self.lines[self.total % self.max_lines] = line
+                self.total += 1
+            self._pending = True
+
+    def clear(self):
+        with self.lock:
+            self.lines = [None] * self.max_lines
+            self.total = self.top = 0
+            self._parsed = {}
+        self.redraw()
+
+    def _tick(self, event):
+        if self._pending:
+            self.redraw()
+
+    def _last_top(self, height):
+        return max(self.first_line, self.total - height)
+
+    def scroll(self, amount):
+        """Moves the view "amount" lines down, or up if negative
+
+        Following stops when scrolling up, and resumes when the newest line comes into view.
+        """
+        with self.lock:
+            last_top = self._last_top(self.text.size.y)
+            self.top = max(self.first_line, min(self.top + amount, last_top))
+            self.follow = self.top == last_top
+        self.redraw()
+
+    def _parse(self, line, attrs):
+        width = self.text.size.x
+        if not self.markup:
+            return [(char, attrs) for char in line[:width].translate(_CONTROL_CHARS)]
+        styled = MLTokenizer(line)(text_plane=self.text)
+        # Iterating the sequence yields characters and their context, without rendering them
+        styled._prepare_context()
+        styled.locals.on_rendering_skipped_positions = []
+        return [
+            (char.translate(_CONTROL_CHARS), CtxData(ctx.foreground, ctx.background, ctx.effects))
+            for char, ctx, pos in islice(styled, width)
+        ]
+
+    def redraw(self, full=False):
+        """Renders the lines in view
+
+        Args:
+          - full (bool): render all rows. Otherwise only cells whose
+                contents changed since the last redraw are rendered.
+        """
+        size = self.text.size
+        ctx = self.text.owner.context
+        attrs = CtxData(ctx.foreground, ctx.background, ctx.effects)
+        if full or self._drawn_rows is None or len(self._drawn_rows) != size.y:
+            self.text.writtings.clear()
+            self._drawn_rows = [None] * size.y
+            self._parsed = {}
+        with self.lock:
+            self._pending = False
+            if self.follow:
+                self.top = self._last_top(size.y)
+            else:
+                self.top = max(self.first_line, min(self.top, self._last_top(size.y)))
+            top = self.top
+            visible = [self.lines[number % self.max_lines] for number in range(top, min(self.total, top + size.y))]
+
+        # Parsed lines are kept only while shown
+        parsed = {}
+        for number, line in enumerate(visible, top):
+            cells = self._parsed.get(number)
+            parsed[number] = cells if cells is not None else self._parse(line, attrs)
+        self._parsed = parsed
+
+        blank = (" ", attrs)
+        changed = []
+        for row in range(size.y):
+            cells = parsed.get(top + row, ())
+            content = list(cells) + [blank] * (size.x - len(cells))
+            previous = self._drawn_rows[row]
+            if content == previous:
+                continue
+            for x, (char, cell_attrs) in enumerate(content):
+                if previous is None or previous[x] != (char, cell_attrs):
+                    changed.append(RenderData(char, V2(x, row), 0, cell_attrs))
+            self._drawn_rows[row] = content
+        if changed:
+            self.text._render_baked(changed, {data.pos for data in changed})
+
+    def change(self, event):
+        key = event.key
+        height = self.text.size.y
+        if key == KeyCodes.UP:
+            self.scroll(-1)
+        elif key == KeyCodes.DOWN:
+            self.scroll(1)
+        elif key == KeyCodes.PGUP:
+            self.scroll(-height)
+        elif key == KeyCodes.PGDOWN:
+            self.scroll(height)
+        elif key == KeyCodes.HOME:
+            self.scroll(-self.total)
+        elif key == KeyCodes.END:
+            self.scroll(self.total)
+        raise EventSuppressFurtherProcessing()
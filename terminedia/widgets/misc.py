@@ -1,5 +1,5 @@
-from collections import namedtuple
-from collections.abc import Mapping
+from collections import namedtuple, OrderedDict
+from collections.abc import Mapping, Sequence
 from inspect import isawaitable
 from math import ceil
 
@@ -97,6 +97,65 @@ Label = Button
 _selector_option = namedtuple("option", "raw_text value parsed_text")
 
 
+class LazyOptions(Sequence):
+    """Read-only view of the options of a virtual Selector, converted only when needed
+
+    Args:
+      - source (Sequence or callable): the raw options, as accepted by Selector,
+            or a page provider: a callable that, called with "start" and "stop"
+            indexes, returns the raw options in that range.
+      - convert (callable): converts a raw option to a "_selector_option"
+      - length (int): number of options. Required if "source" is a callable.
+
+    Converted options are kept in pages of "page_size" options, and only the
+    "max_pages" most recently used pages are held in memory.
+    """
+
+    page_size = 64
+    max_pages = 16
+
+    def __init__(self, source, convert, length=None):
+        if callable(source):
+            if length is None:
+                raise TypeError("The number of options must be given for an option page provider")
+            self.provider = source
+        else:
+            if isinstance(source, Mapping):
+                source = list(source.items())
+            self.provider = lambda start, stop: source[start:stop]
+            length = len(source) if length is None else length
+        self.length = length
+        self.convert = convert
+        self.pages = OrderedDict()
+
+    def _page(self, page_number):
+        page = self.pages.get(page_number)
+        if page is None:
+            start = page_number * self.page_size
+            raw = self.provider(start, min(start + self.page_size, self.length))
+            page = self.pages[page_number] = [self.convert(opt) for opt in raw]
+            if len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_number)
+        return page
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("option index out of range")
+        return self._page(index // self.page_size)[index % self.page_size]
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} with {self.length} options>"
+
+
 class Selector(Widget):
     def __init__(
         self, parent, options, *,
@@ -105,17 +164,36 @@ class Selector(Widget):
         selected_row=0, offset=0, click_callback=None,
         min_height=1, max_height=None,
         min_width=1, max_width=100,
+        virtual=False, option_count=None,
         **kwargs
     ):
+        """List of options from which one can be picked with the mouse or arrow keys
+
+        Args:
+          - options (Sequence, Mapping or callable): each option is a string
+                (which can include markup) or a Color, or a (option, value) tuple.
+                A mapping maps options to their values. A callable is used
+                as an option page provider for a virtual selector (see below).
+          - virtual (bool): keep options in a lazy sequence, and convert them only
+                as they are displayed. Recomended for long option lists. Implied
+                if "options" is a callable.
+          - option_count (int): number of options given by a page provider.
+
+        On a virtual selector, the width is picked from the options
+        in the first screenful, and the options can't be changed
+        in place - call "load_options" with the updated options instead.
+        """
 
         self.min_height = min_height
         self.max_height = max_height or parent.size.y
         self.min_width = min_width
         self.max_width = max_width
+        self.virtual = virtual or callable(options)
+        self._drawn_rows = None
 
-        self.load_options(options, redraw=False)
+        self.load_options(options, redraw=False, option_count=option_count)
 
-        self.__dict__["offset"] = min(offset, len(self.options) - 1)
+        self.__dict__["offset"] = max(0, min(offset, len(self.options) - 1))
 
         self.align = align
         self.has_border = 0
@@ -141,20 +219,44 @@ class Selector(Widget):
 
         self.sprite.transformers.append(self.transformer)
 
-    def load_options(self, options, redraw=True):
-        if isinstance(options, dict):
+    def load_options(self, options, redraw=True, option_count=None, keep_position=False):
+        """Replaces all options
+
+        Args:
+          - options, option_count: as accepted on instantiation
+          - redraw (bool): render the new options
+          - keep_position (bool): keep the scrolling offset and selected row, instead of
+                going back to the first option. Used when options are updated while shown.
+        """
+        if self.virtual:
+            self.options = LazyOptions(options, self._make_option, option_count)
+            self.str_options = None
+            self._virtual_width = None
+        elif isinstance(options, dict):
             str_options = list(options.keys())
             options_values = list(options.values())
         else:
             str_options = [opt[0] if isinstance(opt, tuple) else opt for opt in options]
             options_values = [(opt[1] if isinstance(opt, tuple) else opt) for str_opt, opt in zip(str_options, options) ]
 
-        self.options = [_selector_option(opt, val, self._stripped_opt(opt)) for opt, val in zip(str_options, options_values)]
-        self.str_options = str_options
+        if not self.virtual:
+            self.options = [_selector_option(opt, val, self._stripped_opt(opt)) for opt, val in zip(str_options, options_values)]
+            self.str_options = str_options
         if redraw:
-            self.offset = 0
-            self.selected_row = 0
-            self.redraw()
+            if keep_position:
+                last = max(0, len(self.options) - 1)
+                self.__dict__["offset"] = min(self.offset, last)
+                self.selected_row = min(self.selected_row, last - self.offset)
+            else:
+                self.__dict__["offset"] = 0
+                self.selected_row = 0
+            self.redraw(full=False)
+
+    def _make_option(self, raw_opt):
+        if isinstance(raw_opt, _selector_option):
+            return raw_opt
+        opt, value = raw_opt if isinstance(raw_opt, tuple) else (raw_opt, raw_opt)
+        return _selector_option(opt, value, self._stripped_opt(opt))
 
     def _stripped_opt(self, raw_opt):
         if isinstance(raw_opt, terminedia.Color):
@@ -171,8 +273,15 @@ class Selector(Widget):
 
     @property
     def max_option_width(self):
+        if self.virtual:
+            if self._virtual_width is None:
+                self._virtual_width = self._options_width(self.options[:self.max_height])
+            return self._virtual_width
+        return self._options_width(self.options)
+
+    def _options_width(self, options):
         # TODO: strip tokens for width calculation
-        widths = [len(opt.parsed_text) for opt in self.options if isinstance(opt.raw_text, str)]
+        widths = [len(opt.parsed_text) for opt in options if isinstance(opt.raw_text, str)]
         if widths:
             width = max(widths)
         else:
@@ -193,31 +302,77 @@ class Selector(Widget):
     def size(self, value):
         pass #dynamically calculated. Method needs to exist because parnt class tries to set attribute.
 
-    def redraw(self):
-        self.text.clear()
-        self.shape.clear()
-        if self.border:
-            self.text.draw_border(transform=self.border)
-        for row, opt in enumerate(self.options[self.offset:]):
+    def redraw(self, full=True):
+        """Renders the visible options
+
+        Args:
+          - full (bool): clear and render the whole widget. Otherwise
+                only rows whose contents changed since the last redraw are rendered.
+        """
+        visible = self.text.size.y
+        if full or self._drawn_rows is None or len(self._drawn_rows) != visible:
+            self.text.clear()
+            self.shape.clear()
+            if self.border:
+                self.text.draw_border(transform=self.border)
+            self._drawn_rows = [None] * visible
+            self._row_writtings = [None] * visible
+            self._mark_writtings = []
+            full = True
+        else:
+            for writting in self._mark_writtings:
+                self.text.writtings.pop(writting, None)
+            self._mark_writtings = []
+            # cells under the scroll marks are restored by rewriting their rows:
+            for mark in (self._scroll_mark_up, self._scroll_mark_down):
+                if mark is not None and mark.y is not None:
+                    self._drawn_rows[mark.y] = None
+
+        for row, opt in enumerate(self.options[self.offset: self.offset + visible]):
             if isinstance(opt.raw_text, str):
                 # TODO: strip tokens from opt before calculating aligment
                 tmp = f"{opt.parsed_text:{self._align}{self.text.size.x}s}"
                 tmp = tmp.replace(opt.parsed_text, opt.raw_text)
-                self.text[0, row] = tmp
             elif isinstance(opt.raw_text, terminedia.Color):
-                self.text[0, row] = f"[foreground: {opt.raw_text.html}][background: {opt.raw_text.html}]{' ' * (self.text.size.x - 2):^s}"
+                tmp = f"[foreground: {opt.raw_text.html}][background: {opt.raw_text.html}]{' ' * (self.text.size.x - 2):^s}"
+            else:
+                continue
+            if tmp != self._drawn_rows[row]:
+                # Text rows are padded to the full width, color swatches are not:
+                self._write_row(row, tmp, blank_first=not full and not isinstance(opt.raw_text, str))
+        if not full:
+            for row in range(len(self.options) - self.offset, visible):
+                if self._drawn_rows[row] is not None:
+                    self._write_row(row, None, blank_first=True)
+
         scroll_mark_x = self.text.size.x - 1
         if self.offset > 0:
             self._scroll_mark_up = V2(scroll_mark_x, 0)
             self.text[self._scroll_mark_up] = "[effects: reverse]⏶"
+            self._mark_writtings.append(self.text.last_rendered_writing)
         else:
             self._scroll_mark_up = None
         if self.text.size.y + self.offset < len(self.options):
             self._scroll_mark_down = V2(scroll_mark_x,  self.text.size.y - 1)
             self.text[self._scroll_mark_down] = "[effects: reverse]⏷"
+            self._mark_writtings.append(self.text.last_rendered_writing)
         else:
             self._scroll_mark_down = V2(scroll_mark_x, None)
-        self.shape.dirty_set()
+        if full:
+            self.shape.dirty_set()
+
+    def _write_row(self, row, text, blank_first=False):
+        writtings = self.text.writtings
+        writtings.pop(self._row_writtings[row], None)
+        if blank_first:
+            self.text[0, row] = " " * self.text.size.x
+            writtings.pop(self.text.last_rendered_writing, None)
+        if text is not None:
+            self.text[0, row] = text
+            self._row_writtings[row] = self.text.last_rendered_writing
+        else:
+            self._row_writtings[row] = None
+        self._drawn_rows[row] = text
 
     def change(self, event):
         key = event.key
@@ -255,8 +410,10 @@ class Selector(Widget):
             value = len(self.options) - 1
         if value < 0:
             value = 0
+        if value == self.__dict__["offset"]:
+            return
         self.__dict__["offset"] = value
-        self.redraw()
+        self.redraw(full=False)
 
     def _select_click(self, event):
         pos = self.text.pos_to_text_cell(event.pos)
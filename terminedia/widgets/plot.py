@@ -0,0 +1,253 @@
+import math
+import threading
+from array import array
+from functools import lru_cache
+
+import terminedia
+from terminedia import events, V2
+from terminedia.subpixels import BrailleChars, SextantChars
+
+from .core import Widget
+
+
+_resolutions = {"braille": BrailleChars, "sextant": SextantChars}
+
+
+@lru_cache()
+def _packing_tables(chars):
+    """For each dot column in a character, maps the dots set in it, one bit per dot row
+    from the top, to the bits in the order number of the character (see SubPixels.bit_index)
+    """
+    height = chars.block_height
+    return tuple(
+        [
+            sum(chars.bit_index((column, row)) for row in range(height) if pattern >> row & 1)
+            for pattern in range(2 ** height)
+        ]
+        for column in range(chars.block_width)
+    )
+
+
+class Plot(Widget):
+
+    def __init__(
+        self, parent, size, pos=(0, 0), *, series=1, resolution="braille", colors=None,
+        min_value=None, max_value=None, fill=False, text_plane=1, **kwargs
+    ):
+        """Live chart of one or more series of values, scrolling left as values are appended
+
+        Args:
+          - series (int): number of series plotted
+          - resolution (str): "braille" (2x4 dots per character) or "sextant" (2x3 dots per character)
+          - colors (Sequence): color for each series. Where series share a
+                character, the color of the last one is used.
+          - min_value, max_value (float): fixed limits for the vertical axis.
+                Limits not given follow the smallest and largest values kept.
+          - fill (bool): fill the area below each series, instead of drawing lines
+
+        Each series keeps as many values as there are dot columns, in an array("d")
+        ring buffer. Appended values are drawn on the next frame, or on "redraw":
+        only the dot columns for the new values are computed and packed into characters,
+        the characters already packed are shifted left, and only the row spans that
+        change are written. All columns are computed again only when the limits of
+        the vertical axis change. The smallest and largest values kept are tracked
+        as values are appended, and only searched for again when one of them is dropped.
+        """
+        if resolution not in _resolutions:
+            raise ValueError(f"Resolution must be one of {list(_resolutions)}")
+        self.chars = _resolutions[resolution]
+        self.series = series
+        self.fill = fill
+        self.min_value = min_value
+        self.max_value = max_value
+        super().__init__(parent, size, pos=pos, text_plane=text_plane, **kwargs)
+        context = self.shape.context
+        if colors is None:
+            colors = [context.color] * series
+        self.colors = [terminedia.Color(color) for color in colors]
+
+        width, height = self.shape.size
+        #: Number of values kept for each series: one per dot column
+        self.capacity = width * self.chars.block_width
+        self.dot_rows = height * self.chars.block_height
+        self.buffers = [array("d", bytes(8 * self.capacity)) for _ in range(series)]
+        #: Number of values ever appended to each series
+        self.count = 0
+        self.lock = threading.Lock()
+        self._masks = [None] * self.capacity
+        # smallest and largest values kept, or None if they must be searched for
+        self._value_range = (math.inf, -math.inf)
+        self._limits = None
+        self._drawn_count = 0
+        self._drawn_cells = None
+        # rows of packed characters, and the count they were packed for, by count % block_width:
+        # the dot columns in each character only match the ones packed with the same remainder
+        self._packed = {}
+        self.subscriptions.append(events.Subscription(events.Tick, self._tick))
+        self.redraw(full=True)
+
+    def append(self, *values):
+        """Adds one value to each series"""
+        if len(values) != self.series:
+            raise TypeError(f"Expected {self.series} values, one for each series")
+        with self.lock:
+            slot = self.count % self.capacity
+            dropping = self.count >= self.capacity
+            value_range = self._value_range
+            for buffer, value in zip(self.buffers, values):
+                if value_range is not None:
+                    if dropping and buffer[slot] in value_range:
+                        value_range = None
+                    else:
+                        value_range = (min(value_range[0], value), max(value_range[1], value))
+                buffer[slot] = value
+            self._value_range = value_range
+            self.count += 1
+
+    def extend(self, samples):
+        """Adds values from a sequence of samples, each with one value for each series"""
+        for values in samples:
+            self.append(*values)
+
+    def values(self, series=0):
+        """Values kept for a series, from the oldest one"""
+        buffer = self.buffers[series]
+        if self.count <= self.capacity:
+            return buffer[:self.count]
+        slot = self.count % self.capacity
+        return buffer[slot:] + buffer[:slot]
+
+    @property
+    def limits(self):
+        """Lower and upper limits of the vertical axis"""
+        low, high = self.min_value, self.max_value
+        kept = min(self.count, self.capacity)
+        if kept and (low is None or high is None):
+            if self._value_range is None:
+                self._value_range = (
+                    min(min(buffer[:kept]) for buffer in self.buffers),
+                    max(max(buffer[:kept]) for buffer in self.buffers),
+                )
+            if low is None:
+                low = self._value_range[0]
+            if high is None:
+                high = self._value_range[1]
+        return (low or 0.0, high or 0.0)
+
+    def _tick(self, event):
+        if self.count != self._drawn_count:
+            self.redraw()
+
+    def _dot_row(self, value, low, high):
+        rows = self.dot_rows
+        if high <= low:
+            return rows // 2
+        row = int((high - value) / (high - low) * (rows - 1) + 0.5)
+        return min(max(row, 0), rows - 1)
+
+    def _column_masks(self, number, limits):
+        # Dots set in the dot column for each series' value number "number", one bit per dot row
+        masks = []
+        slot = number % self.capacity
+        previous_slot = (number - 1) % self.capacity
+        has_previous = number > 0 and number > self.count - self.capacity
+        for buffer in self.buffers:
+            row = self._dot_row(buffer[slot], *limits)
+            if self.fill:
+                low, high = row, self.dot_rows - 1
+            else:
+                # connect to the previous value, so that steep changes are drawn as lines
+                previous = self._dot_row(buffer[previous_slot], *limits) if has_previous else row
+                if previous < row:
+                    low, high = previous + 1, row
+                elif previous > row:
+                    low, high = row, previous - 1
+                else:
+                    low = high = row
+            masks.append(((2 << high) - 1) ^ ((1 << low) - 1))
+        return masks
+
+    def redraw(self, full=False):
+        """Renders values appended since the last redraw
+
+        Args:
+          - full (bool): compute the dot columns for all values, and write all characters.
+        """
+        with self.lock:
+            count = self.count
+            first = max(0, count - self.capacity)
+            limits = self.limits
+            if full or limits != self._limits:
+                full_columns = range(first, count)
+                self._packed = {}
+            else:
+                full_columns = range(max(first, self._drawn_count), count)
+            for number in full_columns:
+                self._masks[number % self.capacity] = self._column_masks(number, limits)
+            self._limits = limits
+            self._drawn_count = count
+            rows = self._pack(count)
+
+        shape = self.shape
+        if full or self._drawn_cells is None:
+            self._drawn_cells = [[None] * shape.width for _ in rows]
+        background, effects = shape.context.background, shape.context.effects
+        for y, (row, drawn) in enumerate(zip(rows, self._drawn_cells)):
+            changed = [x for x, cell in enumerate(row) if cell != drawn[x]]
+            if not changed:
+                continue
+            start, stop = changed[0], changed[-1] + 1
+            shape.put_run((start, y), [(char, color, background, effects) for char, color in row[start:stop]])
+            drawn[start:stop] = row[start:stop]
+
+    def _pack(self, count):
+        # Rows of (character, color) for the current dot columns, newest values at the right edge
+        chars = self.chars
+        block_width, block_height = chars.block_width, chars.block_height
+        width, height = self.shape.size
+        phase = count % block_width
+        packed = self._packed.get(phase)
+        if packed:
+            # The same dot columns are in each character: shift them, and pack only the new ones
+            shift = min((count - packed[0]) // block_width, width)
+            rows = [row[shift:] + [None] * shift for row in packed[1]]
+            first_x = width - shift
+        else:
+            rows = [[None] * width for _ in range(height)]
+            first_x = 0
+        self._packed[phase] = (count, rows)
+        if first_x >= width:
+            return rows
+
+        tables = _packing_tables(chars)
+        row_mask = (1 << block_height) - 1
+        chars_in_order = chars.chars_in_order
+        capacity = self.capacity
+        empty = [0] * self.series
+        columns = [
+            self._masks[number % capacity] if number >= 0 and number >= count - capacity else empty
+            for number in range(count - capacity + first_x * block_width, count)
+        ]
+        default_color = self.shape.context.color
+        for x in range(first_x, width):
+            cell_columns = columns[(x - first_x) * block_width: (x - first_x + 1) * block_width]
+            for y in range(height):
+                shift = y * block_height
+                order = 0
+                color = default_color
+                for series, series_color in enumerate(self.colors):
+                    bits = 0
+                    for table, masks in zip(tables, cell_columns):
+                        bits |= table[(masks[series] >> shift) & row_mask]
+                    if bits:
+                        order |= bits
+                        color = series_color
+                rows[y][x] = (chars_in_order[order], color)
+        return rows
+
+
+class Sparkline(Plot):
+
+    def __init__(self, parent, size, pos=(0, 0), *, color=None, fill=True, **kwargs):
+        """Single series Plot, filled by default. Values are added with "append(value)" """
+        super().__init__(parent, size, pos=pos, series=1, colors=[color] if color else None, fill=fill, **kwargs)
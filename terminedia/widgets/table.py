@@ -0,0 +1,310 @@
+from array import array
+from functools import lru_cache
+from numbers import Number
+
+from terminedia.events import EventSuppressFurtherProcessing
+from terminedia.input import KeyCodes
+from terminedia.text.planes import CtxData, RenderData
+from terminedia.unicode import char_width
+from terminedia.utils import V2
+from terminedia.values import CONTINUATION, Effects
+
+from .core import Widget, _ensure_extend
+from .misc import LazyOptions
+from .text import _CONTROL_CHARS
+
+
+@lru_cache(maxsize=8192)
+def _text_width(text):
+    if text.isascii():
+        return len(text)
+    return sum(char_width(char) for char in text)
+
+
+def _cell_text(value):
+    return "" if value is None else str(value).translate(_CONTROL_CHARS)
+
+
+def _fit(text, width, align_right):
+    """Characters of "text" taking exactly "width" cells, cut with a "›" mark if needed.
+
+    Double width characters are followed by a CONTINUATION, as they are stored in shapes.
+    """
+    fits = _text_width(text) <= width
+    ellipsis = "" if fits or width < 1 else "›"
+    limit = width - len(ellipsis)
+    cells = []
+    for char in text:
+        char_size = char_width(char)
+        if len(cells) + char_size > limit:
+            break
+        cells.append(char)
+        if char_size == 2:
+            cells.append(CONTINUATION)
+    cells.extend(ellipsis)
+    padding = [" "] * (width - len(cells))
+    return padding + cells if align_right and fits else cells + padding
+
+
+class Table(Widget):
+
+    def __init__(
+        self, parent, size, rows, *, columns=None, row_count=None, widths=None,
+        max_column_width=30, separator=" ", callback=None, pos=(0, 0), text_plane=1,
+        click_callback=None, **kwargs
+    ):
+        """Scrollable grid showing rows of values, rendering only the ones in view
+
+        Args:
+          - rows (Sequence or callable): the rows, each a sequence of cell values, or
+                a row page provider: a callable that, called with "start" and "stop"
+                indexes, returns the rows in that range.
+          - columns (Sequence): column titles, shown in a header row. Clicking
+                a title sorts the rows by that column.
+          - row_count (int): number of rows. Required if "rows" is a callable.
+          - widths (Sequence): width of each column. Columns with no width given,
+                or given as None, take the width of the widest value seen so far,
+                up to "max_column_width".
+          - callback (callable): called with the table when ENTER is pressed.
+
+        Rows are fetched, and their values formatted, only when they come into view,
+        and only the cells whose contents changed since the last redraw are written.
+        Sorting does not copy the rows: an index with the row order is built instead.
+
+        If the rows change, call "redraw", or "load_rows" if there are new rows.
+        """
+        self.columns = list(columns) if columns else None
+        self.header_height = 1 if self.columns else 0
+        self.max_column_width = max_column_width
+        self.separator = separator
+        self.callback = callback
+        self._fixed_widths = list(widths) if widths else []
+        self.order = None
+        self.sort_column = None
+        self.sort_reverse = False
+        self.offset = self.selected = self.left_column = 0
+        self._drawn_rows = None
+        self.load_rows(rows, row_count, redraw=False)
+
+        click_callbacks = [self._table_click]
+        _ensure_extend(click_callbacks, click_callback)
+        super().__init__(parent, size, pos=pos, text_plane=text_plane, keypress_callback=self.__class__.change,
+                         click_callback=click_callbacks, **kwargs)
+        self.text = self.shape.text[self.text_plane]
+        self.redraw(full=True)
+
+    def load_rows(self, rows, row_count=None, redraw=True):
+        """Replaces the rows, keeping the position, the sort order column, and the column widths"""
+        if callable(rows):
+            if row_count is None:
+                raise TypeError("The number of rows must be given for a row page provider")
+            self.rows = LazyOptions(rows, tuple, row_count)
+        else:
+            self.rows = rows
+        self._source = rows
+        if self.columns:
+            self.column_count = len(self.columns)
+        else:
+            self.column_count = len(self.rows[0]) if len(self.rows) else 0
+        if not hasattr(self, "_widths"):
+            # Column titles get room for the sort order mark
+            self._widths = [
+                _text_width(_cell_text(self.columns[column])) + 1 if self.columns else 1
+                for column in range(self.column_count)
+            ]
+        if self.sort_column is not None:
+            self.sort(self.sort_column, self.sort_reverse, redraw=False)
+        last = max(0, len(self.rows) - 1)
+        self.selected = min(self.selected, last)
+        self.offset = min(self.offset, self.selected)
+        if redraw:
+            self.redraw()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, index):
+        """Row at "index" in the displayed order"""
+        return self.rows[self.order[index] if self.order is not None else index]
+
+    @property
+    def value(self):
+        """The selected row"""
+        return self.row(self.selected) if len(self.rows) else None
+
+    def _column_values(self, column):
+        source = self._source
+        if not callable(source):
+            return [row[column] for row in source]
+        values = []
+        count = len(self.rows)
+        page_size = 4096
+        for start in range(0, count, page_size):
+            values.extend(row[column] for row in source(start, min(count, start + page_size)))
+        return values
+
+    def sort(self, column=None, reverse=False, redraw=True):
+        """Displays the rows ordered by the values in "column", or in their own order if it is None
+
+        Rows with None in the column come last. If the other values can't be
+        compared with each other, like numbers and strings, they are ordered as text.
+        """
+        self.sort_column = column
+        self.sort_reverse = reverse
+        if column is None:
+            self.order = None
+        else:
+            keys = self._column_values(column)
+            present = [index for index, key in enumerate(keys) if key is not None]
+            missing = [index for index, key in enumerate(keys) if key is None]
+            try:
+                present.sort(key=keys.__getitem__, reverse=reverse)
+            except TypeError:
+                present.sort(key=lambda index: str(keys[index]), reverse=reverse)
+            self.order = array("l", present + missing)
+        if redraw:
+            self.redraw()
+
+    def column_width(self, column):
+        if column < len(self._fixed_widths) and self._fixed_widths[column] is not None:
+            return self._fixed_widths[column]
+        return self._widths[column]
+
+    def _update_widths(self, rows):
+        # Column widths only grow, so that columns don't jump around while scrolling
+        widths = self._widths
+        for column in range(self.column_count):
+            width = max((_text_width(_cell_text(row[column])) for row in rows if column < len(row)), default=0)
+            if width > widths[column]:
+                widths[column] = min(width, self.max_column_width)
+
+    def _layout(self, total_width):
+        # (column, first cell, width) for the columns in view
+        layout = []
+        x = 0
+        for column in range(self.left_column, self.column_count):
+            if x >= total_width:
+                break
+            width = min(self.column_width(column), total_width - x)
+            layout.append((column, x, width))
+            x += width + _text_width(self.separator)
+        return tuple(layout)
+
+    @property
+    def page_height(self):
+        return max(1, self.text.size.y - self.header_height)
+
+    def redraw(self, full=False):
+        """Renders the rows in view
+
+        Args:
+          - full (bool): render all rows. Otherwise only rows whose values
+                changed since the last redraw are formatted, and only their
+                changed cells are rendered.
+        """
+        size = self.text.size
+        ctx = self.text.owner.context
+        attrs = CtxData(ctx.foreground, ctx.background, ctx.effects)
+        if full or self._drawn_rows is None or len(self._drawn_rows) != size.y:
+            self.text.writtings.clear()
+            self._drawn_rows = [None] * size.y
+            self._drawn_keys = [None] * size.y
+
+        stop = min(len(self.rows), self.offset + self.page_height)
+        rows = [self.row(index) for index in range(self.offset, stop)]
+        self._update_widths(rows)
+        layout = self._layout(size.x)
+
+        lines = []
+        if self.columns:
+            header_attrs = CtxData(attrs.foreground, attrs.background, attrs.effects | Effects.bold)
+            lines.append((("header", self.columns, self.sort_column, self.sort_reverse), self.columns, header_attrs))
+        selected_attrs = CtxData(attrs.foreground, attrs.background, attrs.effects | Effects.reverse)
+        for index, row in enumerate(rows, self.offset):
+            row_attrs = selected_attrs if index == self.selected else attrs
+            lines.append((tuple(row), row, row_attrs))
+
+        changed = []
+        for y in range(size.y):
+            if y < len(lines):
+                values, row, row_attrs = lines[y]
+                key = (values, row_attrs, layout)
+            else:
+                key = None
+            if key == self._drawn_keys[y] and self._drawn_rows[y] is not None:
+                continue
+            content = self._render_row(row, row_attrs, layout, size.x, y < self.header_height) if key else [(" ", attrs)] * size.x
+            previous = self._drawn_rows[y]
+            for x, cell in enumerate(content):
+                if previous is None or previous[x] != cell:
+                    changed.append(RenderData(cell[0], V2(x, y), 0, cell[1]))
+            self._drawn_rows[y] = content
+            self._drawn_keys[y] = key
+        if changed:
+            self.text._render_baked(changed, {data.pos for data in changed})
+
+    def _render_row(self, row, attrs, layout, total_width, is_header):
+        chars = []
+        for column, x, width in layout:
+            if x:
+                separator_width = _text_width(self.separator)
+                chars.extend(_fit(self.separator, min(separator_width, total_width - len(chars)), False))
+            value = row[column] if column < len(row) else None
+            text = _cell_text(value)
+            if is_header and column == self.sort_column:
+                text += "⏷" if self.sort_reverse else "⏶"
+            chars.extend(_fit(text, width, isinstance(value, Number) and not isinstance(value, bool)))
+        chars.extend(" " * (total_width - len(chars)))
+        return [(char, attrs) for char in chars]
+
+    def select(self, index):
+        """Selects the row at "index" in the displayed order, scrolling it into view"""
+        index = max(0, min(index, len(self.rows) - 1))
+        self.selected = index
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.page_height:
+            self.offset = index - self.page_height + 1
+        self.redraw()
+
+    def change(self, event):
+        key = event.key
+        if key == KeyCodes.UP:
+            self.select(self.selected - 1)
+        elif key == KeyCodes.DOWN:
+            self.select(self.selected + 1)
+        elif key == KeyCodes.PGUP:
+            self.select(self.selected - self.page_height)
+        elif key == KeyCodes.PGDOWN:
+            self.select(self.selected + self.page_height)
+        elif key == KeyCodes.HOME:
+            self.select(0)
+        elif key == KeyCodes.END:
+            self.select(len(self.rows) - 1)
+        elif key == KeyCodes.LEFT:
+            if self.left_column > 0:
+                self.left_column -= 1
+                self.redraw()
+        elif key == KeyCodes.RIGHT:
+            if self.left_column < self.column_count - 1:
+                self.left_column += 1
+                self.redraw()
+        elif key == KeyCodes.ENTER:
+            if self.callback:
+                self.callback(self)
+            self.done = True
+        raise EventSuppressFurtherProcessing()
+
+    def _table_click(self, event):
+        pos = self.text.pos_to_text_cell(event.pos)
+        if pos.y >= self.header_height:
+            index = self.offset + pos.y - self.header_height
+            if index < len(self.rows):
+                self.select(index)
+            return
+        for column, x, width in self._layout(self.text.size.x):
+            if x <= pos.x < x + width:
+                reverse = column == self.sort_column and not self.sort_reverse
+                self.sort(column, reverse, redraw=False)
+                self.select(0)
+                break
@@ -1,5 +1,4 @@
 from collections import namedtuple
-from copy import deepcopy
 from math import ceil
 
 import terminedia
@@ -12,7 +11,9 @@ from terminedia.events import EventSuppressFurtherProcessing
 from terminedia.input import KeyCodes
 from terminedia.utils import ClassCache
 from terminedia.utils.gradient import RangeMap
-from terminedia.text import escape
+from terminedia.text import escape, TextBuffer
+from terminedia.text.planes import CtxData, RenderData
+from terminedia.unicode import char_width
 
 from .core import  Widget, OVERFILL, UNREACHABLE, _ensure_extend
 
@@ -23,6 +24,8 @@ _EMPTY_MARK = Mark()
 _UNUSED = "*"
 _USED = " "
 _ENTER = "#"
+# Control characters in a document are shown as blanks
+_CONTROL_CHARS = {code: " " for code in range(0x20)}
 
 MarkCell = namedtuple("MarkCell", "from_pos to_pos flow_changed is_used direction")
 BackTrack = namedtuple("BackTrack", "position direction distance_to_closest_mark mark_count")
@@ -60,6 +63,14 @@ class CursorTransformer(terminedia.Transformer):
                 return value
         return (value if isinstance(value, terminedia.Effects) else 0) | effect
 
+    @property
+    def dirty_region(self):
+        # Only the cells under the cursor blink: no need to redraw the whole widget each frame.
+        text = self.parent.text
+        size = text.char_size
+        corner = self.parent.pos * size + (text.pad_left, text.pad_top)
+        return Rect(corner.as_int, (corner + size).ceil)
+
 
     #def background(self, value, pos, tick):
         #if not self.parent.focus or pos != self.parent.pos or not tick % 7:
@@ -126,6 +137,18 @@ class TextDoesNotFit(ValueError): #sentinel
      pass
 
 
+def _common_prefix_length(a, b):
+    # Bisects on slice comparisons, so that characters are compared in native code
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
 lcache = ClassCache()
 
 class Lines:
@@ -136,18 +159,25 @@ class Lines:
         self._last_event = (None, None, None, None)
 
     @lcache.invalidate
-    def _hard_load_from_soft_lines(self):
+    def _hard_load_from_soft_lines(self, first_line=0):
         # set text in text_plane from parent from text in value,
         # filling in spaces for unused values.
+        # Soft lines before "first_line" are known not to have changed:
+        # their part of the previous raw_value is reused as is.
         new_hard_lines = []
-        for i, line in enumerate(self.soft_lines):
+        if 0 < first_line < len(self.soft_lines) and self.parent.raw_value is getattr(self, "_loaded_raw_value", None):
+            new_hard_lines.append(self.parent.raw_value[:self.hard_line_indexes[self.soft_line_map[first_line]]])
+        else:
+            first_line = 0
+        for i in range(first_line, len(self.soft_lines)):
+            line = self.soft_lines[i]
             hard_len = self._hard_line_capacity_for_given_soft_line(i)
             new_hard_lines.append(line + " " * (hard_len - len(line)))
 
         raw_value = "".join(new_hard_lines)
         if len(raw_value) > self.parent.text_space:
             raise TextDoesNotFit()
-        self.parent.raw_value = raw_value
+        self.parent.raw_value = self._loaded_raw_value = raw_value
 
     def reload(self, value):
         if isinstance(value, str):
@@ -160,8 +190,8 @@ class Lines:
         soft_index = 0
         soft_line = lines[soft_index]
         count = 0
-        for hard_line in self.hard_lines:
-            soft_line = soft_line[len(hard_line):]
+        for length in self.hard_line_lengths:
+            soft_line = soft_line[length:]
             if not soft_line:
                 soft_index += 1
                 if soft_index < len(lines):
@@ -175,7 +205,7 @@ class Lines:
 
     @lcache.cached
     def _soft_lines_spams(self):
-        hard_lines = self.hard_lines
+        hard_lines = self.hard_line_lengths
         spams = []
         hard_line_index = -1
         acc = -1
@@ -193,7 +223,7 @@ class Lines:
                         self.soft_lines.pop()
                     break
                 hard_line_map[hard_line_index] = (i, offset)
-                len_hard_line = len(hard_lines[hard_line_index])
+                len_hard_line = hard_lines[hard_line_index]
                 acc += len_hard_line + (1 if acc == -1 else 0)
                 hard_line_indexes.append(len_hard_line + hard_line_indexes[-1])
                 this_line_spam += 1
@@ -203,7 +233,7 @@ class Lines:
                 hard_line_index += 1
                 if hard_line_index < len(hard_lines):
                     hard_line_map[hard_line_index] = (i, offset + 1)
-                    len_hard_line = len(hard_lines[hard_line_index])
+                    len_hard_line = hard_lines[hard_line_index]
                     hard_line_indexes.append(len_hard_line + hard_line_indexes[-1])
 
             spams.append(this_line_spam)
@@ -226,34 +256,42 @@ class Lines:
     def hard_line_indexes(self):
         return self._soft_lines_spams()[3]
 
-    @lcache.cached_prop
+    @property
     def len_hard_lines(self):
         return len(self.parent.line_indexes.stops)
 
-    @lcache.cached_prop
+    @property
+    def hard_line_lengths(self):
+        # Depends only on the text plane geometry, not on the text being edited:
+        # kept until the parent's line indexes are rebuilt.
+        line_indexes = self.parent.line_indexes
+        if getattr(self, "_hard_line_lengths", (None,))[0] is not line_indexes:
+            stops = line_indexes.stops
+            self._hard_line_lengths = line_indexes, [end - start for start, end in zip(stops, stops[1:])]
+        return self._hard_line_lengths[1]
+
+    @property
     def hard_lines(self):
         start = 0
         lines = []
-        for end in self.parent.line_indexes.stops[1:]:
-            line = "".join(cell for cell in self.parent.raw_value[start:end])
-            if len(line) < end - start:
-                line += " " * ((end - start) - len(line))
-            lines.append(line)
-            start = end
+        raw_value = self.parent.raw_value
+        for length in self.hard_line_lengths:
+            lines.append(raw_value[start: start + length].ljust(length))
+            start += length
         return lines
 
     def hard_line_number(self, index):
         acc = 0
-        for i, line in enumerate(self.hard_lines):
-            acc += len(line)
+        for i, length in enumerate(self.hard_line_lengths):
+            acc += length
             if index < acc:
                 return i
         raise TextDoesNotFit()
 
     def get_index_in_soft_line(self, hard_index):
         acc = 0
-        for i, line in enumerate(self.hard_lines):
-            new_acc = acc + len(line)
+        for i, length in enumerate(self.hard_line_lengths):
+            new_acc = acc + length
             if new_acc > hard_index:
                 hard_line_number = i # byproduct. consolidate later.
                 index_in_current_hard_line = hard_index - acc
@@ -267,7 +305,7 @@ class Lines:
         while offset and previous_hard_line:
             previous_hard_line -= 1
             offset -= 1
-            index_in_soft_line += len(self.hard_lines[previous_hard_line])
+            index_in_soft_line += self.hard_line_lengths[previous_hard_line]
         soft_line = self.hard_line_map[hard_line_number][0]
         return soft_line, index_in_soft_line
 
@@ -283,7 +321,7 @@ class Lines:
         done = False
         while not done:
             try:
-                result = sum(len(self.hard_lines[j]) for j in range(hard_line_index, hard_line_index + self.soft_lines_spams[line] - disconsider_last_soft_lines))
+                result = sum(self.hard_line_lengths[j] for j in range(hard_line_index, hard_line_index + self.soft_lines_spams[line] - disconsider_last_soft_lines))
             except IndexError:
                 if not disconsider_last_soft_lines:
                     disconsider_last_soft_lines = 1
@@ -300,7 +338,7 @@ class Lines:
 
     @lcache.invalidate
     def _set(self, hard_index, value, insert):
-        prev = deepcopy(self.soft_lines)
+        prev = self.soft_lines[:]
 
         line, index =(self.get_index_in_soft_line(hard_index))
         dist_from_eol = index - len(self.soft_lines[line])
@@ -355,7 +393,7 @@ class Lines:
             self.soft_lines_spams[line] += 1
 
         try:
-            self._hard_load_from_soft_lines()
+            self._hard_load_from_soft_lines(line)
         except TextDoesNotFit:
             self.soft_lines = prev
             self._hard_load_from_soft_lines()
@@ -389,7 +427,7 @@ class Lines:
         if backspace:
             hard_index -= 1
         try:
-            self._hard_load_from_soft_lines()
+            self._hard_load_from_soft_lines(line)
         except TextDoesNotFit:
             pass
         self._last_event = (None, None, None, None)
@@ -453,6 +491,7 @@ class Editable:
         if not index_counted:
             new_line_indices.append(count - 1)
         self.raw_value = " " * len(indexes_from)
+        self._rendered_value = None
         self.line_indexes = RangeMap(new_line_indices)
         self.indexes_from = indexes_from
         self.indexes_to = indexes_to
@@ -553,15 +592,53 @@ class Editable:
             self.regen_text()
 
 
-    def regen_text(self):
+    def regen_text(self, full=False):
+        """Renders raw_value in the text plane
+
+        Args:
+          - full (bool): render the whole text. Otherwise only the span of
+                raw_value changed since the last call is rendered, whenever
+                the last full rendering placed each character in the cell
+                given by "indexes_from".
+        """
+        raw_value = self.raw_value
+        previous = self._rendered_value
+        if not full and previous is not None and len(previous) == len(raw_value):
+            start = _common_prefix_length(previous, raw_value)
+            end = len(raw_value) - _common_prefix_length(previous[::-1], raw_value[::-1])
+            if all(char.isascii() or char_width(char) == 1 for char in raw_value[start:end]):
+                self._render_span(start, end)
+                return
 
         self.text.writtings.clear()
         with self.text.recording as text_data:
-            self.text.at(self.initial_pos, escape(self.raw_value))
+            self.text.at(self.initial_pos, escape(raw_value))
         self.last_text_data = text_data
+        indexes_from = self.indexes_from
+        if len(text_data) == len(raw_value) and all(data.pos == indexes_from[i] for i, data in enumerate(text_data)):
+            self._rendered_value = raw_value
+        else:
+            self._rendered_value = None
         if self.parent.has_border and self.text.char_size[1] == 2.5:
             self.text.draw_border(roi=Rect((0, self.parent.size.y - 2), self.parent.size))
 
+    def _render_span(self, start, end):
+        # The text writting from the last full rendering is outdated from now on:
+        # drop it so that it is not re-rendered over the edited text.
+        self.text.writtings.clear()
+        text_data = self.last_text_data
+        raw_value = self.raw_value
+        for i in range(start, end):
+            text_data[i] = text_data[i]._replace(char=raw_value[i])
+        changed = text_data[start:end]
+        self.text._render_baked(changed, {data.pos for data in changed})
+        self._rendered_value = raw_value
+
+    def load(self, value):
+        self.lines.reload(value)
+        self.lines._hard_load_from_soft_lines()
+        self.regen_text()
+
     def kill(self):
         self.focus = False
 
@@ -569,9 +646,188 @@ class Editable:
         terminedia.events.Event(terminedia.events.Custom, subtype=type, owner=self, info=args)
 
 
+class BufferEditable:
+    """Internal class to widgets -
+    edits a TextBuffer of any size, seen through the text plane as a viewport.
+
+    Each line in the buffer takes one row in the text plane, and each character
+    one cell: lines are not wrapped, and the view scrolls to keep the
+    cursor visible. Only the lines in view are read from the buffer, and
+    only the cells whose contents change are rendered again.
+    """
+    def __init__(self, text_plane, parent=None, value=""):
+        self.focus = True
+        self.text = text_plane
+        self.parent = parent
+        self.buffer = value if isinstance(value, TextBuffer) else TextBuffer(value)
+        self.insertion = True
+        # First line and column in view, and cursor position in the buffer:
+        self.top = self.left = 0
+        self.line = self.column = 0
+        self.tick = 0
+        self._drawn_rows = None
+
+        if parent:
+            self.parent.sprite.transformers.append(CursorTransformer(self))
+        self.redraw(full=True)
+
+    @property
+    def pos(self):
+        """Cursor position in the text plane"""
+        return V2(self.column - self.left, self.line - self.top)
+
+    @pos.setter
+    def pos(self, pos):
+        self._move_to(self.top + pos[1], self.left + pos[0])
+        self.redraw()
+
+    @property
+    def value(self):
+        return str(self.buffer)
+
+    @property
+    def offset(self):
+        """Cursor position in the buffer"""
+        return self.buffer.line_start(self.line) + self.column
+
+    def load(self, value):
+        self.buffer = value if isinstance(value, TextBuffer) else TextBuffer(value)
+        self.top = self.left = self.line = self.column = 0
+        self.redraw()
+
+    def _line_length(self, line):
+        start, end = self.buffer.line_span(line)
+        return end - start
+
+    def _move_to(self, line, column):
+        self.line = max(0, min(line, self.buffer.line_count - 1))
+        self.column = max(0, min(column, self._line_length(self.line)))
+        size = self.text.size
+        if self.line < self.top:
+            self.top = self.line
+        elif self.line >= self.top + size.y:
+            self.top = self.line - size.y + 1
+        if self.column < self.left:
+            self.left = self.column
+        elif self.column >= self.left + size.x:
+            self.left = self.column - size.x + 1
+
+    def _move_to_offset(self, offset):
+        line = self.buffer.line_of(offset)
+        self._move_to(line, offset - self.buffer.line_start(line))
+
+    def keypress(self, event):
+        try:
+            self.change(event)
+        finally:
+            # do not allow keypress to be processed further
+            raise EventSuppressFurtherProcessing()
+
+    def change(self, event):
+        self.tick += 1
+        key = event.key
+        buffer = self.buffer
+        line, column = self.line, self.column
+        height = self.text.size.y
+
+        if key == KeyCodes.UP:
+            self._move_to(line - 1, column)
+        elif key == KeyCodes.DOWN:
+            self._move_to(line + 1, column)
+        elif key == KeyCodes.LEFT:
+            if self.offset > 0:
+                self._move_to_offset(self.offset - 1)
+        elif key == KeyCodes.RIGHT:
+            if self.offset < len(buffer):
+                self._move_to_offset(self.offset + 1)
+        elif key == KeyCodes.HOME:
+            self._move_to(line, 0)
+        elif key == KeyCodes.END:
+            self._move_to(line, self._line_length(line))
+        elif key in (KeyCodes.PGUP, KeyCodes.PGDOWN):
+            step = height if key == KeyCodes.PGDOWN else -height
+            self.top = max(0, min(self.top + step, buffer.line_count - height))
+            self._move_to(line + step, column)
+        elif key == KeyCodes.INSERT:
+            self.insertion ^= True
+        elif key == KeyCodes.DELETE:
+            buffer.delete(self.offset, self.offset + 1)
+        elif key == KeyCodes.BACK:
+            offset = self.offset
+            if offset > 0:
+                self._move_to_offset(offset - 1)
+                buffer.delete(offset - 1, offset)
+        else:
+            if key == KeyCodes.ENTER:
+                text = "\n"
+            else:
+                # Pasted text may come in a single event
+                text = key.replace("\r\n", "\n").replace("\r", "\n")
+                if key in KeyCodes.codes or not text.replace("\n", "").isprintable():
+                    return
+            offset = self.offset
+            if not self.insertion:
+                start, end = buffer.line_span(line)
+                buffer.delete(offset, min(offset + len(text), end))
+            buffer.insert(offset, text)
+            self._move_to_offset(offset + len(text))
+        self.redraw()
+
+    def redraw(self, full=False):
+        """Renders the lines in view
+
+        Args:
+          - full (bool): render all rows. Otherwise only rows whose contents
+                changed since the last redraw are rendered.
+        """
+        size = self.text.size
+        if full or self._drawn_rows is None or len(self._drawn_rows) != size.y:
+            # Cells are written directly, so no earlier text writting should be rendered over them
+            self.text.writtings.clear()
+            self._drawn_rows = [None] * size.y
+        buffer = self.buffer
+        for row in range(size.y):
+            line = self.top + row
+            content = ""
+            if line < buffer.line_count:
+                start, end = buffer.line_span(line)
+                content = buffer[min(start + self.left, end): min(start + self.left + size.x, end)]
+            content = content.translate(_CONTROL_CHARS).ljust(size.x)
+            if content != self._drawn_rows[row]:
+                self._write_row(row, content)
+
+    def _write_row(self, row, content):
+        previous = self._drawn_rows[row]
+        ctx = self.text.owner.context
+        attrs = CtxData(ctx.foreground, ctx.background, ctx.effects)
+        changed = [
+            RenderData(char, V2(x, row), 0, attrs)
+            for x, char in enumerate(content)
+            if previous is None or previous[x] != char
+        ]
+        self.text._render_baked(changed, {data.pos for data in changed})
+        self._drawn_rows[row] = content
+
+    def kill(self):
+        self.focus = False
+
+
 class Text(Widget):
 
-    def __init__(self, parent, size=None, label="", value="", pos=(0,0), text_plane=1, sprite=None, border=None, click_callback=(), **kwargs):
+    has_border = 0
+
+    def __init__(self, parent, size=None, label="", value="", pos=(0,0), text_plane=1, sprite=None, border=None, click_callback=(), virtual=False, **kwargs):
+        """Multi-line text editing widget
+
+        Args:
+          - value (str or TextBuffer): initial text
+          - virtual (bool): keep the text in a TextBuffer, so that it can be larger
+                than the widget, which then works as a scrolling viewport. Implied
+                if "value" is a TextBuffer.
+
+        Otherwise, the text is laid out following the text flow
+        on the widget's text plane, and it can't outgrow it.
+        """
 
         click_callbacks = [self.click]
         _ensure_extend(click_callbacks, click_callback)
@@ -590,7 +846,10 @@ class Text(Widget):
                          **kwargs)
         text = self.sprite.shape.text[self.text_plane]
 
-        self.editable = Editable(text, parent=self, value=value)
+        if virtual or isinstance(value, TextBuffer):
+            self.editable = BufferEditable(text, parent=self, value=value)
+        else:
+            self.editable = Editable(text, parent=self, value=value)
 
     def get(self):
         return self.editable.value
@@ -616,10 +875,7 @@ class Text(Widget):
 
     @value.setter
     def value(self, text):
-        self.editable.lines.reload(text)
-        self.editable.lines._hard_load_from_soft_lines()
-        # self.editable.raw_value = text
-        self.editable.regen_text()
+        self.editable.load(text)
 
 
 class Entry(Text):
@@ -0,0 +1,104 @@
+import terminedia as TM
+from terminedia import Compositor
+from terminedia.compositor import blend_color
+from terminedia.values import DEFAULT_BG, DEFAULT_FG, EMPTY
+
+
+def test_blend_modes_combine_each_channel():
+    black, gray, red = TM.Color((0, 0, 0)), TM.Color((128, 128, 128)), TM.Color((255, 0, 0))
+    assert blend_color(black, red, opacity=0.5) == TM.Color((128, 0, 0))
+    assert blend_color(black, red) is red
+    assert blend_color(gray, red, "add") == TM.Color((255, 128, 128))
+    assert blend_color(gray, red, "multiply") == TM.Color((128, 0, 0))
+    assert blend_color(gray, red, "multiply", opacity=0.5) == TM.Color((128, 64, 64))
+    translucent = TM.Color((255, 0, 0))
+    translucent.alpha = 128
+    assert blend_color(black, translucent) == TM.Color((128, 0, 0))
+    # terminal default colors are blended as black and white
+    assert blend_color(DEFAULT_BG, red, opacity=0.5) == TM.Color((128, 0, 0))
+    assert blend_color(DEFAULT_FG, red, opacity=0.5) == TM.Color((255, 128, 128))
+    panel = TM.shape((1, 1))
+    panel.context.background = red
+    panel.draw.fill(char=EMPTY)
+    compositor = Compositor((1, 1), background=TM.Color((0, 0, 255)))
+    compositor.add(panel, opacity=0.5)
+    compositor.update()
+    assert compositor[0, 0][2] == TM.Color((128, 0, 128))
+
+
+def test_translucent_sprite_tints_pixels_below():
+    sh = TM.shape((4, 1))
+    sh.context.background = (0, 0, 255)
+    sh.draw.fill(char="#")
+    sh.context.background = (0, 0, 0)
+    sh.text[1].at((0, 0), "ab")
+    overlay = TM.shape((2, 1))
+    overlay.context.background = (255, 0, 0)
+    overlay.draw.fill(char=EMPTY)
+    sh.sprites.add(overlay, pos=(1, 0), alpha=False, opacity=0.5)
+
+    assert sh[0, 0].background == TM.Color((0, 0, 0))
+    # the text below shows through, tinted
+    assert sh[1, 0].value == "b"
+    assert sh[1, 0].background == TM.Color((128, 0, 0))
+    assert sh[2, 0].value == "#"
+    assert sh[2, 0].background == TM.Color((128, 0, 128))
+
+
+def test_compositor_updates_only_changed_areas():
+    background = TM.shape((10, 4))
+    background.context.background = (0, 0, 255)
+    background.draw.fill(char=".")
+    marker = TM.shape((2, 1))
+    marker.context.background = (255, 0, 0)
+    marker.draw.fill(char=EMPTY)
+
+    compositor = Compositor((10, 4))
+    base = compositor.add(background, static=True)
+    layer = compositor.add(marker, pos=(1, 1), opacity=0.5)
+    assert compositor.update() == [TM.Rect((0, 0, 10, 4))]
+    assert compositor[1, 1][0] == "."
+    assert compositor[1, 1][2] == TM.Color((128, 0, 128))
+    assert compositor.update() == []
+
+    base_cells = base._cells
+    layer.pos = (5, 2)
+    assert compositor.update() == [TM.Rect((1, 1, 3, 2)), TM.Rect((5, 2, 7, 3))]
+    assert base._cells is base_cells
+    assert compositor[1, 1][2] == TM.Color((0, 0, 255))
+    assert compositor[6, 2][2] == TM.Color((128, 0, 128))
+
+    marker[0, 0] = ("X", TM.Color("white"), DEFAULT_BG, TM.Effects.none)
+    layer.blend = "add"
+    assert all(rect.intersection(layer.rect) == rect for rect in compositor.update())
+    assert compositor[5, 2][0] == "X"
+
+    target = TM.shape((10, 4))
+    compositor.render(target)
+    assert target[5, 2].value == "X"
+    assert target[6, 2].background == TM.Color((128, 0, 255))
+
+
+def test_compositor_rebuilds_base_when_static_layers_change():
+    def filled(char, size=(6, 1)):
+        sh = TM.shape(size)
+        sh.draw.fill(char=char)
+        return sh
+
+    compositor = Compositor((6, 1))
+    compositor.add(filled("a"), static=True)
+    middle = compositor.add(filled("m", (1, 1)), pos=(5, 0))
+    compositor.add(filled("b"), static=True)
+    sprite = compositor.add(filled("c", (1, 1)), pos=(1, 0))
+    compositor.update()
+    assert "".join(compositor[x, 0][0] for x in range(6)) == "bcbbbb"
+
+    compositor.remove(middle)
+    sprite.pos = (2, 0)
+    compositor.update()
+    assert "".join(compositor[x, 0][0] for x in range(6)) == "bbcbbb"
+
+    compositor.layers[1].static = False
+    sprite.pos = (3, 0)
+    compositor.update()
+    assert "".join(compositor[x, 0][0] for x in range(6)) == "bbbcbb"
@@ -0,0 +1,64 @@
+import terminedia as TM
+from terminedia import DisplayList, Param
+from terminedia.values import DEFAULT_FG, TRANSPARENT
+
+
+def _panel():
+    panel = DisplayList((10, 4), params={"label": "CPU"})
+    canvas = panel.canvas
+    with canvas.context:
+        canvas.context.color = "red"
+        canvas.draw.rect((0, 0, 10, 4))
+    canvas.high.draw.line((2, 2), (17, 5))
+    canvas.text[1][1, 1] = Param("label")
+    return panel
+
+
+def test_displaylist_replay_matches_executing_operations():
+    panel = _panel()
+    direct = TM.shape((10, 4))
+    panel.execute(direct)
+    replayed = TM.shape((10, 4))
+    panel.replay(replayed)
+
+    assert all(replayed[x, y] == direct[x, y] for x in range(10) for y in range(4))
+    assert replayed[0, 0].foreground == TM.Color("red")
+    assert replayed[1, 2].foreground == DEFAULT_FG
+    assert "".join(replayed[x, 1].value for x in range(1, 4)) == "CPU"
+
+
+def test_displaylist_is_baked_again_only_when_changed():
+    panel = _panel()
+    runs = panel.bake()
+    assert panel.bake() is runs
+
+    panel.params["label"] = "MEM"
+    relabeled = panel.bake()
+    assert relabeled is not runs
+    target = TM.shape((12, 6))
+    panel.replay(target, (2, 2))
+    assert "".join(target[x, 3].value for x in range(3, 6)) == "MEM"
+    assert target[1, 1].value == " "
+
+    panel.canvas.draw.set((5, 2))
+    assert panel.bake() is not relabeled
+
+
+def test_displaylist_composes_other_lists():
+    panel = _panel()
+    screen = DisplayList((12, 8))
+    screen.add(panel, (0, 0))
+    screen.add(panel, (2, 4))
+    runs = screen.bake()
+    assert screen.bake() is runs
+    panel.params["label"] = "NET"
+    assert screen.bake() is not runs
+
+    target = TM.shape((12, 8))
+    target.context.color = "blue"
+    target.draw.fill()
+    screen.replay(target)
+    assert "".join(target[x, 5].value for x in range(3, 6)) == "NET"
+    # cells untouched by the operations are left as they were
+    assert target[11, 0].foreground == TM.Color("blue")
+    assert all(cell != (TRANSPARENT,) * 4 for _, run in runs for cell in run)
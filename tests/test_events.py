@@ -41,3 +41,38 @@ def test_event_system_select_events():
     Event(1)
     process()
     assert subscription.queue
+
+
+def test_subscription_iteration_is_woken_by_process_when_input_is_read_by_the_loop(monkeypatch):
+    import asyncio
+    import terminedia
+
+    async def main():
+        monkeypatch.setattr(terminedia.input.keyboard, "reader_loop", asyncio.get_running_loop())
+        subscription = Subscription(EventTypes.Custom)
+        task = asyncio.create_task(subscription.__anext__())
+        await asyncio.sleep(0.01)
+        assert not task.done() and subscription.waiter is not None
+        e = Event(EventTypes.Custom)
+        process()
+        assert await asyncio.wait_for(task, 1) is e
+        subscription.kill()
+
+    asyncio.run(main())
+
+
+def test_event_system_coalesces_opted_in_event_types():
+    from terminedia.events import coalesce, list_subscriptions
+
+    subscription = Subscription(EventTypes.MouseMove | EventTypes.KeyPress)
+    assert subscription in list_subscriptions(EventTypes.MouseMove)
+    coalesce(EventTypes.MouseMove)
+    try:
+        moves = [Event(EventTypes.MouseMove, pos=(i, 0)) for i in range(3)]
+        key = Event(EventTypes.KeyPress, key="a")
+        process()
+    finally:
+        coalesce(EventTypes.MouseMove, enable=False)
+        subscription.kill()
+    assert list(subscription.queue) == [moves[-1], key]
+    assert subscription not in list_subscriptions(EventTypes.MouseMove)
@@ -208,3 +208,31 @@ def test_shape_sprites_add_method():
     with pytest.raises(TypeError):
         sp3 = sh.sprites.add()
 
+
+
+def test_sprite_baked_frames_play_back_and_mark_only_changed_cells(monkeypatch):
+    sh = TM.shape((10, 3))
+    sp = sh.sprites.add((3, 1), pos=(2, 1), alpha=False)
+    sp.shape.text[1].at((0, 0), "abc")
+    sp.transformers.append(TM.Transformer(
+        char=lambda value, pos, tick: "|/-\\"[tick % 4] if pos == (0, 0) else value
+    ))
+    assert sp.bake_frames(4)
+    assert len(sp.frames) == 4
+    assert not sp.bake_frames(4, budget=100)
+    sp.shape.context.transformers.append(TM.Transformer(foreground=lambda tick: TM.Color((tick % 256, 0, 0))))
+    with pytest.raises(ValueError):
+        sp.bake_frames(4)
+    sp.shape.context.transformers.clear()
+
+    sp.transformers.clear()
+    for tick, char in enumerate("|/-\\|"):
+        monkeypatch.setattr("terminedia.sprites.get_current_tick", lambda tick=tick: tick)
+        assert sh[2, 1].value == char
+        assert sh[3, 1].value == "b"
+        dirty = sp.dirty_rects
+        assert dirty == ({(0, 0, 3, 1)} if tick == 0 else {(0, 0, 1, 1)})
+        assert sp.dirty_rects == dirty
+    assert sp.dirty_rects == {(0, 0, 1, 1)}
+    sp.drop_frames()
+    assert sh[2, 1].value == "a"
@@ -0,0 +1,58 @@
+from terminedia.input import InputDecoder, KeyCodes as K
+
+
+def keys(tokens):
+    return [value if kind == "key" else value.group() for kind, value in tokens]
+
+
+def test_input_decoder_splits_keys_and_sequences():
+    decoder = InputDecoder()
+    assert keys(decoder.feed(f"ab{K.LEFT}{K.F5}\x1b[1;5Ac")) == ["a", "b", K.LEFT, K.F5, "\x1b[1;5A", "c"]
+    assert keys(decoder.feed(f"{K.F1}\x1bx")) == [K.F1, K.ESC, "x"]
+
+
+def test_input_decoder_keeps_incomplete_sequences_across_reads():
+    decoder = InputDecoder()
+    assert keys(decoder.feed("a\x1b[")) == ["a"]
+    assert decoder.pending == "\x1b["
+    assert keys(decoder.feed("15~")) == [K.F5]
+    assert keys(decoder.feed("\x1b")) == []
+    # no further data: a lone ESC is the ESC key
+    assert keys(decoder.feed("", final=True)) == [K.ESC]
+
+
+def test_input_decoder_mouse_reports_and_paste():
+    decoder = InputDecoder()
+    tokens = decoder.feed("\x1b[<32;10;5M\x1b[<0;3;")
+    assert [kind for kind, _ in tokens] == ["mouse"]
+    assert tokens[0][1].group("button", "column", "row", "press") == ("32", "10", "5", "M")
+    assert decoder.feed("4m")[0][1].group("press") == "m"
+    assert keys(decoder.feed("\x1b[200~a\x1b[Ab\x1b[201~c")) == ["a", "\x1b", "[", "A", "b", "c"]
+
+
+def test_keyboard_reader_dispatches_lone_esc_after_escape_timeout():
+    import asyncio
+    import os
+    from terminedia.events import EventTypes, Subscription
+    from terminedia.input import _PosixKeyboard
+
+    keyboard = _PosixKeyboard()
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    keyboard.fd, keyboard.enabled = read_fd, 1
+    subscription = Subscription(EventTypes.KeyPress)
+
+    async def main():
+        keyboard.add_reader(asyncio.get_running_loop())
+        os.write(write_fd, b"a\x1b")
+        await asyncio.sleep(keyboard.escape_timeout * 4)
+        keyboard.remove_reader()
+
+    try:
+        asyncio.run(main())
+    finally:
+        subscription.kill()
+        os.close(read_fd)
+        os.close(write_fd)
+    assert [event.key for event in subscription.queue] == ["a", K.ESC]
+    assert not keyboard.decoder.pending
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from terminedia.text import TextBuffer
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_text_buffer_edits_match_plain_string(seed, monkeypatch):
+    monkeypatch.setattr(TextBuffer, "chunk_size", 8)
+    rnd = random.Random(seed)
+    expected = "".join(rnd.choice("ab\n") for _ in range(100))
+    buffer = TextBuffer(expected)
+    for _ in range(200):
+        if rnd.random() < 0.5:
+            offset = rnd.randint(0, len(expected))
+            text = "".join(rnd.choice("xy\n") for _ in range(rnd.randint(1, 20)))
+            buffer.insert(offset, text)
+            expected = expected[:offset] + text + expected[offset:]
+        else:
+            start = rnd.randint(0, len(expected))
+            stop = rnd.randint(start, len(expected))
+            buffer.delete(start, stop)
+            expected = expected[:start] + expected[stop:]
+        assert str(buffer) == expected and len(buffer) == len(expected)
+    lines = expected.split("\n")
+    assert buffer.line_count == len(lines)
+    assert [buffer.line(i) for i in range(len(lines))] == lines
+    assert [buffer.line_of(i) for i in range(len(expected) + 1)] == [expected[:i].count("\n") for i in range(len(expected) + 1)]
+    assert buffer[10:50] == expected[10:50]
+
+
+def test_text_buffer_edits_touch_only_the_chunks_they_change(monkeypatch):
+    monkeypatch.setattr(TextBuffer, "chunk_size", 8)
+    buffer = TextBuffer("abc\ndefg" * 10)
+    chunks = buffer.chunks[:]
+    trees = buffer._lengths, buffer._newlines
+
+    # edits inside a chunk update the trees in place
+    buffer.insert(20, "x\n")
+    buffer.delete(3, 5)
+    assert (buffer._lengths, buffer._newlines) == trees
+    assert [chunk is old for chunk, old in zip(buffer.chunks, chunks)] == [False, True, False] + [True] * 7
+
+    # a split replaces only the chunk split, and rebuilds the trees from per-chunk counts
+    chunks = buffer.chunks[:]
+    buffer.insert(45, "\n" * 20)
+    assert len(buffer.chunks) == len(chunks) + 3
+    assert buffer.chunks[:5] == chunks[:5] and all(a is b for a, b in zip(buffer.chunks[9:], chunks[6:]))
+    assert (buffer._lengths, buffer._newlines) != trees
+    assert buffer._chunk_lengths == [len(chunk) for chunk in buffer.chunks]
+    assert buffer._chunk_newlines == [chunk.count("\n") for chunk in buffer.chunks]
+    assert [buffer._lengths.prefix(i) for i in range(len(buffer.chunks) + 1)] == [
+        sum(buffer._chunk_lengths[:i]) for i in range(len(buffer.chunks) + 1)
+    ]
+
+    # deletes across chunks merge the two ends into one chunk
+    count = len(buffer.chunks)
+    buffer.delete(10, 30)
+    assert len(buffer.chunks) < count
+    assert str(buffer) == "".join(buffer.chunks) and len(buffer) == len(str(buffer))
+    assert buffer.line_count == str(buffer).count("\n") + 1
@@ -28,3 +28,62 @@ def test_text_plane_clear():
     assert isinstance(sh.text[1].marks[10,0], TM.Mark)
     assert sh.text[1].plane[1, 0] == " "
     assert sh.text[1].marks.get((1, 0), None) is None
+
+
+def test_hex_font_decodes_glyphs_on_demand(tmp_path, monkeypatch):
+    from terminedia.text import fonts
+
+    monkeypatch.setattr(fonts, "index_cache_dir", tmp_path)
+    font_file = tmp_path / "test.hex"
+    font_file.write_text("0041:183C66667E666600\n00C9:0C18FE6078607E00\n4E00:" + "0000" * 3 + "FFFF" + "0000" * 4 + "\n")
+
+    font = fonts.HexFont(str(font_file))
+    assert len(font) == 3 and font.height == 8
+    assert not font._bitmaps
+    assert "B" not in font
+    bitmap = font.bitmap("A")
+    assert bitmap == (8, 8, bytes.fromhex("183C66667E666600"))
+    assert bitmap.to_text(".", "#").split("\n")[0] == "...##..."
+    assert font.bitmap("一").width == 16 and font.bitmap("一").get((15, 3))
+    assert list(font.codepoints(0x40, 0x100)) == [0x41, 0xC9]
+    assert fonts.load_font(str(font_file), False)["A"] == bitmap.to_text()
+
+    # The codepoint index is read back from the cache folder:
+    assert len(list(tmp_path.glob("*.index"))) == 1
+    monkeypatch.setattr(fonts.HexFont, "_build_index", None)
+    assert fonts.HexFont(str(font_file)).bitmap("\xc9") == font.bitmap("\xc9")
+
+
+@pytest.mark.parametrize("plane", [2, 3, 4])
+def test_big_text_blits_glyph_bitmaps_as_per_pixel_drawing(plane):
+    sh1 = TM.shape((30, 10))
+    sh2 = TM.shape((30, 10))
+    for sh in sh1, sh2:
+        sh.draw.line((0, 0), (29, 9))
+    sh1.text[plane][0, 0] = "Ab1"
+    for i, char in enumerate("Ab1"):
+        getattr(sh2, {2: "braille", 3: "sextant", 4: "high"}[plane]).draw.blit(
+            (i * 8, 0), TM.text.render(char), erase=True
+        )
+    for y in range(10):
+        for x in range(30):
+            assert sh1[x, y].value == sh2[x, y].value
+
+
+def test_render_cache_keeps_phrases_within_budget(monkeypatch):
+    from terminedia.text import fonts
+
+    glyph_cost = fonts.RenderCache.entry_cost + 8 * 8 * fonts.RenderCache.pixel_cost
+    cache = fonts.RenderCache(max_size=4 * glyph_cost)
+    monkeypatch.setattr(fonts, "GLYPH_CACHE", cache)
+
+    shape = fonts.render("ab")
+    assert shape.size == (16, 8)
+    assert fonts.render("ab") is shape
+    assert cache.stats[:3] == (1, 3, 3)
+    assert fonts.render("ab", direction=TM.Directions.DOWN).size == (8, 16)
+    # the older phrase is dropped to keep within budget
+    assert cache.size <= cache.max_size
+    assert ("unscii-8.hex", fonts.PalettedShape, "ab", (1, 0)) not in cache
+    assert ("unscii-8.hex", fonts.PalettedShape, "ab", (0, 1)) in cache
+    assert fonts.render("a") is fonts.render("a")
@@ -345,6 +345,59 @@ def test_styled_text_render_and_animate_special_marks():
         assert sc.data[i + 2, 5].foreground == TM.values.DEFAULT_FG
 
 
+def test_text_plane_update_only_rerenders_dynamic_writtings():
+    sh = TM.shape((20, 10))
+    text_plane = sh.text[1]
+    m = SpecialMark(index=lambda tick, length: tick % length, attributes={"color": TM.Color("red")})
+    m1 = SpecialMark(index=lambda tick, length: (tick + 1) % length, pop_attributes={"color": None})
+    static = MLTokenizer("static")(text_plane=text_plane, starting_point=(0, 0))
+    text_plane.render_styled_sequence(static)
+    dynamic = StyledSequence("dynamic", {"special": [m, m1]}, text_plane=text_plane, starting_point=(0, 5))
+    text_plane.render_styled_sequence(dynamic)
+    # Static writting partially covering the dynamic one:
+    text_plane[3, 5] = "XY"
+
+    assert not text_plane.writtings[static].dynamic
+    assert text_plane.writtings[dynamic].dynamic
+
+    rendered = []
+    original_render = StyledSequence.render
+    def render(self):
+        rendered.append(self)
+        return original_render(self)
+    StyledSequence.render = render
+    try:
+        text_plane.update()
+    finally:
+        StyledSequence.render = original_render
+
+    assert rendered == [dynamic]
+    assert "".join(sh[i, 5].value for i in range(7)) == "dynXYic"
+    assert sh[1, 5].foreground == TM.Color("red")
+    assert "".join(sh[i, 0].value for i in range(6)) == "static"
+
+
+def test_text_plane_update_restores_static_text_left_by_dynamic_writting():
+    sh = TM.shape((20, 3))
+    text_plane = sh.text[1]
+    row = lambda: "".join(sh[i, 0].value for i in range(12))
+    m = SpecialMark(index=lambda tick, length: tick % length, attributes={"color": TM.Color("red")})
+    m1 = SpecialMark(index=lambda tick, length: (tick + 1) % length, pop_attributes={"color": None})
+    text_plane[0, 0] = "static text"
+    dynamic = StyledSequence("DYNAMIC", {"special": [m, m1]}, text_plane=text_plane, starting_point=(0, 0))
+    text_plane.render_styled_sequence(dynamic)
+    assert row() == "DYNAMICtext "
+
+    dynamic.starting_point = TM.V2(4, 0)
+    text_plane.update()
+    assert row() == "statDYNAMIC "
+    assert sh[0, 0].foreground == TM.values.DEFAULT_FG
+
+    dynamic.starting_point = TM.V2(0, 1)
+    text_plane.update()
+    assert row() == "static text "
+
+
 @pytest.mark.parametrize(*fast_render_mark)
 @rendering_test
 def test_styled_text_transformers_spam_based_index_attribute_and_deactivation():
@@ -677,3 +730,61 @@ def test_mltokenizer_convert_escaped_string_with_inner_token():
     xx.parse()
     assert xx.parsed_text == "[f]"
     assert list(xx.mark_sequence.keys()) == [2]
+
+
+def test_mltokenizer_parsing_is_cached_and_results_not_shared():
+    text = "[color: red]ab[effect: blink][background: blue]cd[/color]"
+    xx = MLTokenizer(text)
+    xx.parse()
+    yy = MLTokenizer(text)
+    yy.parse()
+    assert xx.parsed_text == yy.parsed_text == "abcd"
+    assert xx.mark_sequence.keys() == yy.mark_sequence.keys() == {0, 2, 4}
+    assert xx.mark_sequence is not yy.mark_sequence
+    assert isinstance(xx.mark_sequence[2], list)
+    assert xx.mark_sequence[2] is not yy.mark_sequence[2]
+    xx.mark_sequence[2].append(Mark())
+    assert len(yy.mark_sequence[2]) == 2
+    assert xx.mark_sequence[0] is not yy.mark_sequence[0]
+    assert xx.mark_sequence[2][0] is not yy.mark_sequence[2][0]
+    xx.mark_sequence[0].pos = (1, 1)
+    xx.mark_sequence[0].attributes["color"] = TM.Color("blue")
+    assert not hasattr(yy.mark_sequence[0], "pos")
+    assert yy.mark_sequence[0].attributes["color"] == TM.Color("red")
+
+
+def test_style_template_shifts_marks_according_to_values():
+    from terminedia.text.style import StyleTemplate
+    template = StyleTemplate("[color: {c}]{name}[/color] {value:>6}[effect: blink]!")
+    for c, name, value in [("red", "cpu", 12), ("blue", "memory", 1234567)]:
+        text, mark_sequence = template.format(c=c, name=name, value=value)
+        reference = MLTokenizer(f"[color: {c}]{name}[/color] {value:>6}[effect: blink]!")
+        reference.parse()
+        assert text == reference.parsed_text
+        assert mark_sequence.keys() == reference.mark_sequence.keys()
+        for key, mark in mark_sequence.items():
+            assert repr(mark) == repr(reference.mark_sequence[key])
+    assert template.format(c="red", name="a", value=1)[1][0] is not template.format(c="red", name="a", value=1)[1][0]
+
+
+def test_style_template_values_are_not_parsed_as_markup():
+    from terminedia.text.style import StyleTemplate
+    text, mark_sequence = StyleTemplate("{}[color: red]{}").format("[up]", "x")
+    assert text == "[up]x"
+    assert list(mark_sequence.keys()) == [4]
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_style_template_renders_styled_sequence():
+    from terminedia.text.style import StyleTemplate
+    sc, sh, text_plane = styled_text()
+    template = StyleTemplate("{name}: [color: {c}]{value}")
+    text_plane.render_styled_sequence(
+        template.styled(name="ab", c="red", value=10, text_plane=text_plane, starting_point=(0, 2))
+    )
+    sc.update()
+    yield None
+    assert "".join(sc.data[i, 2].value for i in range(6)) == "ab: 10"
+    assert sc.data[3, 2].foreground == TM.values.DEFAULT_FG
+    assert sc.data[4, 2].foreground == TM.Color("red")
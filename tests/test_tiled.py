@@ -0,0 +1,75 @@
+import pytest
+
+import terminedia as TM
+from terminedia import TiledShape, Viewport
+
+
+def test_tiled_shape_allocates_chunks_on_write_only():
+    sh = TiledShape((10000, 10000), chunk_size=(64, 32))
+    assert sh[9999, 9999].value == " "
+    assert len(sh.data) == 0
+    sh.context.color = "red"
+    sh.draw.line((100, 30), (130, 30))
+    sh.text[1].at((5000, 5000), "hello")
+    assert len(sh.data) == 3
+    assert sh[130, 30].foreground == TM.Color("red")
+    assert "".join(sh[x, 5000].value for x in range(5000, 5005)) == "hello"
+    assert (5000 // 8, 5000 // 8) in sh.dirty_pixels
+
+    sh.clear()
+    assert len(sh.data) == 0
+    assert sh[130, 30].value == " "
+
+
+def test_tiled_shape_spills_evicted_chunks_to_disk():
+    sh = TiledShape((100000, 16), chunk_size=(16, 16), spill=True, max_chunks=2)
+    for i in range(10):
+        sh[i * 16, 0] = str(i)
+    assert len(sh.data.chunks) == 2
+    assert len(sh.data) == 10
+    assert "".join(sh[i * 16, 0].value for i in range(10)) == "0123456789"
+
+
+def test_tiled_shape_put_run_keeps_writes_to_chunks_evicted_during_the_run():
+    sh = TiledShape((64, 8), chunk_size=(8, 8), spill=True, max_chunks=2)
+    for i in range(8):
+        sh[i * 8, 0] = "o"
+    # every chunk goes through the store, and is clean when loaded back
+    assert "".join(sh[i * 8, 0].value for i in range(8)) == "o" * 8
+    sh.put_run((0, 1), [("X", None, None, None)] * 64)
+    assert "".join(sh[x, 1].value for x in range(64)) == "X" * 64
+    assert "".join(sh[i * 8, 0].value for i in range(8)) == "o" * 8
+
+
+def test_tiled_shape_rejects_undo():
+    with pytest.raises(ValueError):
+        TiledShape((100, 100), undo_active=True)
+
+
+def test_viewport_copies_only_changed_chunks():
+    sh = TiledShape((1000, 1000), chunk_size=(8, 8))
+    sh.text[1].at((500, 500), "abc")
+    target = TM.shape((10, 5))
+    view = Viewport(sh, (10, 5), offset=(495, 498))
+    view.blit(target)
+    assert "".join(target[x, 2].value for x in range(5, 8)) == "abc"
+
+    target[0, 0] = "#"
+    sh[502, 500] = "Z"
+    view.blit(target)
+    # only the chunk changed is copied again
+    assert target[7, 2].value == "Z"
+    assert target[0, 0].value == "#"
+
+    view.pan((1, 0))
+    view.blit(target)
+    assert target[0, 0].value == " "
+    assert "".join(target[x, 2].value for x in range(4, 7)) == "abZ"
+
+    sprite = sh.sprites.add((2, 1), pos=(497, 498), alpha=False)
+    sprite.shape.draw.fill(char="@")
+    view.blit(target)
+    assert target[1, 0].value == "@"
+    sprite.pos = (490, 498)
+    view.blit(target)
+    assert target[1, 0].value == " "
@@ -142,6 +142,39 @@ def test_transformers_container_bake_method_for_source_consuming_transformers():
     joiner = lambda sh: [sh[pos].value for pos in TM.Rect(sh.size)]
     assert joiner(sh) == joiner(reference_shape)
 
+
+def test_transformers_container_capabilities_track_changes():
+    container = TM.TransformersContainer()
+    assert container.capabilities.static and not container.capabilities.uses_tick
+    tr = TM.Transformer(char="*")
+    container.append(tr)
+    assert container.capabilities.static and container.capabilities.pixel_only
+    tr.effects = lambda value, tick: value
+    assert container.capabilities.uses_tick
+    assert not container.capabilities.static and not container.capabilities.pixel_only
+    tr.effects = None
+    assert not container.capabilities.uses_tick
+    tr2 = TM.Transformer(foreground=lambda pos: TM.Color("red"))
+    container.insert(0, tr2)
+    assert container.capabilities.uses_pos
+    container.remove(tr2)
+    assert not container.capabilities.uses_pos
+    container.append(tr2)
+    del container[-1]
+    assert not container.capabilities.uses_pos
+
+
+def test_transformers_container_tick_dirty_rects_uses_dirty_region():
+    sh = TM.shape((10, 10))
+    tr = TM.Transformer(effects=lambda value, tick: value)
+    sh.context.transformers.append(tr)
+    assert sh.context.transformers.tick_dirty_rects(sh.size) == {(0, 0, 10, 10)}
+    tr.dirty_region = TM.Rect((2, 2), (3, 3))
+    assert sh.context.transformers.tick_dirty_rects(sh.size) == {(2, 2, 3, 3)}
+    sh.dirty_clear()
+    assert sh.dirty_rects == {(2, 2, 3, 3)}
+
+
 ## GradientTransformer tests
 
 def screen_shape_sprite():
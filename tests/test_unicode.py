@@ -1,4 +1,4 @@
-from terminedia.unicode import split_graphemes, GraphemeIter
+from terminedia.unicode import split_graphemes, GraphemeIter, char_width
 
 import pytest
 
@@ -37,7 +37,7 @@ def test_graphemeiter_iter_cooked_indexes():
 
     a = GraphemeIter(msg)
     assert list(a.iter_cooked_indexes([0, 3, 4])) == [0, 1, 2]
-    assert list(a.iter_cooked_indexes(range(len(msg)))) == [0, 0, 0, 1, 2, 2, 2]
+    assert list(a.iter_cooked_indexes(range(len(msg)))) == [0, 0, 0, 1, 2, 2, 2, 3]
 
 
 def test_graphemeiter_iter_cooked_indexes_past_string_end():
@@ -51,3 +51,49 @@ def test_graphemeiter_iter_cooked_indexes_past_string_end():
     assert list (a.iter_cooked_indexes([8])) == []
     with pytest.raises(StopIteration):
         next(iter(a.iter_cooked_indexes([8])))
+
+
+@pytest.mark.parametrize(
+    ("char", "width"), [
+        ("a", 1),
+        ("一", 2),
+        ("̀", 2),  # ambiguous width combining character on its own...
+        ("à", 1),  # ... is single width as part of a grapheme
+        ("一̀", 2),
+        ("▘", 1),  # block character used as pixel
+        ("\U0001fb00", 1),  # sextant block character, out of the BMP
+        ("\U0001f600", 2),
+])
+def test_char_width(char, width):
+    assert char_width(char) == width
+
+
+def test_graphemeiter_segments_text_once():
+    tilde = chr(0x303)
+    a = GraphemeIter("ab" + tilde + "c\U0001f600")
+    assert list(a.starts) == [0, 1, 3, 4]
+    assert len(a) == 4
+    assert a.cooked_index(2) == 1 and a.cooked_index(4) == 3
+    assert list(a) == ["a", "b" + tilde, "c", "\U0001f600"]
+
+    ascii_text = GraphemeIter("abc")
+    assert isinstance(ascii_text.starts, range)
+    assert list(ascii_text.iter_cooked_indexes([0, 2])) == [0, 2]
+
+
+def test_lookup_uses_name_index(tmp_path, monkeypatch):
+    from terminedia import unicode
+
+    monkeypatch.setattr(unicode, "index_cache_dir", tmp_path)
+    monkeypatch.setattr(unicode, "_name_index", None)
+
+    results = unicode.lookup("black heart suit")
+    assert results == ["♥"]
+    assert results[0].code == 0x2665 and results[0].category == "So"
+    assert unicode.lookup("^latin small letter a with (grave|acute)$", chars_only=True) == ["à", "á"]
+    assert list(tmp_path.glob("unicode-names-*.index"))
+
+    # index read back from disk:
+    monkeypatch.setattr(unicode, "_name_index", None)
+    monkeypatch.setattr(unicode.NameIndex, "_build", None)
+    assert unicode.lookup("black heart suit", chars_only=True) == ["♥"]
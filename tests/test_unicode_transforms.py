@@ -13,3 +13,17 @@ def test_text_to_circled():
     )
 
     assert text_to_circled(charset) == result
+
+
+def test_translate_chars_combined_effects_use_one_table():
+    from terminedia.values import Effects
+    from terminedia.unicode_transforms import translate_chars, text_to_squared, _translation_table
+
+    effects = Effects.encircled | Effects.upside_down
+    _translation_table.cache_clear()
+    assert translate_chars("a1", effects) == translate_chars("a", effects) + translate_chars("1", effects)
+    assert translate_chars("Hi", [Effects.squared]) == text_to_squared("Hi") == "🄷🄸"
+    assert _translation_table.cache_info().currsize == 2
+    # Non ASCII characters are normalized before translation:
+    assert translate_chars("é", Effects.encircled) == "\N{COMBINING ACUTE ACCENT}ⓔ"
+    assert translate_chars("é", Effects.encircled, convert=False) == "é"
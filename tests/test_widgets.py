@@ -32,3 +32,264 @@ def test_text_entry_widget_sequence_write(typed, expected, extra_kw):
             yield None
             sc.update()
     assert w.value == expected
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_widget_reactor_hit_index_follows_layout():
+    from terminedia.widgets.core import WidgetEventReactor
+    stdin = io.StringIO()
+    clicked = []
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            box = TM.widgets.VBox(sc, pos=(2, 1))
+            buttons = [
+                TM.widgets.Button(box, text=f"B{i}", command=lambda event, i=i: clicked.append(i))
+                for i in range(20)
+            ]
+            sc.update()
+            for i, button in enumerate(buttons):
+                assert WidgetEventReactor.widget_at(button.sprite.absrect.c1) is button
+            TM.events.Event(TM.events.MouseClick, pos=buttons[5].sprite.absrect.c1)
+            sc.update()
+            assert clicked == [5]
+
+            buttons[0].size = buttons[0].size + (0, 2)
+            sc.update()
+            assert WidgetEventReactor.widget_at(buttons[1].sprite.absrect.c1) is buttons[1]
+            assert WidgetEventReactor.widget_at((2, 2)) is buttons[0]
+
+            buttons[3].kill()
+            assert WidgetEventReactor.widget_at(buttons[3].sprite.absrect.c1) is not buttons[3]
+
+            # only moving the sprites of widgets, or their ancestors, drops the index
+            tiles = WidgetEventReactor._tiles
+            unrelated = sc.shape.sprites.add(TM.shape((2, 2)), pos=(60, 20))
+            unrelated.pos = (70, 30)
+            sc.shape.sprites.remove(unrelated)
+            assert WidgetEventReactor.widget_at((2, 1)) is buttons[0]
+            assert WidgetEventReactor._tiles is tiles
+            box.sprite.pos = (40, 1)
+            assert WidgetEventReactor.widget_at((40, 1)) is buttons[0]
+            assert WidgetEventReactor._tiles is not tiles
+            yield None
+            for widget in buttons + [box]:
+                widget.kill()
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_virtual_selector_renders_only_visible_rows():
+    requested = []
+
+    def provider(start, stop):
+        requested.append((start, stop))
+        return [f"item {i:06d}" for i in range(start, stop)]
+
+    stdin = io.StringIO()
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            w = TM.widgets.Selector(sc, provider, option_count=1_000_000, pos=(0, 0), max_height=5)
+            sc.update()
+            assert requested == [(0, 64)]
+            for i in range(3):
+                w.offset += 1
+            w.selected_row = 2
+            sc.update()
+            rows = ["".join(w.text.plane[x, y] for x in range(w.text.size.x)) for y in range(5)]
+            assert rows[1:4] == ["item 000004", "item 000005", "item 000006"]
+            assert w.value == "item 000005"
+            # each row and scroll mark keeps a single writting in the text plane
+            assert len(w.text.writtings) == 7
+
+            w.offset = 999_000
+            assert len(requested) == 2
+            yield None
+            w.kill()
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_text_widget_edits_render_only_changed_cells():
+    stdin = io.StringIO()
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            w = TM.widgets.Text(sc, size=(10, 3), value="abc\ndef\nghi", pos=(0, 0))
+            editable = w.editable
+            editable.pos = TM.V2(1, 1)
+            type_key = lambda key: editable.change(TM.events.Event(TM.events.KeyPress, key=key, dispatch=False))
+            type_key("X")
+            # After the first full rendering, keypresses only touch the changed cells
+            with patch.object(editable.text, "at", side_effect=AssertionError):
+                for key in ("Y", "Z", K.BACK, K.LEFT, K.DELETE):
+                    type_key(key)
+            sc.update()
+            yield None
+            rows = ["".join(editable.text.plane[x, y] for x in range(10)).rstrip() for y in range(3)]
+            w.kill()
+    assert w.value == "abc\ndXZf\nghi"
+    assert rows == ["abc", "dXZf", "ghi"]
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_virtual_text_widget_scrolls_over_large_buffer():
+    document = "\n".join(f"line {i}" for i in range(10_000))
+    stdin = io.StringIO()
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            w = TM.widgets.Text(sc, size=(12, 4), value=TM.text.TextBuffer(document), pos=(0, 0))
+            type_key = lambda key: w.editable.change(TM.events.Event(TM.events.KeyPress, key=key, dispatch=False))
+            for key in [K.PGDOWN] * 3 + [K.DOWN, K.END] + list("!?") + [K.BACK]:
+                type_key(key)
+            sc.update()
+            yield None
+            rows = ["".join(w.editable.text.plane[x, y] for x in range(12)).rstrip() for y in range(4)]
+            w.kill()
+    assert rows == ["line 12", "line 13!", "line 14", "line 15"]
+    assert w.value.split("\n")[13] == "line 13!"
+    assert len(w.value) == len(document) + 1
+
+
+def test_folder_scan_lists_entries_and_reuses_cache(tmp_path):
+    from terminedia.widgets.file import FolderScan, folder_cache
+
+    (tmp_path / "sub").mkdir()
+    for name in ("b.txt", "a.txt"):
+        (tmp_path / name).write_text("")
+    scan = FolderScan(tmp_path)
+    scan.thread.join()
+    assert scan.done
+    assert sorted(scan.entries) == [(False, "a.txt"), (False, "b.txt"), (True, "sub")]
+
+    cached = FolderScan(tmp_path)
+    assert cached.done and cached.entries is scan.entries
+
+    (tmp_path / "c.txt").write_text("")
+    os.utime(tmp_path, ns=(0, folder_cache[str(tmp_path)][0] + 1))
+    rescan = FolderScan(tmp_path)
+    rescan.thread.join()
+    assert (False, "c.txt") in rescan.entries
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_log_view_keeps_ring_of_lines_and_follows_tail():
+    stdin = io.StringIO()
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            w = TM.widgets.LogView(sc, size=(12, 3), max_lines=5, markup=True)
+            w.extend(f"line {i}" for i in range(8))
+            w.append("[color: red]last[/color]")
+            sc.update()
+            yield None
+            rows = lambda: ["".join(w.text.plane[x, y] for x in range(12)).rstrip() for y in range(3)]
+            following = rows()
+            last_color = w.shape[0, 2].foreground
+            w.scroll(-10)
+            scrolled_back = rows()
+            w.append("newest")
+            w.redraw()
+            held = rows()
+            w.kill()
+    assert following == ["line 6", "line 7", "last"]
+    assert last_color == TM.Color("red")
+    assert len(w) == 5 and w[0] == "line 5" and w[-1] == "newest"
+    assert scrolled_back == ["line 4", "line 5", "line 6"]
+    assert held == ["line 5", "line 6", "line 7"] and not w.follow
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_table_renders_visible_rows_of_large_dataset_and_sorts_by_index():
+    stdin = io.StringIO()
+    provider = lambda start, stop: [(i, f"n{i * 7 % 10}") for i in range(start, stop)]
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            w = TM.widgets.Table(sc, size=(12, 3), rows=provider, row_count=1_000_000, columns=["id", "name"])
+            rows = lambda: ["".join(w.text.plane[x, y] for x in range(12)).rstrip() for y in range(3)]
+            first = rows()
+            w.select(len(w) - 1)
+            last = rows()
+            data = [(i, f"n{i * 7 % 10}") for i in range(20)]
+            w.load_rows(data)
+            w.sort(1, reverse=True)
+            w.select(0)
+            by_name, selected = rows(), w.value
+            w.load_rows([(0, "b"), (1, None), (2, "a"), (3, 10)])
+            w.sort(1)
+            mixed = list(w.order)
+            w.load_rows([(0, 2), (1, None), (2, 1)])
+            w.sort(1, reverse=True)
+            missing = list(w.order)
+            sc.update()
+            yield None
+            w.kill()
+    assert first == ["id  name", "  0 n0", "  1 n7"]
+    assert last == ["id     name", "999998 n6", "999999 n3"]
+    assert by_name == ["id     name⏷", "     7 n9", "    17 n9"]
+    assert data[0] == (0, "n0") and selected == (7, "n9")
+    assert mixed == [3, 2, 0, 1]
+    assert missing == [0, 2, 1]
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_plot_shifts_columns_and_rescales_only_when_limits_change():
+    stdin = io.StringIO()
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            w = TM.widgets.Sparkline(sc, size=(2, 1), resolution="braille")
+            row = lambda: "".join(w.shape[x, 0].value for x in range(2))
+            w.extend([(0,), (4,), (4,), (0,)])
+            w.redraw()
+            first = row()
+            first_masks = w._masks[:]
+            w.append(0)
+            w.redraw()
+            shifted = row()
+            kept_masks = w._masks[1:4] == first_masks[1:4]
+            w.append(8)
+            w.redraw()
+            rescaled = row()
+            sc.update()
+            yield None
+            w.kill()
+    assert first == "⣸⣇"
+    assert shifted == "⣿⣀" and kept_masks
+    assert w.limits == (0, 8) and list(w.values()) == [4, 0, 0, 8]
+    assert rescaled == "⣄⣸"
+
+
+@pytest.mark.parametrize(*fast_render_mark)
+@rendering_test
+def test_plot_incremental_redraw_matches_full_redraw():
+    import random
+    rnd = random.Random(1)
+    stdin = io.StringIO()
+    with patch("sys.stdin", stdin):
+        sc = TM.Screen()
+        with sc, TM.keyboard:
+            w = TM.widgets.Plot(sc, size=(5, 2), series=2, resolution="braille")
+            rows = lambda: ["".join(w.shape[x, y].value for x in range(5)) for y in range(2)]
+            results = []
+            for step in range(40):
+                for _ in range(rnd.randrange(1, 4)):
+                    w.append(rnd.randrange(10), rnd.randrange(10))
+                w.redraw()
+                w._packed.clear()
+                packed = ["".join(char for char, color in row) for row in w._pack(w.count)]
+                kept = list(w.values(0)) + list(w.values(1))
+                results.append((rows() == packed, w._value_range in (None, (min(kept), max(kept)))))
+            sc.update()
+            yield None
+            w.kill()
+    assert all(same for same, _ in results)
+    assert all(tracked for _, tracked in results)